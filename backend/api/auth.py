@@ -0,0 +1,18 @@
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from config.env import ADMIN_API_KEY
+
+
+async def require_admin(x_api_key: Optional[str] = Header(None)):
+    """Guards operator endpoints (debugging, outbound dialing) with ADMIN_API_KEY.
+
+    Requests must send the key in an ``X-API-Key`` header. Without a
+    configured key the endpoints are disabled rather than left open.
+    """
+    if not ADMIN_API_KEY:
+        raise HTTPException(status_code=503, detail="ADMIN_API_KEY is not configured")
+    if not x_api_key or not secrets.compare_digest(x_api_key, ADMIN_API_KEY):
+        raise HTTPException(status_code=401, detail="Invalid API key")
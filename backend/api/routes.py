@@ -1,13 +1,33 @@
-from fastapi import APIRouter, BackgroundTasks
-from typing import Dict
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+    WebSocket,
+)
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
 
+from api.auth import require_admin
+from config.settings import DIALER_MAX_CALL_LIST_BYTES
 from services.webrtc_service import WebRTCService
 from services.bot_service import BotService
-from utils.logging import setup_logging
+from services.dialer.service import DialerService
+from services.dialer.session import run_call_session
+from services.dialer.telephony import ANSWERED
+from utils.logging import get_log_levels, reset_log_level, set_log_level, setup_logging
+from utils.loop_monitor import loop_monitor
+from utils.metrics import metrics
 
 logger = setup_logging()
 router = APIRouter()
 webrtc_service = WebRTCService()
+dialer_service = DialerService()
 
 @router.post("/offer")
 async def handle_offer(request: dict, background_tasks: BackgroundTasks):
@@ -19,8 +39,154 @@ async def handle_offer(request: dict, background_tasks: BackgroundTasks):
     answer = await webrtc_service.handle_offer(sdp, sdp_type, pc_id)
     connection = webrtc_service.connections[answer["pc_id"]]
     
-    transport = webrtc_service.create_transport(connection)
-    bot_service = BotService(transport,language)
+    transport = webrtc_service.create_transport(connection, language)
+    bot_service = BotService(transport, language, pc_id=answer["pc_id"])
     background_tasks.add_task(bot_service.run)
     
-    return answer 
\ No newline at end of file
+    return answer
+
+
+@router.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
+
+
+class LoopMonitorConfig(BaseModel):
+    enabled: Optional[bool] = None
+    # The watchdog wakes every min(interval, block_threshold) / 2
+    interval: Optional[float] = Field(None, ge=0.01, le=10.0)
+    block_threshold: Optional[float] = Field(None, ge=0.01, le=10.0)
+    reset: bool = False
+
+
+@router.get("/debug/loop", dependencies=[Depends(require_admin)])
+async def get_loop_monitor(top: int = 10):
+    return loop_monitor.snapshot(top=top)
+
+
+@router.post("/debug/loop", dependencies=[Depends(require_admin)])
+async def configure_loop_monitor(config: LoopMonitorConfig):
+    if config.interval is not None:
+        loop_monitor.interval = config.interval
+    if config.block_threshold is not None:
+        loop_monitor.block_threshold = config.block_threshold
+    if config.reset:
+        loop_monitor.reset()
+    if config.enabled is not None:
+        if config.enabled:
+            loop_monitor.start()
+        else:
+            await loop_monitor.stop()
+    return loop_monitor.snapshot(top=0)
+
+
+@router.get("/debug/logging", dependencies=[Depends(require_admin)])
+async def get_logging():
+    return {"levels": get_log_levels()}
+
+
+@router.post("/debug/logging", dependencies=[Depends(require_admin)])
+async def configure_logging(request: dict):
+    module = request.get("module", "")
+    if not isinstance(module, str):
+        raise HTTPException(status_code=400, detail="module must be a string")
+    if request.get("reset"):
+        reset_log_level(module)
+    elif "level" in request:
+        try:
+            set_log_level(request["level"], module)
+        except (ValueError, TypeError, AttributeError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid log level: {e}")
+    return {"levels": get_log_levels()}
+
+
+@router.post("/dialer/campaigns", dependencies=[Depends(require_admin)])
+async def start_campaign(
+    call_list: UploadFile = File(..., description="CSV with phone, name, language, timezone columns"),
+    target_utilization: Optional[float] = Form(None, gt=0, le=1),
+    max_attempts: Optional[int] = Form(None, ge=1, le=10),
+    retry_delay: Optional[float] = Form(None, ge=0),
+    ring_timeout: Optional[float] = Form(None, ge=5, le=120),
+):
+    data = await call_list.read(DIALER_MAX_CALL_LIST_BYTES + 1)
+    if len(data) > DIALER_MAX_CALL_LIST_BYTES:
+        raise HTTPException(status_code=413, detail="Call list is too large")
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Call list must be UTF-8 CSV")
+
+    options = {
+        "target_utilization": target_utilization,
+        "max_attempts": max_attempts,
+        "retry_delay": retry_delay,
+        "ring_timeout": ring_timeout,
+    }
+    try:
+        campaign_id = await dialer_service.start_campaign(
+            text, **{key: value for key, value in options.items() if value is not None}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"campaign_id": campaign_id}
+
+
+@router.get("/dialer/campaigns", dependencies=[Depends(require_admin)])
+async def list_campaigns():
+    return {campaign_id: dialer.report() for campaign_id, dialer in dialer_service.campaigns.items()}
+
+
+def _get_campaign(campaign_id: str):
+    dialer = dialer_service.campaigns.get(campaign_id)
+    if dialer is None:
+        raise HTTPException(status_code=404, detail="Unknown campaign")
+    return dialer
+
+
+@router.get("/dialer/campaigns/{campaign_id}", dependencies=[Depends(require_admin)])
+async def get_campaign(campaign_id: str):
+    return _get_campaign(campaign_id).report()
+
+
+@router.post("/dialer/campaigns/{campaign_id}/stop", dependencies=[Depends(require_admin)])
+async def stop_campaign(campaign_id: str):
+    dialer = _get_campaign(campaign_id)
+    dialer.stop()
+    return dialer.report()
+
+
+async def _plivo_callback_params(kind: str, call_id: str, request: Request) -> dict:
+    params = dict(await request.form())
+    if not dialer_service.client.verify_callback(kind, call_id, request.headers, params):
+        logger.warning(f"Rejected Plivo {kind} callback for {call_id} with a bad signature")
+        raise HTTPException(status_code=403, detail="Invalid signature")
+    return params
+
+
+@router.post("/dialer/answer/{call_id}")
+async def answer_call(call_id: str, request: Request):
+    params = await _plivo_callback_params("answer", call_id, request)
+    call = dialer_service.find_call(call_id)
+    if call is None:
+        raise HTTPException(status_code=404, detail="Unknown call")
+    return Response(dialer_service.client.answer_xml(call, params), media_type="application/xml")
+
+
+@router.post("/dialer/hangup/{call_id}")
+async def hangup_call(call_id: str, request: Request):
+    params = await _plivo_callback_params("hangup", call_id, request)
+    call = dialer_service.find_call(call_id)
+    if call is not None:
+        dialer_service.client.hangup_received(call, params)
+    return {"status": "ok"}
+
+
+@router.websocket("/dialer/stream/{call_id}")
+async def call_stream(websocket: WebSocket, call_id: str):
+    await websocket.accept()
+    call = dialer_service.find_call(call_id)
+    # Only calls answered through a signed callback get a bot
+    if call is None or call.outcome != ANSWERED:
+        await websocket.close()
+        return
+    await run_call_session(websocket, call)
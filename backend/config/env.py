@@ -20,6 +20,13 @@ CODE=os.getenv("CODE")
 ZOHO_CRM_ACCESS_TOKEN = os.getenv("ZOHO_ACCESS_TOKEN")
 ZOHO_API_URL = os.getenv("ZOHO_API_URL")
 ZOHO_AUTH_URL = os.getenv("ZOHO_AUTH_URL")
+# Operator endpoints (/api/debug/*, /api/dialer/campaigns); disabled when unset
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+# Outbound dialer (optional)
+PLIVO_AUTH_ID = os.getenv("PLIVO_AUTH_ID")
+PLIVO_AUTH_TOKEN = os.getenv("PLIVO_AUTH_TOKEN")
+PLIVO_CALLER_ID = os.getenv("PLIVO_CALLER_ID")
+DIALER_PUBLIC_URL = os.getenv("DIALER_PUBLIC_URL")
 
 
 # Validate required environment variables
@@ -0,0 +1,147 @@
+# Per-language provider profiles.
+#
+# "providers" is an ordered list: the first entry is the primary. With more
+# than one provider the service is wrapped in a router that tracks rolling
+# latency/error rate per provider, trips a circuit breaker on repeated
+# failures and hedges to the next provider when the primary is slower than
+# its p95. Only segmented STT (whisper, groq, stub) and request/response TTS
+# (sarvam, stub) providers can be combined; gladia and cartesia stream over
+# websockets and must be used on their own.
+#
+# "vad" sets the Silero VAD parameters. With streaming STT its stop_secs is
+# deliberately short: the end-of-turn controller holds each VAD stop for an
+# extra, per-session adaptive "hold" before the turn is closed (see
+# services/endpointing.py and the "endpointing" options below). Segmented STT
+# sits before that controller and transcribes every VAD segment, so it keeps
+# a long stop_secs (short pauses would split sentences and multiply STT
+# requests) and the hold starts at zero, only growing for callers whose turns
+# get cut off.
+#
+# "llm" overrides the LLM model. With "translation" the LLM replies in the
+# source language and each clause of its reply is translated into the target
+# language before TTS (services/sarvam/translation.py).
+
+from typing import Optional
+
+ROUTING_DEFAULTS = {
+    "hedge": True,
+    "min_hedge_delay": 0.3,
+    "max_hedge_delay": 2.0,
+    "min_samples": 10,
+    "window": 100,
+    "failure_threshold": 3,
+    "cooldown": 30.0,
+}
+
+VAD_DEFAULTS = {
+    "confidence": 0.7,
+    "start_secs": 0.2,
+    "stop_secs": 0.3,
+    "min_volume": 0.6,
+}
+
+# STT providers that transcribe one VAD segment per request
+SEGMENTED_STT_PROVIDERS = {"whisper", "groq", "stub"}
+
+SEGMENTED_STT_VAD_DEFAULTS = {
+    "stop_secs": 0.8,
+}
+
+TRANSLATION_DEFAULTS = {
+    "source_language_code": "en-IN",
+    "target_language_code": "ta-IN",
+    # Clauses translated at once; their output order is always preserved
+    "max_concurrency": 3,
+    # Commas only end a clause this long; sentence ends always do
+    "min_clause_chars": 40,
+}
+
+ENDPOINTING_DEFAULTS = {
+    # Hold used until enough pauses have been observed for the caller
+    "initial_hold": 0.5,
+    "min_hold": 0.1,
+    "max_hold": 1.5,
+    # Hold = this percentile of the caller's in-turn pauses plus a margin
+    "adapt_percentile": 0.9,
+    "margin": 0.1,
+    "min_samples": 5,
+    "window": 50,
+    # Consult the latest (interim) transcript before closing the turn: a
+    # trailing connective extends the hold, a finished sentence shortens it.
+    "use_interim_text": True,
+    "incomplete_extension": 0.4,
+    "complete_hold_factor": 0.5,
+    # Speech resuming this soon after a closed turn counts as a false cut-off
+    "false_cutoff_window": 1.0,
+}
+
+SEGMENTED_STT_ENDPOINTING_DEFAULTS = {
+    "initial_hold": 0.0,
+    "min_hold": 0.0,
+    "max_hold": 0.7,
+    # The transcript only arrives after the STT request, too late to help
+    "use_interim_text": False,
+}
+
+LANGUAGE_PROFILES = {
+    "ta": {
+        "stt": {"providers": ["whisper"]},
+        "tts": {"providers": ["sarvam"]},
+        # Tamil callers pause longer mid-sentence
+        "endpointing": {"max_hold": 1.0},
+    },
+    # Tamil speech with an English LLM: whisper already transcribes Tamil
+    # into English, and replies are translated back clause by clause.
+    "ta-en": {
+        "stt": {"providers": ["whisper"]},
+        "tts": {"providers": ["sarvam"]},
+        "llm": {"model": "meta-llama/Llama-3.3-70B-Instruct-Turbo"},
+        "translation": {},
+        "endpointing": {"max_hold": 1.0},
+    },
+    "en": {
+        "stt": {"providers": ["gladia"]},
+        "tts": {"providers": ["cartesia"]},
+        "endpointing": {"initial_hold": 0.4},
+    },
+}
+
+DEFAULT_PROFILE = "en"
+
+
+def get_language_profile(language: str) -> dict:
+    return LANGUAGE_PROFILES.get(language, LANGUAGE_PROFILES[DEFAULT_PROFILE])
+
+
+def get_routing_options(profile: dict, kind: str) -> dict:
+    options = dict(ROUTING_DEFAULTS)
+    options.update(profile[kind].get("routing", {}))
+    return options
+
+
+def uses_segmented_stt(profile: dict) -> bool:
+    return any(name in SEGMENTED_STT_PROVIDERS for name in profile["stt"]["providers"])
+
+
+def get_vad_options(profile: dict) -> dict:
+    options = dict(VAD_DEFAULTS)
+    if uses_segmented_stt(profile):
+        options.update(SEGMENTED_STT_VAD_DEFAULTS)
+    options.update(profile.get("vad", {}))
+    return options
+
+
+def get_endpointing_options(profile: dict) -> dict:
+    options = dict(ENDPOINTING_DEFAULTS)
+    if uses_segmented_stt(profile):
+        options.update(SEGMENTED_STT_ENDPOINTING_DEFAULTS)
+    options.update(profile.get("endpointing", {}))
+    return options
+
+
+def get_translation_options(profile: dict) -> Optional[dict]:
+    if "translation" not in profile:
+        return None
+    options = dict(TRANSLATION_DEFAULTS)
+    options.update(profile["translation"])
+    return options
@@ -5,8 +5,78 @@ API_HOST = "localhost"
 API_PORT = 7860
 ALLOWED_ORIGINS: List[str] = ["http://localhost:3000"]
 
-# Logging Settings
+# Logging Settings (level can be changed at runtime via /api/debug/logging)
 LOG_LEVEL = "INFO"
+LOG_FORMAT = "json"  # or "text"
+LOG_QUEUE_SIZE = 10000
+# Per call site budget for log_sampled() (records/second, burst)
+LOG_SAMPLED_RATE = 1.0
+LOG_SAMPLED_BURST = 5
 
 # WebRTC Settings
-WEBRTC_AUDIO_CHUNK_SIZE = 2
\ No newline at end of file
+WEBRTC_AUDIO_CHUNK_SIZE = 2
+
+# Bot audio pacing between TTS and the output transport (services/output_pacer.py):
+# seconds of audio queued ahead of playout, and how far TTS may run ahead of
+# that before it has to wait
+OUTPUT_PACER_ENABLED = True
+OUTPUT_LOOKAHEAD = 0.3
+OUTPUT_MAX_BUFFER = 1.0
+
+# Save every raw Sarvam TTS response under debug_audio/
+SARVAM_DEBUG_AUDIO = False
+
+
+# Rate limits per provider API key, shared by all sessions in the process
+# (rate in requests/second, burst in requests)
+RATE_LIMITS = {
+    "default": {"rate": 10.0, "burst": 20},
+    "sarvam": {"rate": 5.0, "burst": 10},
+    "together": {"rate": 10.0, "burst": 20},
+    "openai": {"rate": 8.0, "burst": 16},
+    # Outbound call creation (Plivo's default is 2 calls/second per account)
+    "plivo": {"rate": 2.0, "burst": 2},
+}
+# Share of each burst that background requests (bulk extraction) leave for
+# real-time calls
+RATE_LIMIT_REALTIME_RESERVE = 0.25
+
+
+# Event loop monitor (can also be toggled at runtime via /api/debug/loop)
+LOOP_MONITOR_ENABLED = False
+LOOP_MONITOR_INTERVAL = 0.1
+LOOP_MONITOR_BLOCK_THRESHOLD = 0.1
+
+
+# Session recording for offline replay (python -m services.replay.run)
+RECORD_SESSIONS = False
+RECORDINGS_DIR = "recordings"
+
+
+# Per-call transcripts, read back by the bulk re-extraction CLI
+# (python -m services.zoho.bulk_extract)
+TRANSCRIPTS_DIR = "transcripts"
+BULK_EXTRACT_CONCURRENCY = 16
+# Records per Zoho upsert call (Zoho accepts at most 100)
+ZOHO_BULK_BATCH_SIZE = 100
+
+
+# Outbound campaign dialer (services/dialer). The global cap is also the
+# size of the session pool: calls that are ringing or connected.
+DIALER_MAX_CONCURRENT_CALLS = 20
+DIALER_LANGUAGE_CAPS = {"ta": 12, "en": 12}
+# Fraction of the pool the pacer tries to keep in conversation
+DIALER_TARGET_UTILIZATION = 0.85
+DIALER_MAX_ATTEMPTS = 3
+DIALER_RETRY_DELAY = 30 * 60
+DIALER_RING_TIMEOUT = 30
+DIALER_MAX_CALL_DURATION = 15 * 60
+# Local calling window [start, end) hours on these weekdays (0 = Monday),
+# in the lead's timezone or DIALER_TIMEZONE if the call list has none
+DIALER_CALLING_HOURS = (10, 19)
+DIALER_CALLING_DAYS = (0, 1, 2, 3, 4, 5)
+DIALER_TIMEZONE = "Asia/Kolkata"
+# Uploaded call lists larger than this are rejected
+DIALER_MAX_CALL_LIST_BYTES = 5 * 1024 * 1024
+# Finished campaigns whose reports stay available through the API
+DIALER_FINISHED_CAMPAIGNS_KEPT = 20
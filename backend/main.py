@@ -8,9 +8,10 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from api.routes import router
 from config.env import validate_env
-from config.settings import API_HOST, API_PORT, ALLOWED_ORIGINS
+from config.settings import API_HOST, API_PORT, ALLOWED_ORIGINS, LOOP_MONITOR_ENABLED
 from services.webrtc_service import WebRTCService
 from utils.logging import setup_logging
+from utils.loop_monitor import loop_monitor
 
 logger = setup_logging()
 
@@ -37,7 +38,10 @@ app.include_router(router, prefix="/api")
 async def lifespan(app: FastAPI):
     # Validate environment variables on startup
     validate_env()
+    if LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
     yield
+    await loop_monitor.stop()
     # Cleanup WebRTC connections on shutdown
     await webrtc_service.cleanup()
 
@@ -56,4 +60,5 @@ if __name__ == "__main__":
 
     
 
-    uvicorn.run(app, host=args.host, port=args.port) 
\ No newline at end of file
+    # Let uvicorn's loggers propagate into our queue-based sink
+    uvicorn.run(app, host=args.host, port=args.port, log_config=None) 
\ No newline at end of file
@@ -7,33 +7,67 @@ from pipecat.services.openai.llm import OpenAILLMService
 from pipecat.services.together.llm import TogetherLLMService
 from pipecat.services.openai.stt import OpenAISTTService
 from pipecat.services.gladia.stt import GladiaSTTService
+from pipecat.services.groq.stt import GroqSTTService
 from pipecat.services.gladia.config import GladiaInputParams, LanguageConfig, RealtimeProcessingConfig
 from pipecat.services.cartesia.tts import CartesiaTTSService
 from services.sarvam.tts import SarvamTTSService
+from services.sarvam.translation import SarvamTranslationService
+from services.routing.stt import RoutedSTTService
+from services.routing.tts import RoutedTTSService
+from services.routing.stubs import StubSTTService, StubTTSService
+from services.rate_limited import RateLimitedOpenAISTTService, RateLimitedTogetherLLMService
+from services.replay.recording import SessionRecorder
+from services.endpointing import EndOfTurnController
+from services.output_pacer import OutputPacer
 from pipecat.transcriptions.language import Language
 from pipecat.transports.network.small_webrtc import SmallWebRTCTransport
 from pipecat.pipeline.task import PipelineParams, PipelineTask
-from config.env import OPENAI_API_KEY, SARVAM_API_KEY, CARTESIA_API_KEY, GLADIA_API_KEY, TOGETHER_API_KEY
-from utils.constants import SYSTEM_INSTRUCTION, INITIAL_BOT_MESSAGE, SYSTEM_INSTRUCTION_TA
+from config.env import OPENAI_API_KEY, SARVAM_API_KEY, CARTESIA_API_KEY, GLADIA_API_KEY, TOGETHER_API_KEY, GROQ_API_KEY
+from config.profiles import (
+    get_endpointing_options,
+    get_language_profile,
+    get_routing_options,
+    get_translation_options,
+    get_vad_options,
+)
+from config.settings import (
+    OUTPUT_LOOKAHEAD,
+    OUTPUT_MAX_BUFFER,
+    OUTPUT_PACER_ENABLED,
+    RECORD_SESSIONS,
+    RECORDINGS_DIR,
+    TRANSCRIPTS_DIR,
+)
+from utils.constants import SYSTEM_INSTRUCTION, INITIAL_BOT_MESSAGE, SYSTEM_INSTRUCTION_TA, STT_PROMPT_TA
 from utils.logging import setup_logging
 from services.zoho.zoho_llm import get_lead_data_with_llm  # ✅ Newly imported
 
 import openai
 import asyncio
 import json
+import os
+import time
+from typing import Optional
 
 logger = setup_logging()
 
 
 class BotService:
-    def __init__(self, transport: SmallWebRTCTransport, language: str):
+    def __init__(self, transport: SmallWebRTCTransport, language: str, pc_id: Optional[str] = None):
         self.transport = transport
+        self.pc_id = pc_id
+        self.language = language
         self.full_transcript = []
 
         # Initialize components
         self.stt = self._create_stt(language)
+        self.end_of_turn = self._create_end_of_turn(language)
         self.llm = self._create_llm(language)
+        self.translation = self._create_translation(language)
         self.tts = self._create_tts(language)
+        self.output_pacer = self._create_output_pacer(language)
+        if self.output_pacer and hasattr(self.tts, "set_output_pacer"):
+            self.tts.set_output_pacer(self.output_pacer)
         self.context = self._create_context(language)
         self.context_aggregator = self.llm.create_context_aggregator(self.context)
 
@@ -41,12 +75,18 @@ class BotService:
         self.transcript = TranscriptProcessor()
         self._setup_transcript_handler()
 
+        # Optional session recording for offline replay
+        self.recorder = self._create_recorder(pc_id, language)
+
         # Build pipeline and task
         self.pipeline = self._create_pipeline()
         self.task = self._create_task()
         self.runner = PipelineRunner(handle_sigint=False)
 
         # Event handlers
+        self._register_event_handlers()
+
+    def _register_event_handlers(self):
         self.transport.event_handler("on_client_connected")(self.on_client_connected)
         self.transport.event_handler("on_client_disconnected")(self.on_client_disconnected)
         self.transport.event_handler("on_client_closed")(self.on_client_closed)
@@ -60,59 +100,122 @@ class BotService:
                     "role": message.role,
                     "content": message.content
                 })
-            print("Transcript Update =====================", self.full_transcript)
+                logger.debug(f"Transcript update [{message.role}]: {message.content}")
 
     def _create_stt(self, language: str):
-        if language == "ta":
-            transcript_ta = OpenAISTTService(
+        profile = get_language_profile(language)
+        names = profile["stt"]["providers"]
+        if len(names) == 1:
+            return self._create_stt_provider(names[0])
+        return RoutedSTTService(
+            providers={name: self._create_stt_provider(name) for name in names},
+            routing=get_routing_options(profile, "stt"),
+        )
+
+    def _create_stt_provider(self, name: str):
+        if name == "whisper":
+            transcript_ta = RateLimitedOpenAISTTService(
                 api_key=OPENAI_API_KEY,
                 model="whisper-1",
-                prompt="""Listen carefully to Tamil speech. Transcribe it accurately into clear and correct English. 
-                Do not miss any words or important context. The user is speaking in Tamil clearly. Listen carefully.""",
+                prompt=STT_PROMPT_TA,
                 temperature=0.0
             )
-            print("Transcript TA =====================", transcript_ta)
             return transcript_ta
-        else:
+        elif name == "groq":
+            return GroqSTTService(
+                api_key=GROQ_API_KEY,
+                model="whisper-large-v3",
+                language=Language.EN,
+                prompt=STT_PROMPT_TA,
+                temperature=0.0
+            )
+        elif name == "gladia":
             transcript = GladiaSTTService(
                 api_key=GLADIA_API_KEY,
                 model="solaria-1",
                 language="en",
                 code_switching=True
             )
-            print("Transcript =====================", transcript)
             return transcript
+        elif name == "stub":
+            return StubSTTService()
+        raise ValueError(f"Unknown STT provider: {name}")
+
+    def _create_end_of_turn(self, language: str) -> EndOfTurnController:
+        profile = get_language_profile(language)
+        return EndOfTurnController(
+            language=language,
+            vad_stop_secs=get_vad_options(profile)["stop_secs"],
+            **get_endpointing_options(profile),
+        )
 
     def _create_llm(self, language: str) -> TogetherLLMService:
-        print("Language ================", language)
+        model = get_language_profile(language).get("llm", {}).get(
+            "model", "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo"
+        )
         if language == "ta":
-            return TogetherLLMService(
+            return RateLimitedTogetherLLMService(
                 api_key=TOGETHER_API_KEY,
-                model="meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo",
+                model=model,
                 system_instruction=SYSTEM_INSTRUCTION_TA
             )
         else:
-            return TogetherLLMService(
+            return RateLimitedTogetherLLMService(
                 api_key=TOGETHER_API_KEY,
-                model="meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo",
+                model=model,
                 system_instruction=SYSTEM_INSTRUCTION
             )
 
+    def _create_translation(self, language: str) -> Optional[SarvamTranslationService]:
+        options = get_translation_options(get_language_profile(language))
+        if options is None:
+            return None
+        return SarvamTranslationService(api_key=SARVAM_API_KEY, **options)
+
     def _create_tts(self, language: str):
-        if language == "ta":
+        profile = get_language_profile(language)
+        names = profile["tts"]["providers"]
+        options = {}
+        if self.translation:
+            # Translated replies arrive already split into clauses: speak each
+            # one as soon as it comes instead of waiting for a full sentence.
+            # The translation stage hands the untranslated text to the
+            # aggregators itself, so the TTS must not push the spoken text.
+            if "cartesia" in names:
+                raise ValueError("Translated profiles need a request/response TTS provider, not cartesia")
+            options = {"aggregate_sentences": False, "push_text_frames": False}
+        if len(names) == 1:
+            return self._create_tts_provider(names[0], **options)
+        return RoutedTTSService(
+            providers={name: self._create_tts_provider(name) for name in names},
+            routing=get_routing_options(profile, "tts"),
+            **options,
+        )
+
+    def _create_tts_provider(self, name: str, **kwargs):
+        if name == "sarvam":
             return SarvamTTSService(
                 api_key=SARVAM_API_KEY,
                 voice="anushka",
                 model="bulbul:v2",
                 sample_rate=24000,
-                target_language_code="ta-IN"
+                target_language_code="ta-IN",
+                **kwargs,
             )
-        else:
+        elif name == "cartesia":
             return CartesiaTTSService(
                 api_key=CARTESIA_API_KEY,
                 voice_id="0c8ed86e-6c64-40f0-b252-b773911de6bb",
                 model="sonic-2",
             )
+        elif name == "stub":
+            return StubTTSService(sample_rate=24000, **kwargs)
+        raise ValueError(f"Unknown TTS provider: {name}")
+
+    def _create_output_pacer(self, language: str) -> Optional[OutputPacer]:
+        if not OUTPUT_PACER_ENABLED:
+            return None
+        return OutputPacer(language=language, lookahead=OUTPUT_LOOKAHEAD, max_buffer=OUTPUT_MAX_BUFFER)
 
     def _create_context(self, language: str) -> OpenAILLMContext:
         if language == "ta":
@@ -121,27 +224,51 @@ class BotService:
             return OpenAILLMContext([{"role": "system", "content": SYSTEM_INSTRUCTION}, INITIAL_BOT_MESSAGE])
 
     def _create_pipeline(self) -> Pipeline:
-        return Pipeline([
+        processors = [
             self.transport.input(),         # Audio input
             self.stt,                       # Speech-to-text
+            self.end_of_turn,               # Adaptive end-of-turn detection
             self.transcript.user(),         # <== Already present
             self.context_aggregator.user(),
             self.llm,                       # LLM processing
+            self.translation,               # Clause-by-clause translation (translated profiles)
             self.tts,                       # TTS
+            self.translation.source_text() if self.translation else None,  # Untranslated text for the aggregators
+            self.output_pacer,              # Bounded look-ahead of bot audio
             self.transport.output(),        # Output audio
             self.transcript.assistant(),    # <== Already present
             self.context_aggregator.assistant(),
-        ])
+        ]
+        return Pipeline([processor for processor in processors if processor is not None])
+
+    def _create_pipeline_params(self) -> PipelineParams:
+        return PipelineParams(
+            allow_interruptions=True,
+            enable_metrics=True,
+            enable_usage_metrics=True,
+            report_only_initial_ttfb=True,
+        )
+
+    def _create_recorder(self, pc_id: Optional[str], language: str) -> Optional[SessionRecorder]:
+        if not RECORD_SESSIONS:
+            return None
+        return SessionRecorder(
+            pc_id=pc_id,
+            language=language,
+            input=self.transport.input(),
+            stt=self.stt,
+            llm=self.llm,
+            tts=self.tts,
+        )
+
+    def _create_observers(self) -> list:
+        return [self.recorder] if self.recorder else []
 
     def _create_task(self) -> PipelineTask:
         return PipelineTask(
             self.pipeline,
-            params=PipelineParams(
-                allow_interruptions=True,
-                enable_metrics=True,
-                enable_usage_metrics=True,
-                report_only_initial_ttfb=True,
-            ),
+            params=self._create_pipeline_params(),
+            observers=self._create_observers(),
         )
 
     async def on_client_connected(self, transport, client):
@@ -153,27 +280,40 @@ class BotService:
         logger.info("Pipecat Client disconnected")
 
     async def on_client_closed(self, transport, client):
-        logger.info("Pipecat Client closed")
-        await self.task.cancel()
+        # Called from the WebRTC connection rather than a pipeline task
+        with self._log_context():
+            logger.info("Pipecat Client closed")
+            await self.task.cancel()
 
-        # Print final transcript
-        logger.info("Full Conversation Transcript:")
-        for entry in self.full_transcript:
-            logger.info(f"[{entry['timestamp']}] {entry['role'].capitalize()}: {entry['content']}")
+            # Print final transcript
+            logger.info("Full Conversation Transcript:")
+            for entry in self.full_transcript:
+                logger.info(f"[{entry['timestamp']}] {entry['role'].capitalize()}: {entry['content']}")
 
-        # Optional: Save to file
-        import json
-        with open("latest_conversation.json", "w") as f:
-            json.dump(self.full_transcript, f, indent=2)
+            # Optional: Save to file
+            session_name = f"{int(time.time())}_{self.pc_id or 'session'}"
+            await asyncio.to_thread(self._save_transcript, list(self.full_transcript), session_name)
+            if self.recorder:
+                path = os.path.join(RECORDINGS_DIR, session_name)
+                await asyncio.to_thread(self.recorder.save, path)
 
-        # ✅ NEW: Extract and send lead data after conversation ends
-        try:
-            await self.process_lead_data()
-        except Exception as e:
-            logger.error("Failed to process lead data:", exc_info=True)
+            # ✅ NEW: Extract and send lead data after conversation ends
+            try:
+                await self.process_lead_data()
+            except Exception as e:
+                logger.exception(f"Failed to process lead data: {e}")
 
-        # Clear for next session
-        self.full_transcript.clear()
+            # Clear for next session
+            self.full_transcript.clear()
+
+    def _save_transcript(self, transcript: list, session_name: str):
+        with open("latest_conversation.json", "w") as f:
+            json.dump(transcript, f, indent=2)
+        # Kept per call so leads can be re-extracted in bulk later
+        if transcript:
+            os.makedirs(TRANSCRIPTS_DIR, exist_ok=True)
+            with open(os.path.join(TRANSCRIPTS_DIR, f"{session_name}.json"), "w") as f:
+                json.dump(transcript, f, indent=2)
 
     async def process_lead_data(self):
         """Trigger LLM-based lead extraction and submit to Zoho"""
@@ -183,8 +323,14 @@ class BotService:
             return
 
         # Call the external LLM function
-        lead_data = await asyncio.get_event_loop().run_in_executor(None, get_lead_data_with_llm, self.full_transcript)
-        logger.info("Lead Data Extracted:", lead_data)
+        lead_data = await get_lead_data_with_llm(self.full_transcript)
+        logger.info(f"Lead Data Extracted: {lead_data}")
+
+    def _log_context(self):
+        return logger.contextualize(pc_id=self.pc_id, language=self.language)
 
     async def run(self):
-        await self.runner.run(self.task)
\ No newline at end of file
+        # Every task the pipeline creates inherits this context, so all log
+        # records of the session carry its pc_id and language.
+        with self._log_context():
+            await self.runner.run(self.task)
\ No newline at end of file
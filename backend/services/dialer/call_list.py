@@ -0,0 +1,63 @@
+import csv
+import re
+from typing import Iterable, Iterator, Optional
+
+from config.profiles import LANGUAGE_PROFILES
+from utils.logging import setup_logging
+
+logger = setup_logging()
+
+
+class CallTarget:
+    """One lead to call back, plus its dialing state within a campaign."""
+
+    def __init__(self, phone: str, name: str = "", language: str = "en", timezone: Optional[str] = None):
+        self.phone = phone
+        self.name = name
+        self.language = language
+        self.timezone = timezone
+        self.attempts = 0
+        self.outcomes = []
+
+    def __repr__(self):
+        return f"CallTarget({self.phone}, {self.language}, attempts={self.attempts})"
+
+
+def normalize_phone(phone: str) -> str:
+    # Keep a leading + for E.164 numbers, drop spaces, dashes and brackets
+    phone = phone.strip()
+    digits = re.sub(r"\D", "", phone)
+    return f"+{digits}" if phone.startswith("+") else digits
+
+
+def load_call_list(path: str) -> Iterator[CallTarget]:
+    """Reads a CSV call list file, see ``read_call_list``."""
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from read_call_list(f, source=path)
+
+
+def read_call_list(lines: Iterable[str], source: str = "call list") -> Iterator[CallTarget]:
+    """Parses CSV call list lines with a header row.
+
+    Columns: phone (required), name, language, timezone. Rows with no phone,
+    duplicate numbers and unknown languages are skipped with a warning.
+    """
+    seen = set()
+    for line, row in enumerate(csv.DictReader(lines), start=2):
+        phone = normalize_phone(row.get("phone") or "")
+        if not phone:
+            logger.warning(f"{source}:{line}: no phone number, skipping")
+            continue
+        if phone in seen:
+            continue
+        language = (row.get("language") or "en").strip()
+        if language not in LANGUAGE_PROFILES:
+            logger.warning(f"{source}:{line}: unknown language {language!r}, skipping")
+            continue
+        seen.add(phone)
+        yield CallTarget(
+            phone=phone,
+            name=(row.get("name") or "").strip(),
+            language=language,
+            timezone=(row.get("timezone") or "").strip() or None,
+        )
@@ -0,0 +1,185 @@
+import asyncio
+import base64
+import json
+from typing import Optional
+
+import plivo
+from plivo import plivoxml
+from plivo.utils.signature_v3 import validate_v3_signature
+from pydantic import BaseModel
+
+from pipecat.audio.utils import create_default_resampler, pcm_to_ulaw, ulaw_to_pcm
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    Frame,
+    InputAudioRawFrame,
+    InputDTMFFrame,
+    KeypadEntry,
+    StartFrame,
+    StartInterruptionFrame,
+    TransportMessageFrame,
+    TransportMessageUrgentFrame,
+)
+from pipecat.serializers.base_serializer import FrameSerializer, FrameSerializerType
+
+from config.env import DIALER_PUBLIC_URL, PLIVO_AUTH_ID, PLIVO_AUTH_TOKEN, PLIVO_CALLER_ID
+from services.dialer.telephony import ANSWERED, BUSY, FAILED, NO_ANSWER, Call, TelephonyClient
+from utils.logging import setup_logging
+
+logger = setup_logging()
+
+# Plivo hangup callback CallStatus for calls that never connected
+_UNANSWERED_STATUS = {
+    "busy": BUSY,
+    "no-answer": NO_ANSWER,
+    "timeout": NO_ANSWER,
+    "cancel": NO_ANSWER,
+    "failed": FAILED,
+}
+
+
+class PlivoTelephonyClient(TelephonyClient):
+    """Places calls through the Plivo Voice API.
+
+    Plivo calls ``/api/dialer/answer/{call_id}`` when the callee picks up,
+    which streams the call audio to ``/api/dialer/stream/{call_id}``, and
+    ``/api/dialer/hangup/{call_id}`` when the call ends for any reason.
+    """
+
+    def __init__(
+        self,
+        auth_id: str = PLIVO_AUTH_ID,
+        auth_token: str = PLIVO_AUTH_TOKEN,
+        caller_id: str = PLIVO_CALLER_ID,
+        public_url: str = DIALER_PUBLIC_URL,
+    ):
+        super().__init__()
+        if not (auth_id and auth_token and caller_id and public_url):
+            raise ValueError(
+                "Outbound calls need PLIVO_AUTH_ID, PLIVO_AUTH_TOKEN, PLIVO_CALLER_ID and DIALER_PUBLIC_URL"
+            )
+        self._client = plivo.RestClient(auth_id, auth_token)
+        self._auth_token = auth_token
+        self._caller_id = caller_id
+        self._public_url = public_url.rstrip("/")
+
+    def _url(self, path: str) -> str:
+        return f"{self._public_url}/api/dialer/{path}"
+
+    def callback_url(self, kind: str, call_id: str) -> str:
+        return self._url(f"{kind}/{call_id}")
+
+    def stream_url(self, call_id: str) -> str:
+        return self._url(f"stream/{call_id}").replace("https://", "wss://").replace("http://", "ws://")
+
+    async def dial(self, call: Call, ring_timeout: float):
+        self.calls[call.call_id] = call
+        # The Plivo SDK is synchronous; keep its HTTP request off the event loop
+        response = await asyncio.to_thread(
+            self._client.calls.create,
+            from_=self._caller_id,
+            to_=call.target.phone,
+            answer_url=self.callback_url("answer", call.call_id),
+            answer_method="POST",
+            hangup_url=self.callback_url("hangup", call.call_id),
+            hangup_method="POST",
+            ring_timeout=int(ring_timeout),
+        )
+        call.provider_id = response.request_uuid
+
+    async def hangup(self, call: Call):
+        # A call that is still ringing ends by itself at the ring timeout
+        if call.outcome == ANSWERED and call.provider_id:
+            await asyncio.to_thread(self._client.calls.delete, call.provider_id)
+
+    def verify_callback(self, kind: str, call_id: str, headers, params: dict) -> bool:
+        """Checks a callback's X-Plivo-Signature-V3 against our auth token.
+
+        Signatures cover the URL Plivo was given, so they are checked
+        against that public URL rather than the one the request arrived on.
+        """
+        signature = headers.get("X-Plivo-Signature-V3")
+        nonce = headers.get("X-Plivo-Signature-V3-Nonce")
+        if not signature or not nonce:
+            return False
+        return validate_v3_signature(
+            "POST", self.callback_url(kind, call_id), nonce, self._auth_token, signature, params
+        )
+
+    def answer_xml(self, call: Call, params: dict) -> str:
+        """Handles the answer callback: records the pickup and returns the
+        XML that connects the call audio to the bot."""
+        # From here on the live call is addressed by its CallUUID
+        call.provider_id = params.get("CallUUID") or call.provider_id
+        call.set_outcome(ANSWERED)
+        stream = plivoxml.StreamElement(
+            self.stream_url(call.call_id),
+            bidirectional=True,
+            keepCallAlive=True,
+            contentType="audio/x-mulaw;rate=8000",
+        )
+        return plivoxml.ResponseElement().add(stream).to_string()
+
+    def hangup_received(self, call: Call, params: dict):
+        status = params.get("CallStatus", "")
+        if not call.answered.done():
+            call.set_outcome(_UNANSWERED_STATUS.get(status, FAILED))
+            logger.debug(f"{call}: not answered ({status}, {params.get('HangupCause')})")
+        call.ended.set()
+
+
+class PlivoFrameSerializer(FrameSerializer):
+    """Frames to and from Plivo's bidirectional audio stream.
+
+    Plivo sends 8kHz μ-law in ``media`` events and plays back ``playAudio``
+    events; ``clearAudio`` drops whatever is still queued on an
+    interruption. Modelled on pipecat's Twilio serializer.
+    """
+
+    class InputParams(BaseModel):
+        plivo_sample_rate: int = 8000
+        sample_rate: Optional[int] = None  # Pipeline input rate
+
+    def __init__(self, stream_id: str, params: InputParams = InputParams()):
+        self._stream_id = stream_id
+        self._params = params
+        self._plivo_sample_rate = params.plivo_sample_rate
+        self._sample_rate = 0
+        self._resampler = create_default_resampler()
+
+    @property
+    def type(self) -> FrameSerializerType:
+        return FrameSerializerType.TEXT
+
+    async def setup(self, frame: StartFrame):
+        self._sample_rate = self._params.sample_rate or frame.audio_in_sample_rate
+
+    async def serialize(self, frame: Frame) -> str | bytes | None:
+        if isinstance(frame, StartInterruptionFrame):
+            return json.dumps({"event": "clearAudio", "streamId": self._stream_id})
+        elif isinstance(frame, AudioRawFrame):
+            data = await pcm_to_ulaw(frame.audio, frame.sample_rate, self._plivo_sample_rate, self._resampler)
+            return json.dumps({
+                "event": "playAudio",
+                "media": {
+                    "contentType": "audio/x-mulaw",
+                    "sampleRate": self._plivo_sample_rate,
+                    "payload": base64.b64encode(data).decode("utf-8"),
+                },
+            })
+        elif isinstance(frame, (TransportMessageFrame, TransportMessageUrgentFrame)):
+            return json.dumps(frame.message)
+
+    async def deserialize(self, data: str | bytes) -> Frame | None:
+        message = json.loads(data)
+        event = message.get("event")
+        if event == "media":
+            payload = base64.b64decode(message["media"]["payload"])
+            audio = await ulaw_to_pcm(payload, self._plivo_sample_rate, self._sample_rate, self._resampler)
+            return InputAudioRawFrame(audio=audio, num_channels=1, sample_rate=self._sample_rate)
+        elif event == "dtmf":
+            try:
+                return InputDTMFFrame(KeypadEntry(message.get("dtmf", {}).get("digit")))
+            except ValueError:
+                return None
+        return None
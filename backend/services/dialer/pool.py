@@ -0,0 +1,99 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from pipecat.audio.vad.silero import SileroVADAnalyzer
+from pipecat.audio.vad.vad_analyzer import VADParams
+
+from config.profiles import get_language_profile, get_vad_options
+from utils.logging import setup_logging
+from utils.metrics import metrics
+
+logger = setup_logging()
+
+
+class PooledSession:
+    """A reserved call slot and the pre-loaded pieces its pipeline reuses."""
+
+    def __init__(self, language: str, vad_analyzer: Optional[SileroVADAnalyzer]):
+        self.language = language
+        self.vad_analyzer = vad_analyzer
+        self.calls = 0
+
+
+class SessionPool:
+    """Fixed pool of bot sessions shared by all outbound calls.
+
+    Its capacity is the number of calls that may be ringing or connected at
+    once. Each slot keeps a Silero VAD analyzer loaded with its language's
+    VAD profile, so an answered call gets its ``BotService`` pipeline
+    without loading the model on the answer path. Slots are reserved when
+    the call is dialed, so every call that connects has a session waiting.
+    """
+
+    def __init__(self, capacity: int, language_caps: Dict[str, int], load_vad: bool = True):
+        self.capacity = capacity
+        self._language_caps = language_caps
+        self._load_vad = load_vad
+        self._free: Dict[str, List[PooledSession]] = defaultdict(list)
+        self._in_use = 0
+        self._in_use_by_language: Dict[str, int] = defaultdict(int)
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    @property
+    def available(self) -> int:
+        return self.capacity - self._in_use
+
+    def in_use_for(self, language: str) -> int:
+        return self._in_use_by_language[language]
+
+    def available_for(self, language: str) -> int:
+        cap = min(self.capacity, self._language_caps.get(language, self.capacity))
+        return min(self.available, cap - self._in_use_by_language[language])
+
+    def _create_session(self, language: str) -> PooledSession:
+        analyzer = None
+        if self._load_vad:
+            vad_params = VADParams(**get_vad_options(get_language_profile(language)))
+            analyzer = SileroVADAnalyzer(params=vad_params)
+        return PooledSession(language, analyzer)
+
+    async def warm(self, languages):
+        """Pre-loads one session per concurrent call each language may have."""
+        for language in languages:
+            count = min(self.capacity, self._language_caps.get(language, self.capacity))
+            missing = count - len(self._free[language])
+            # Model loading is CPU work; keep it off the event loop
+            sessions = await asyncio.gather(
+                *(asyncio.to_thread(self._create_session, language) for _ in range(missing))
+            )
+            self._free[language].extend(sessions)
+            if missing > 0:
+                logger.info(f"Session pool: warmed {missing} {language} sessions")
+
+    def acquire(self, language: str) -> Optional[PooledSession]:
+        if self.available_for(language) <= 0:
+            return None
+        free = self._free[language]
+        session = free.pop() if free else self._create_session(language)
+        session.calls += 1
+        self._in_use += 1
+        self._in_use_by_language[language] += 1
+        self._publish()
+        return session
+
+    def release(self, session: PooledSession, reusable: bool = True):
+        """Frees the slot. A session whose pipeline may still be running is
+        released with ``reusable=False`` and dropped instead of handed out."""
+        language = session.language
+        self._in_use -= 1
+        self._in_use_by_language[language] -= 1
+        if reusable:
+            self._free[language].append(session)
+        self._publish()
+
+    def _publish(self):
+        metrics.set_gauge("dialer_sessions_in_use", self._in_use)
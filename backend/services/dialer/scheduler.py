@@ -0,0 +1,413 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from config.settings import (
+    DIALER_CALLING_DAYS,
+    DIALER_CALLING_HOURS,
+    DIALER_MAX_ATTEMPTS,
+    DIALER_MAX_CALL_DURATION,
+    DIALER_RETRY_DELAY,
+    DIALER_RING_TIMEOUT,
+    DIALER_TARGET_UTILIZATION,
+    DIALER_TIMEZONE,
+)
+from services.dialer.call_list import CallTarget
+from services.dialer.pool import SessionPool
+from services.dialer.telephony import ANSWERED, BUSY, FAILED, NO_ANSWER, Call, TelephonyClient
+from utils.logging import setup_logging
+from utils.metrics import metrics
+from utils.rate_limiter import Priority, TokenBucket
+
+logger = setup_logging()
+
+RETRY_OUTCOMES = (NO_ANSWER, BUSY)
+
+# How long past the ring timeout to wait for the provider to report an outcome
+_ANSWER_GRACE = 15.0
+# How long after a call ends to wait for its bot pipeline to shut down
+_SESSION_SHUTDOWN_GRACE = 30.0
+
+
+class DialerClock:
+    """Campaign time: the wall clock, or a sped-up one for simulations.
+
+    All scheduler delays go through ``sleep``/``wait_for`` so that a clock
+    with ``speed`` 60 runs an hour of dialing in a minute.
+    """
+
+    def __init__(self, speed: float = 1.0, start: Optional[datetime] = None):
+        self.speed = speed
+        self._origin = time.monotonic()
+        self._start = start or datetime.now(timezone.utc)
+
+    def monotonic(self) -> float:
+        return (time.monotonic() - self._origin) * self.speed
+
+    def now(self) -> datetime:
+        return self._start + timedelta(seconds=self.monotonic())
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(max(0.0, seconds) / self.speed)
+
+    async def wait_for(self, awaitable, timeout: float):
+        return await asyncio.wait_for(awaitable, max(0.0, timeout) / self.speed)
+
+    async def wait(self, event: asyncio.Event, timeout: float) -> bool:
+        try:
+            await self.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class CallingHours:
+    """Local calling window, evaluated in each lead's own timezone."""
+
+    def __init__(
+        self,
+        hours: Tuple[int, int] = DIALER_CALLING_HOURS,
+        days: Iterable[int] = DIALER_CALLING_DAYS,
+        default_timezone: str = DIALER_TIMEZONE,
+    ):
+        self.start_hour, self.end_hour = hours
+        self.days = set(days)
+        self.default_timezone = default_timezone
+        self._zones: Dict[str, ZoneInfo] = {}
+
+    def _zone(self, name: Optional[str]) -> ZoneInfo:
+        name = name or self.default_timezone
+        if name not in self._zones:
+            try:
+                self._zones[name] = ZoneInfo(name)
+            except (ZoneInfoNotFoundError, ValueError):
+                logger.warning(f"Unknown timezone {name!r}, using {self.default_timezone}")
+                self._zones[name] = ZoneInfo(self.default_timezone)
+        return self._zones[name]
+
+    def is_open(self, now: datetime, tz: Optional[str] = None) -> bool:
+        local = now.astimezone(self._zone(tz))
+        return local.weekday() in self.days and self.start_hour <= local.hour < self.end_hour
+
+    def seconds_until_open(self, now: datetime, tz: Optional[str] = None) -> float:
+        """Returns 0 inside the window, otherwise the wait until it opens."""
+        if self.is_open(now, tz):
+            return 0.0
+        local = now.astimezone(self._zone(tz))
+        opens = local.replace(hour=self.start_hour, minute=0, second=0, microsecond=0)
+        if opens <= local:
+            opens += timedelta(days=1)
+        for _ in range(7):
+            if opens.weekday() in self.days:
+                break
+            opens += timedelta(days=1)
+        return (opens.astimezone(timezone.utc) - now.astimezone(timezone.utc)).total_seconds()
+
+
+class CampaignDialer:
+    """Works through a call list under concurrency, pacing and calling-hour limits.
+
+    Every dial reserves a slot in the ``SessionPool`` until the call ends,
+    so ringing plus connected calls never exceed the pool (the global cap)
+    or a language's cap. Within that, dialing is paced predictively: with
+    connect rate ``p`` estimated from the campaign so far, ringing calls are
+    expected to yield ``ringing * p`` conversations, and the dialer places
+    just enough new calls to bring the expected number of connected calls to
+    ``target_utilization`` of the pool. Leads outside their calling hours
+    wait until the window opens; no-answers and busies are retried after
+    ``retry_delay`` up to ``max_attempts`` dials.
+    """
+
+    def __init__(
+        self,
+        targets: Iterable[CallTarget],
+        client: TelephonyClient,
+        pool: SessionPool,
+        *,
+        clock: Optional[DialerClock] = None,
+        calling_hours: Optional[CallingHours] = None,
+        dial_limiter: Optional[TokenBucket] = None,
+        target_utilization: float = DIALER_TARGET_UTILIZATION,
+        max_attempts: int = DIALER_MAX_ATTEMPTS,
+        retry_delay: float = DIALER_RETRY_DELAY,
+        ring_timeout: float = DIALER_RING_TIMEOUT,
+        max_call_duration: float = DIALER_MAX_CALL_DURATION,
+        tick: float = 1.0,
+    ):
+        self.client = client
+        self.pool = pool
+        self.clock = clock or DialerClock()
+        self.calling_hours = calling_hours or CallingHours()
+        self.dial_limiter = dial_limiter
+        self.target_utilization = target_utilization
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.ring_timeout = ring_timeout
+        self.max_call_duration = max_call_duration
+        self.tick = tick
+
+        self._ready: Dict[str, Deque[CallTarget]] = defaultdict(deque)
+        self._targets = 0
+        for target in targets:
+            self._ready[target.language].append(target)
+            self._targets += 1
+        self._deferred: List[Tuple[float, int, CallTarget]] = []
+        self._sequence = itertools.count()
+        self._in_flight: Dict[str, Call] = {}
+        self._tasks = set()
+        self._talking = 0
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self.running = False
+
+        self._started: Optional[float] = None
+        self._last_change = 0.0
+        self._talk_seconds = 0.0
+        self._occupied_seconds = 0.0
+        self._call_seconds = 0.0
+        self._dials: Dict[str, int] = defaultdict(int)
+        self._outcomes: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._connected_leads = 0
+        self._exhausted_leads = 0
+
+    @property
+    def connect_rate(self) -> float:
+        answered = sum(outcomes[ANSWERED] for outcomes in self._outcomes.values())
+        attempts = sum(sum(outcomes.values()) for outcomes in self._outcomes.values())
+        # Smoothed towards 1/2 so the first few outcomes don't swing pacing
+        return (answered + 1) / (attempts + 2)
+
+    def _pending(self) -> int:
+        return sum(len(queue) for queue in self._ready.values()) + len(self._deferred)
+
+    def _dials_wanted(self) -> int:
+        rate = max(self.connect_rate, 0.05)
+        ringing = len(self._in_flight) - self._talking
+        # Slots other campaigns hold on a shared pool count as connected
+        others = self.pool.in_use - len(self._in_flight)
+        expected = others + self._talking + ringing * rate
+        wanted = math.ceil((self.target_utilization * self.pool.capacity - expected) / rate)
+        return max(0, min(wanted, self.pool.available))
+
+    def _defer(self, target: CallTarget, delay: float):
+        heapq.heappush(self._deferred, (self.clock.monotonic() + delay, next(self._sequence), target))
+
+    def _release_due(self):
+        now = self.clock.monotonic()
+        while self._deferred and self._deferred[0][0] <= now:
+            _, _, target = heapq.heappop(self._deferred)
+            # Retries and leads whose window just opened go first
+            self._ready[target.language].appendleft(target)
+
+    def _next_target(self, now: datetime) -> Optional[CallTarget]:
+        # Least busy language first, so one long list can't starve the others
+        languages = sorted((lang for lang, queue in self._ready.items() if queue), key=self.pool.in_use_for)
+        for language in languages:
+            if self.pool.available_for(language) <= 0:
+                continue
+            queue = self._ready[language]
+            while queue:
+                target = queue.popleft()
+                wait = self.calling_hours.seconds_until_open(now, target.timezone)
+                if wait <= 0:
+                    return target
+                self._defer(target, wait)
+        return None
+
+    def _idle_timeout(self) -> float:
+        if self._in_flight or any(self._ready.values()):
+            return self.tick
+        if self._deferred:
+            return self._deferred[0][0] - self.clock.monotonic()
+        return self.tick
+
+    def _account(self):
+        # Integrates connected and reserved sessions over campaign time
+        now = self.clock.monotonic()
+        elapsed = now - self._last_change
+        self._talk_seconds += self._talking * elapsed
+        self._occupied_seconds += len(self._in_flight) * elapsed
+        self._last_change = now
+
+    def _publish(self):
+        metrics.set_gauge("dialer_ringing_calls", len(self._in_flight) - self._talking)
+        metrics.set_gauge("dialer_connected_calls", self._talking)
+        metrics.set_gauge("dialer_utilization", self._talking / self.pool.capacity)
+
+    async def run(self) -> dict:
+        self.running = True
+        self._started = self._last_change = self.clock.monotonic()
+        logger.info(f"Campaign started: {self._targets} leads, {self.pool.capacity} sessions")
+        try:
+            while not self._stopping:
+                self._release_due()
+                if not self._in_flight and not self._pending():
+                    break
+                await self._dial_batch()
+                self._wake.clear()
+                await self.clock.wait(self._wake, self._idle_timeout())
+        finally:
+            # Calls in progress are never cut off; let them finish
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            self.running = False
+        report = self.report()
+        logger.info(f"Campaign finished: {report}")
+        return report
+
+    def stop(self):
+        """Stops placing new calls; connected calls run to completion."""
+        self._stopping = True
+        self._wake.set()
+
+    async def _dial_batch(self):
+        now = self.clock.now()
+        for _ in range(self._dials_wanted()):
+            target = self._next_target(now)
+            if target is None:
+                return
+            if self.dial_limiter:
+                await self.dial_limiter.acquire(Priority.REALTIME)
+            if not self._dial(target):
+                return
+
+    def _dial(self, target: CallTarget) -> bool:
+        # Another campaign on the same pool may have taken the slot while
+        # this one waited for the dial limiter; the lead goes back in line.
+        session = self.pool.acquire(target.language)
+        if session is None:
+            self._ready[target.language].appendleft(target)
+            return False
+        target.attempts += 1
+        call = Call(target, self.clock.monotonic())
+        call.session = session
+        self._account()
+        self._in_flight[call.call_id] = call
+        self._dials[target.language] += 1
+        metrics.inc("dialer_dials_total", language=target.language)
+        self._publish()
+        task = asyncio.create_task(self._track(call))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _track(self, call: Call):
+        target = call.target
+        try:
+            try:
+                await self.client.dial(call, self.ring_timeout)
+                outcome = await self.clock.wait_for(asyncio.shield(call.answered), self.ring_timeout + _ANSWER_GRACE)
+            except asyncio.TimeoutError:
+                logger.warning(f"No outcome reported for call to {target.phone}, giving up")
+                await self._hangup(call)
+                outcome = FAILED
+            except Exception as e:
+                logger.warning(f"Dialing {target.phone} failed: {e}")
+                outcome = FAILED
+            call.set_outcome(outcome)
+            target.outcomes.append(outcome)
+            self._outcomes[target.language][outcome] += 1
+            metrics.inc("dialer_outcomes_total", language=target.language, outcome=outcome)
+
+            if outcome == ANSWERED:
+                self._connected_leads += 1
+                await self._converse(call)
+            elif outcome in RETRY_OUTCOMES and target.attempts < self.max_attempts and not self._stopping:
+                self._defer(target, self.retry_delay)
+            else:
+                self._exhausted_leads += 1
+        finally:
+            self._account()
+            self._in_flight.pop(call.call_id, None)
+            # Over as far as the dialer is concerned: a media stream that
+            # connects from now on is refused (see run_call_session).
+            call.ended.set()
+            reusable = False
+            try:
+                reusable = await self._session_finished(call)
+            finally:
+                self.pool.release(call.session, reusable=reusable)
+                self.client.forget(call)
+                self._publish()
+                self._wake.set()
+
+    async def _session_finished(self, call: Call) -> bool:
+        """Waits for the call's bot pipeline to shut down.
+
+        The hangup webhook can land while the pipeline is still tearing
+        down, and its pooled VAD analyzer must not be handed to another call
+        before it has. Returns False if the pipeline outlived the grace
+        period, in which case the session is not reused.
+        """
+        if not call.session_started or call.session_done.is_set():
+            return True
+        if await self.clock.wait(call.session_done, _SESSION_SHUTDOWN_GRACE):
+            return True
+        logger.warning(f"{call}: bot session still running {_SESSION_SHUTDOWN_GRACE:.0f}s after the call ended")
+        return False
+
+    async def _converse(self, call: Call):
+        call.answered_at = self.clock.monotonic()
+        metrics.observe("dialer_ring_seconds", call.answered_at - call.dialed_at, language=call.target.language)
+        self._account()
+        self._talking += 1
+        self._publish()
+        try:
+            if not await self.clock.wait(call.ended, self.max_call_duration):
+                logger.warning(f"Call to {call.target.phone} hit the maximum duration, hanging up")
+                await self._hangup(call)
+        finally:
+            call.ended_at = self.clock.monotonic()
+            self._call_seconds += call.ended_at - call.answered_at
+            metrics.observe("dialer_call_seconds", call.ended_at - call.answered_at, language=call.target.language)
+            self._account()
+            self._talking -= 1
+
+    async def _hangup(self, call: Call):
+        try:
+            await self.client.hangup(call)
+        except Exception as e:
+            logger.warning(f"Hanging up {call} failed: {e}")
+
+    def report(self) -> dict:
+        """Throughput so far: dials and connects per minute, connect rate and
+        time-averaged pool utilization (connected) and occupancy (reserved)."""
+        if self._started is None:
+            return {"targets": self._targets, "running": False}
+        self._account()
+        elapsed = max(self.clock.monotonic() - self._started, 1e-6)
+        minutes = elapsed / 60
+        dials = sum(self._dials.values())
+        totals: Dict[str, int] = defaultdict(int)
+        for outcomes in self._outcomes.values():
+            for outcome, count in outcomes.items():
+                totals[outcome] += count
+        attempts = sum(totals.values())
+        answered = totals[ANSWERED]
+        return {
+            "running": self.running,
+            "targets": self._targets,
+            "pending": self._pending(),
+            "in_flight": len(self._in_flight),
+            "connected_leads": self._connected_leads,
+            "exhausted_leads": self._exhausted_leads,
+            "dials": dials,
+            "outcomes": {outcome: totals[outcome] for outcome in (ANSWERED, NO_ANSWER, BUSY, FAILED)},
+            "elapsed_minutes": round(minutes, 2),
+            "calls_per_minute": round(dials / minutes, 2),
+            "connects_per_minute": round(answered / minutes, 2),
+            "connect_rate": round(answered / attempts, 3) if attempts else 0.0,
+            "avg_call_seconds": round(self._call_seconds / answered, 1) if answered else 0.0,
+            "utilization": round(self._talk_seconds / (self.pool.capacity * elapsed), 3),
+            "occupancy": round(self._occupied_seconds / (self.pool.capacity * elapsed), 3),
+            "by_language": {
+                language: {"dials": self._dials[language], "answered": self._outcomes[language][ANSWERED]}
+                for language in sorted(self._dials)
+            },
+        }
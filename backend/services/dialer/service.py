@@ -0,0 +1,76 @@
+import asyncio
+import io
+import uuid
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from config.settings import DIALER_FINISHED_CAMPAIGNS_KEPT, DIALER_LANGUAGE_CAPS, DIALER_MAX_CONCURRENT_CALLS
+from config.env import PLIVO_AUTH_ID
+from services.dialer.call_list import read_call_list
+from services.dialer.plivo_client import PlivoTelephonyClient
+from services.dialer.pool import SessionPool
+from services.dialer.scheduler import CampaignDialer
+from services.dialer.telephony import Call
+from utils.logging import setup_logging
+from utils.rate_limiter import get_rate_limiter
+
+logger = setup_logging()
+
+
+class DialerService:
+    """Campaigns started through the API, sharing one Plivo account and one
+    session pool, so the global cap holds across concurrent campaigns.
+
+    Finished campaigns stay listed for their reports, up to the most recent
+    DIALER_FINISHED_CAMPAIGNS_KEPT.
+    """
+
+    def __init__(self):
+        self.campaigns: Dict[str, CampaignDialer] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._finished: Deque[str] = deque()
+        self._client: Optional[PlivoTelephonyClient] = None
+        self._pool: Optional[SessionPool] = None
+
+    @property
+    def client(self) -> PlivoTelephonyClient:
+        if self._client is None:
+            self._client = PlivoTelephonyClient()
+        return self._client
+
+    async def start_campaign(self, call_list: str, **options) -> str:
+        """Starts dialing a CSV call list given as text. Raises ValueError if
+        it has no callable rows."""
+        targets = await asyncio.to_thread(lambda: list(read_call_list(io.StringIO(call_list), "upload")))
+        if not targets:
+            raise ValueError("The call list has no valid rows")
+        if self._pool is None:
+            self._pool = SessionPool(DIALER_MAX_CONCURRENT_CALLS, DIALER_LANGUAGE_CAPS)
+        await self._pool.warm({target.language for target in targets})
+
+        campaign_id = uuid.uuid4().hex[:12]
+        dialer = CampaignDialer(
+            targets,
+            self.client,
+            self._pool,
+            dial_limiter=get_rate_limiter("plivo", PLIVO_AUTH_ID),
+            **options,
+        )
+        self.campaigns[campaign_id] = dialer
+        self._tasks[campaign_id] = asyncio.create_task(self._run(campaign_id, dialer))
+        return campaign_id
+
+    async def _run(self, campaign_id: str, dialer: CampaignDialer):
+        try:
+            await dialer.run()
+        except Exception as e:
+            logger.exception(f"Campaign {campaign_id} failed: {e}")
+        finally:
+            self._tasks.pop(campaign_id, None)
+            self._finished.append(campaign_id)
+            while len(self._finished) > DIALER_FINISHED_CAMPAIGNS_KEPT:
+                self.campaigns.pop(self._finished.popleft(), None)
+
+    def find_call(self, call_id: str) -> Optional[Call]:
+        return self._client.find_call(call_id) if self._client else None
+
@@ -0,0 +1,66 @@
+import json
+
+from fastapi import WebSocket
+from pipecat.transports.network.fastapi_websocket import FastAPIWebsocketParams, FastAPIWebsocketTransport
+
+from services.bot_service import BotService
+from services.dialer.plivo_client import PlivoFrameSerializer
+from services.dialer.telephony import Call
+from services.webrtc_service import create_transport_params
+from utils.logging import setup_logging
+
+logger = setup_logging()
+
+
+class CallBotService(BotService):
+    """BotService for an outbound phone call on a Plivo media stream."""
+
+    def __init__(self, transport: FastAPIWebsocketTransport, call: Call):
+        self.call = call
+        super().__init__(transport, call.target.language, pc_id=call.call_id)
+
+    def _register_event_handlers(self):
+        self.transport.event_handler("on_client_connected")(self.on_client_connected)
+        # A websocket has no separate close event: the callee hanging up
+        # ends the session.
+        self.transport.event_handler("on_client_disconnected")(self.on_client_closed)
+
+
+async def _wait_for_stream_start(websocket: WebSocket) -> dict:
+    async for message in websocket.iter_text():
+        event = json.loads(message)
+        if event.get("event") == "start":
+            return event["start"]
+    raise ConnectionError("media stream closed before it started")
+
+
+async def run_call_session(websocket: WebSocket, call: Call):
+    """Runs the bot on an answered call's media stream until hangup.
+
+    The pipeline uses the VAD analyzer of the pool session the dialer
+    reserved for the call; the dialer returns that session to the pool only
+    after ``session_done`` is set here.
+    """
+    if call.ended.is_set():
+        # The dialer has already given up on the call
+        await websocket.close()
+        return
+    call.session_started = True
+    try:
+        start = await _wait_for_stream_start(websocket)
+        params = create_transport_params(call.target.language, call.session.vad_analyzer)
+        transport = FastAPIWebsocketTransport(
+            websocket=websocket,
+            params=FastAPIWebsocketParams(
+                **dict(params),
+                add_wav_header=False,
+                serializer=PlivoFrameSerializer(start["streamId"]),
+            ),
+        )
+        bot_service = CallBotService(transport, call)
+        await bot_service.run()
+    except Exception as e:
+        logger.exception(f"Call session {call.call_id} failed: {e}")
+    finally:
+        call.ended.set()
+        call.session_done.set()
@@ -0,0 +1,108 @@
+import argparse
+import asyncio
+import json
+import random
+from datetime import datetime
+from typing import List
+
+from config.profiles import LANGUAGE_PROFILES
+from config.settings import (
+    DIALER_LANGUAGE_CAPS,
+    DIALER_MAX_ATTEMPTS,
+    DIALER_MAX_CONCURRENT_CALLS,
+    DIALER_RETRY_DELAY,
+    DIALER_TARGET_UTILIZATION,
+    DIALER_TIMEZONE,
+    RATE_LIMITS,
+)
+from services.dialer.call_list import CallTarget, load_call_list
+from services.dialer.pool import SessionPool
+from services.dialer.scheduler import CallingHours, CampaignDialer, DialerClock
+from services.dialer.telephony import SimulatedTelephonyClient
+from utils.logging import setup_logging
+from utils.rate_limiter import TokenBucket
+
+logger = setup_logging()
+
+
+def synthetic_call_list(count: int, seed: int) -> List[CallTarget]:
+    rng = random.Random(seed)
+    languages = sorted(LANGUAGE_PROFILES)
+    return [
+        CallTarget(phone=f"+9190000{i:05d}", language=rng.choice(languages))
+        for i in range(count)
+    ]
+
+
+async def simulate(args) -> dict:
+    clock = DialerClock(
+        speed=args.speed,
+        start=datetime.fromisoformat(args.start) if args.start else None,
+    )
+    if args.call_list:
+        targets = list(load_call_list(args.call_list))
+    else:
+        targets = synthetic_call_list(args.leads, args.seed)
+    client = SimulatedTelephonyClient(
+        clock,
+        answer_rate=args.answer_rate,
+        busy_rate=args.busy_rate,
+        talk_median=args.talk_median,
+        seed=args.seed,
+    )
+    pool = SessionPool(args.concurrency, DIALER_LANGUAGE_CAPS, load_vad=False)
+    # The dial rate limit is in campaign time, so it speeds up with the clock
+    limits = RATE_LIMITS["plivo"]
+    limiter = TokenBucket("plivo_simulated", limits["rate"] * args.speed, limits["burst"])
+    dialer = CampaignDialer(
+        targets,
+        client,
+        pool,
+        clock=clock,
+        calling_hours=None if args.respect_hours else CallingHours(hours=(0, 24), days=range(7)),
+        dial_limiter=limiter,
+        target_utilization=args.target_utilization,
+        max_attempts=args.max_attempts,
+        retry_delay=args.retry_delay,
+    )
+
+    async def progress():
+        while True:
+            await clock.sleep(args.report_every)
+            logger.info(f"Campaign progress: {dialer.report()}")
+
+    progress_task = asyncio.create_task(progress())
+    try:
+        return await dialer.run()
+    finally:
+        progress_task.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the campaign dialer against simulated telephony")
+    parser.add_argument("--call-list", help="CSV call list (default: synthetic leads)")
+    parser.add_argument("--leads", type=int, default=500, help="Synthetic leads to generate (default: 500)")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DIALER_MAX_CONCURRENT_CALLS,
+        help=f"Session pool size (default: {DIALER_MAX_CONCURRENT_CALLS})",
+    )
+    parser.add_argument("--target-utilization", type=float, default=DIALER_TARGET_UTILIZATION)
+    parser.add_argument("--max-attempts", type=int, default=DIALER_MAX_ATTEMPTS)
+    parser.add_argument("--retry-delay", type=float, default=DIALER_RETRY_DELAY, help="Seconds before a retry")
+    parser.add_argument("--answer-rate", type=float, default=0.4)
+    parser.add_argument("--busy-rate", type=float, default=0.1)
+    parser.add_argument("--talk-median", type=float, default=120.0, help="Median call length in seconds")
+    parser.add_argument("--speed", type=float, default=60.0, help="Campaign seconds per wall-clock second (default: 60)")
+    parser.add_argument(
+        "--respect-hours",
+        action="store_true",
+        help=f"Apply the calling-hour window (in {DIALER_TIMEZONE} unless the list says otherwise)",
+    )
+    parser.add_argument("--start", help="Campaign start time, ISO 8601 with offset (default: now)")
+    parser.add_argument("--report-every", type=float, default=600.0, help="Campaign seconds between progress logs")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(simulate(args))))
@@ -0,0 +1,145 @@
+import asyncio
+import random
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from services.dialer.call_list import CallTarget
+
+# Call outcomes, as reported by the telephony provider
+ANSWERED = "answered"
+NO_ANSWER = "no_answer"
+BUSY = "busy"
+FAILED = "failed"
+
+
+class Call:
+    """One dial attempt.
+
+    ``answered`` resolves with the outcome once the callee picks up or the
+    attempt fails; ``ended`` is set when an answered call hangs up. A bot
+    session attached to the call sets ``session_started`` and, once its
+    pipeline has fully shut down, ``session_done``; the hangup alone does
+    not mean the session is done with its pooled resources. Times are
+    campaign clock seconds.
+    """
+
+    def __init__(self, target: CallTarget, dialed_at: float):
+        self.call_id = uuid.uuid4().hex
+        self.target = target
+        self.dialed_at = dialed_at
+        self.answered_at: Optional[float] = None
+        self.ended_at: Optional[float] = None
+        self.provider_id: Optional[str] = None
+        self.session = None  # PooledSession reserved for this call
+        self.answered: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.ended = asyncio.Event()
+        self.session_started = False
+        self.session_done = asyncio.Event()
+
+    @property
+    def outcome(self) -> Optional[str]:
+        return self.answered.result() if self.answered.done() else None
+
+    def set_outcome(self, outcome: str):
+        if not self.answered.done():
+            self.answered.set_result(outcome)
+        if outcome != ANSWERED:
+            self.ended.set()
+
+    def __repr__(self):
+        return f"Call({self.call_id}, {self.target.phone}, {self.outcome or 'ringing'})"
+
+
+class TelephonyClient(ABC):
+    """Places outbound calls.
+
+    ``dial`` starts ringing and returns; the client later resolves the
+    call's outcome and, for answered calls, sets ``ended`` on hangup. The
+    campaign scheduler only talks to this interface, so the Plivo client can
+    be swapped for ``SimulatedTelephonyClient``.
+    """
+
+    def __init__(self):
+        self.calls: Dict[str, Call] = {}
+
+    @abstractmethod
+    async def dial(self, call: Call, ring_timeout: float):
+        pass
+
+    @abstractmethod
+    async def hangup(self, call: Call):
+        pass
+
+    def find_call(self, call_id: str) -> Optional[Call]:
+        return self.calls.get(call_id)
+
+    def forget(self, call: Call):
+        self.calls.pop(call.call_id, None)
+
+
+class SimulatedTelephonyClient(TelephonyClient):
+    """Telephony stand-in for load-testing the scheduler offline.
+
+    Each dial rings for a random time and is answered, busy or unanswered
+    with the given probabilities; answered calls last a lognormal talk time
+    with median ``talk_median`` seconds. Delays run on the campaign clock,
+    so a sped-up clock simulates hours of dialing in minutes.
+    """
+
+    def __init__(
+        self,
+        clock,
+        *,
+        answer_rate: float = 0.4,
+        busy_rate: float = 0.1,
+        fail_rate: float = 0.02,
+        ring_time: tuple = (4.0, 25.0),
+        talk_median: float = 120.0,
+        talk_sigma: float = 0.6,
+        seed: Optional[int] = None,
+    ):
+        super().__init__()
+        self._clock = clock
+        self._answer_rate = answer_rate
+        self._busy_rate = busy_rate
+        self._fail_rate = fail_rate
+        self._ring_time = ring_time
+        self._talk_median = talk_median
+        self._talk_sigma = talk_sigma
+        self._random = random.Random(seed)
+        self._tasks = set()
+
+    async def dial(self, call: Call, ring_timeout: float):
+        self.calls[call.call_id] = call
+        task = asyncio.create_task(self._simulate(call, ring_timeout))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def hangup(self, call: Call):
+        call.set_outcome(FAILED)
+        call.ended.set()
+
+    async def _simulate(self, call: Call, ring_timeout: float):
+        roll = self._random.random()
+        if roll < self._fail_rate:
+            await self._clock.sleep(0.5)
+            call.set_outcome(FAILED)
+            return
+        if roll < self._fail_rate + self._busy_rate:
+            await self._clock.sleep(self._random.uniform(1.0, 3.0))
+            call.set_outcome(BUSY)
+            return
+
+        ring = self._random.uniform(*self._ring_time)
+        answers = self._random.random() < self._answer_rate / (1 - self._fail_rate - self._busy_rate)
+        if not answers or ring > ring_timeout:
+            await self._clock.sleep(ring_timeout)
+            call.set_outcome(NO_ANSWER)
+            return
+
+        await self._clock.sleep(ring)
+        call.set_outcome(ANSWERED)
+        talk = self._random.lognormvariate(0, self._talk_sigma) * self._talk_median
+        await self._clock.sleep(talk)
+        call.ended.set()
@@ -0,0 +1,207 @@
+import asyncio
+import re
+import time
+from collections import deque
+from typing import Deque, Optional
+
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    InterimTranscriptionFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from utils.logging import setup_logging
+from utils.metrics import metrics, percentile
+
+logger = setup_logging()
+
+# Words that leave a clause open when they end an utterance
+CONTINUATION_WORDS = {
+    "en": {
+        "and", "or", "but", "so", "because", "then", "to", "the", "a", "an", "of", "for",
+        "with", "in", "on", "at", "my", "is", "are", "was", "i", "we", "um", "uh", "like",
+    },
+    "ta": {
+        "மற்றும்", "ஆனா", "ஆனால்", "அப்புறம்", "பிறகு", "அதனால்", "ஏன்னா", "என்றால்", "அல்லது", "ம்ம்",
+    },
+}
+
+_TERMINAL = re.compile(r"[.?!।]$")
+_OPEN = re.compile(r"[,;:\-–]$")
+
+
+def is_complete_clause(text: str, language: str) -> Optional[bool]:
+    """Guesses whether ``text`` ends at a clause boundary.
+
+    Returns True for sentence-final punctuation, False for a trailing comma or
+    connective, and None when there is nothing to go on.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    if _OPEN.search(text):
+        return False
+    last_word = text.split()[-1].strip(".,!?।").lower()
+    if last_word in CONTINUATION_WORDS.get(language, ()):
+        return False
+    if _TERMINAL.search(text):
+        return True
+    return None
+
+
+class EndOfTurnController(FrameProcessor):
+    """Decides when a VAD pause ends the caller's turn.
+
+    Sits right after STT. With streaming STT the VAD runs with a short
+    stop_secs, and every UserStoppedSpeakingFrame is held here for an extra
+    hold before it reaches the context aggregator. If the caller resumes within the hold, the stop
+    and the new start are both swallowed, so the aggregator sees one turn,
+    and the pause is recorded. The hold adapts to the caller: it is the
+    ``adapt_percentile`` of their in-turn pauses plus ``margin``, clamped to
+    ``[min_hold, max_hold]``. Speech that resumes within
+    ``false_cutoff_window`` of a released stop is a false cut-off; it is
+    counted and its full pause is recorded too, which pushes the hold up.
+    Segmented STT profiles keep a long stop_secs and start from a zero hold
+    (see config/profiles.py).
+
+    With ``use_interim_text`` the latest transcript is checked while holding:
+    a trailing connective extends the hold once by ``incomplete_extension``,
+    a finished sentence cuts it to ``complete_hold_factor`` of its length.
+    Transcription frames pass straight through, so the aggregator already has
+    the text when the turn is released.
+    """
+
+    def __init__(
+        self,
+        *,
+        language: str,
+        vad_stop_secs: float,
+        initial_hold: float = 0.5,
+        min_hold: float = 0.1,
+        max_hold: float = 1.5,
+        adapt_percentile: float = 0.9,
+        margin: float = 0.1,
+        min_samples: int = 5,
+        window: int = 50,
+        use_interim_text: bool = True,
+        incomplete_extension: float = 0.4,
+        complete_hold_factor: float = 0.5,
+        false_cutoff_window: float = 1.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._language = language
+        self._vad_stop_secs = vad_stop_secs
+        self._initial_hold = initial_hold
+        self._min_hold = min_hold
+        self._max_hold = max_hold
+        self._adapt_percentile = adapt_percentile
+        self._margin = margin
+        self._min_samples = min_samples
+        self._use_interim_text = use_interim_text
+        self._incomplete_extension = incomplete_extension
+        self._complete_hold_factor = complete_hold_factor
+        self._false_cutoff_window = false_cutoff_window
+
+        self._pauses: Deque[float] = deque(maxlen=window)
+        self._held: Optional[UserStoppedSpeakingFrame] = None
+        self._held_at = 0.0
+        self._hold_task: Optional[asyncio.Task] = None
+        self._text = ""
+        self._text_event = asyncio.Event()
+        self._released_at: Optional[float] = None
+        self._released_hold = 0.0
+
+    @property
+    def hold(self) -> float:
+        if len(self._pauses) < self._min_samples:
+            return self._initial_hold
+        hold = percentile(self._pauses, self._adapt_percentile) + self._margin
+        return min(self._max_hold, max(self._min_hold, hold))
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, UserStartedSpeakingFrame) and not frame.emulated:
+            await self._handle_user_started_speaking(frame, direction)
+        elif isinstance(frame, UserStoppedSpeakingFrame) and not frame.emulated:
+            await self._handle_user_stopped_speaking(frame)
+        elif isinstance(frame, (TranscriptionFrame, InterimTranscriptionFrame)):
+            self._text = frame.text
+            self._text_event.set()
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, (EndFrame, CancelFrame)):
+            await self._cancel_hold()
+            await self.push_frame(frame, direction)
+        else:
+            await self.push_frame(frame, direction)
+
+    async def _handle_user_started_speaking(self, frame: UserStartedSpeakingFrame, direction: FrameDirection):
+        now = time.monotonic()
+        if self._held is not None:
+            # The caller resumed before the hold ran out: same turn.
+            self._pauses.append(now - self._held_at)
+            self._held = None
+            await self._cancel_hold()
+            return
+
+        if self._released_at is not None and now - self._released_at < self._false_cutoff_window:
+            metrics.inc("end_of_turn_false_cutoffs_total", language=self._language)
+            self._pauses.append(self._released_hold + now - self._released_at)
+            logger.debug(f"{self}: false cut-off, caller resumed {now - self._released_at:.2f}s after end of turn")
+        self._released_at = None
+        self._text = ""
+        await self.push_frame(frame, direction)
+
+    async def _handle_user_stopped_speaking(self, frame: UserStoppedSpeakingFrame):
+        await self._cancel_hold()
+        self._held = frame
+        self._held_at = time.monotonic()
+        self._hold_task = self.create_task(self._hold_turn())
+
+    async def _hold_turn(self):
+        hold = self.hold
+        deadline = self._held_at + hold
+        extended = False
+        while True:
+            if self._use_interim_text:
+                complete = is_complete_clause(self._text, self._language)
+                if complete is True:
+                    deadline = min(deadline, self._held_at + max(self._min_hold, hold * self._complete_hold_factor))
+                elif complete is False and not extended:
+                    deadline = min(self._held_at + self._max_hold, deadline + self._incomplete_extension)
+                    extended = True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._text_event.clear()
+            try:
+                await asyncio.wait_for(self._text_event.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        await self._release()
+
+    async def _release(self):
+        # The finished hold task is left for _cancel_hold() to reap, so the
+        # task manager doesn't report it as dangling
+        frame, self._held = self._held, None
+        if frame is None:
+            return
+        now = time.monotonic()
+        self._released_at = now
+        self._released_hold = now - self._held_at
+        metrics.inc("end_of_turn_turns_total", language=self._language)
+        metrics.observe(
+            "end_of_turn_delay_seconds", self._vad_stop_secs + self._released_hold, language=self._language
+        )
+        await self.push_frame(frame)
+
+    async def _cancel_hold(self):
+        if self._hold_task:
+            await self.cancel_task(self._hold_task)
+            self._hold_task = None
@@ -0,0 +1,225 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    OutputAudioRawFrame,
+    StartFrame,
+    StartInterruptionFrame,
+    SystemFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from utils.logging import log_sampled, setup_logging
+from utils.metrics import metrics
+
+logger = setup_logging()
+
+# Late releases shorter than this are scheduling noise, not audible gaps
+_UNDERRUN_TOLERANCE = 0.02
+
+
+def audio_duration(frame: OutputAudioRawFrame) -> float:
+    return len(frame.audio) / (frame.sample_rate * frame.num_channels * 2)
+
+
+class OutputPacer(FrameProcessor):
+    """Releases bot audio to the output transport at playout speed.
+
+    Sits between TTS and ``transport.output()``. Downstream frames are kept
+    in order in a local buffer and audio is released only while less than
+    ``lookahead`` seconds of it are queued ahead of playout, so the
+    transport never holds more than that. Producers that call
+    ``wait_for_capacity`` before emitting a chunk (see ``PacedTTSMixin``)
+    block once ``max_buffer`` seconds are waiting here, so a long answer is
+    never materialized as frames all at once. An interruption drops the
+    buffer and wakes blocked producers.
+
+    Per-session depth and underruns (playout running dry in the middle of an
+    utterance) are logged when the session ends and aggregated per language
+    in the metrics registry.
+    """
+
+    # Audio buffered across all sessions in the process
+    _total_buffered = 0.0
+
+    def __init__(self, *, language: str, lookahead: float = 0.3, max_buffer: float = 1.0, **kwargs):
+        super().__init__(**kwargs)
+        self._language = language
+        self._lookahead = lookahead
+        self._max_buffer = max_buffer
+
+        self._buffer: Deque[Tuple[Frame, FrameDirection]] = deque()
+        self._has_frames = asyncio.Event()
+        self._space = asyncio.Event()
+        self._release_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        # Audio seconds admitted by producers or buffered here, not yet released
+        self._queued = 0.0
+        # Admitted audio that has not reached the buffer yet
+        self._credit = 0.0
+        self._playout_end = 0.0
+        self._in_utterance = False
+        self._primed = False
+
+        self._max_depth = 0.0
+        self._underruns = 0
+        self._underrun_seconds = 0.0
+        self._backpressure_seconds = 0.0
+        self._discarded_seconds = 0.0
+
+    @property
+    def depth(self) -> float:
+        """Seconds of audio queued ahead of playout plus buffered here."""
+        return max(0.0, self._playout_end - time.monotonic()) + self._queued
+
+    async def wait_for_capacity(self, frame: OutputAudioRawFrame):
+        """Called by a producer before it emits ``frame``; blocks while the
+        buffer is full."""
+        if self._queued >= self._max_buffer and not self._closed:
+            start = time.monotonic()
+            while self._queued >= self._max_buffer and not self._closed:
+                self._space.clear()
+                await self._space.wait()
+            waited = time.monotonic() - start
+            self._backpressure_seconds += waited
+            metrics.observe("output_backpressure_wait_seconds", waited, language=self._language)
+            log_sampled("DEBUG", "{}: producer waited {:.3f}s for buffer space", self, waited)
+        seconds = audio_duration(frame)
+        self._add_queued(seconds)
+        self._credit += seconds
+
+    def _add_queued(self, seconds: float):
+        self._queued += seconds
+        OutputPacer._total_buffered += seconds
+        metrics.set_gauge("output_buffered_audio_seconds", OutputPacer._total_buffered)
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, StartFrame):
+            await self.push_frame(frame, direction)
+            self._release_task = self.create_task(self._release_loop())
+        elif isinstance(frame, StartInterruptionFrame):
+            await self._stop_release()
+            self._discard()
+            self._release_task = self.create_task(self._release_loop())
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, CancelFrame):
+            await self._stop_release()
+            self._close()
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, SystemFrame) or direction == FrameDirection.UPSTREAM:
+            await self.push_frame(frame, direction)
+        else:
+            if isinstance(frame, OutputAudioRawFrame):
+                seconds = audio_duration(frame)
+                if self._credit >= seconds:
+                    self._credit -= seconds
+                else:
+                    # Producer without backpressure (e.g. a websocket TTS)
+                    self._add_queued(seconds)
+            self._buffer.append((frame, direction))
+            self._has_frames.set()
+
+    async def _release_loop(self):
+        while True:
+            await self._has_frames.wait()
+            while self._buffer:
+                frame, direction = self._buffer[0]
+                if isinstance(frame, OutputAudioRawFrame):
+                    now = time.monotonic()
+                    ahead = self._playout_end - now
+                    if ahead > self._lookahead:
+                        await asyncio.sleep(ahead - self._lookahead)
+                        continue
+                    if self._primed and -ahead > _UNDERRUN_TOLERANCE:
+                        self._record_underrun(-ahead)
+                    seconds = audio_duration(frame)
+                    self._playout_end = max(now, self._playout_end) + seconds
+                    self._primed = self._in_utterance
+                    self._buffer.popleft()
+                    self._add_queued(-seconds)
+                    self._space.set()
+                    self._max_depth = max(self._max_depth, self.depth)
+                    await self.push_frame(frame, direction)
+                    continue
+
+                self._buffer.popleft()
+                if isinstance(frame, TTSStartedFrame):
+                    self._in_utterance = True
+                    self._primed = False
+                elif isinstance(frame, TTSStoppedFrame):
+                    self._in_utterance = False
+                    self._primed = False
+                await self.push_frame(frame, direction)
+                if isinstance(frame, EndFrame):
+                    self._close()
+            self._has_frames.clear()
+
+    def _record_underrun(self, gap: float):
+        self._underruns += 1
+        self._underrun_seconds += gap
+        metrics.inc("output_underruns_total", language=self._language)
+        metrics.inc("output_underrun_seconds_total", gap, language=self._language)
+        log_sampled("DEBUG", "{}: playout ran dry for {:.3f}s", self, gap)
+
+    def _discard(self):
+        discarded = sum(audio_duration(f) for f, _ in self._buffer if isinstance(f, OutputAudioRawFrame))
+        self._discarded_seconds += discarded
+        self._buffer.clear()
+        self._has_frames.clear()
+        # Anything admitted but not yet delivered died with the producer's
+        # cancelled tasks.
+        self._add_queued(-self._queued)
+        self._credit = 0.0
+        self._playout_end = 0.0
+        self._in_utterance = False
+        self._primed = False
+        self._space.set()
+
+    async def _stop_release(self):
+        if self._release_task:
+            await self.cancel_task(self._release_task)
+            self._release_task = None
+
+    async def cleanup(self):
+        await super().cleanup()
+        await self._stop_release()
+
+    def _close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._discard()
+        if self._max_depth:
+            metrics.observe("output_max_depth_seconds", self._max_depth, language=self._language)
+        logger.info(
+            f"Output pacing: max depth {self._max_depth:.2f}s, {self._underruns} underruns "
+            f"({self._underrun_seconds:.2f}s), backpressure {self._backpressure_seconds:.2f}s, "
+            f"discarded {self._discarded_seconds:.2f}s"
+        )
+
+
+class PacedTTSMixin:
+    """Lets a TTS service's ``run_tts`` wait for room in an ``OutputPacer``.
+
+    Call ``await self.wait_for_output_capacity(frame)`` right before
+    yielding each audio frame; without a pacer it returns immediately.
+    """
+
+    _output_pacer: Optional[OutputPacer] = None
+
+    def set_output_pacer(self, pacer: Optional[OutputPacer]):
+        self._output_pacer = pacer
+
+    async def wait_for_output_capacity(self, frame: OutputAudioRawFrame):
+        if self._output_pacer:
+            await self._output_pacer.wait_for_capacity(frame)
@@ -0,0 +1,37 @@
+from typing import List
+
+from openai import AsyncStream
+from openai.types.audio import Transcription
+from openai.types.chat import ChatCompletionChunk, ChatCompletionMessageParam
+
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+from pipecat.services.openai.stt import OpenAISTTService
+from pipecat.services.together.llm import TogetherLLMService
+
+from utils.rate_limiter import Priority, get_rate_limiter
+
+
+class RateLimitedTogetherLLMService(TogetherLLMService):
+    """Together LLM whose completions go through the shared per-key rate limiter."""
+
+    def __init__(self, *, api_key: str, **kwargs):
+        super().__init__(api_key=api_key, **kwargs)
+        self._rate_limiter = get_rate_limiter("together", api_key)
+
+    async def get_chat_completions(
+        self, context: OpenAILLMContext, messages: List[ChatCompletionMessageParam]
+    ) -> AsyncStream[ChatCompletionChunk]:
+        await self._rate_limiter.acquire(Priority.REALTIME)
+        return await super().get_chat_completions(context, messages)
+
+
+class RateLimitedOpenAISTTService(OpenAISTTService):
+    """Whisper STT sharing the OpenAI key's rate limiter with post-call lead extraction."""
+
+    def __init__(self, *, api_key: str, **kwargs):
+        super().__init__(api_key=api_key, **kwargs)
+        self._rate_limiter = get_rate_limiter("openai", api_key)
+
+    async def _transcribe(self, audio: bytes) -> Transcription:
+        await self._rate_limiter.acquire(Priority.REALTIME)
+        return await super()._transcribe(audio)
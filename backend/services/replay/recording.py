@@ -0,0 +1,238 @@
+import json
+import os
+import time
+from typing import List, Optional
+
+from pipecat.frames.frames import (
+    Frame,
+    InputAudioRawFrame,
+    InterimTranscriptionFrame,
+    TextFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.observers.base_observer import BaseObserver
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContextFrame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from utils.logging import setup_logging
+
+logger = setup_logging()
+
+RECORDING_VERSION = 1
+
+
+class Recording:
+    """A recorded session on disk.
+
+    Layout of a recording directory:
+      meta.json     pc_id, language, audio formats, duration
+      input.pcm     inbound PCM from the transport, concatenated
+      tts.pcm       synthesized PCM, one slice per utterance
+      events.jsonl  timed events referencing the PCM files by offset
+
+    Provider responses are stored relative to what triggered them (VAD
+    events for STT, LLM context requests, TTS requests) so replay can
+    substitute them deterministically at real-time or full speed.
+    """
+
+    def __init__(self, meta: dict, events: List[dict], input_pcm: bytes, tts_pcm: bytes):
+        self.meta = meta
+        self.events = events
+        self.input_pcm = input_pcm
+        self.tts_pcm = tts_pcm
+
+    def of_type(self, event_type: str) -> List[dict]:
+        return [event for event in self.events if event["type"] == event_type]
+
+    def input_audio(self, event: dict) -> bytes:
+        return self.input_pcm[event["offset"]:event["offset"] + event["size"]]
+
+    def tts_audio(self, event: dict) -> bytes:
+        return self.tts_pcm[event["offset"]:event["offset"] + event["size"]]
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(self.meta, f, indent=2)
+        with open(os.path.join(path, "events.jsonl"), "w") as f:
+            for event in self.events:
+                f.write(json.dumps(event) + "\n")
+        with open(os.path.join(path, "input.pcm"), "wb") as f:
+            f.write(self.input_pcm)
+        with open(os.path.join(path, "tts.pcm"), "wb") as f:
+            f.write(self.tts_pcm)
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        with open(os.path.join(path, "events.jsonl")) as f:
+            events = [json.loads(line) for line in f if line.strip()]
+        with open(os.path.join(path, "input.pcm"), "rb") as f:
+            input_pcm = f.read()
+        with open(os.path.join(path, "tts.pcm"), "rb") as f:
+            tts_pcm = f.read()
+        return cls(meta, events, input_pcm, tts_pcm)
+
+
+class SessionRecorder(BaseObserver):
+    """Pipeline observer that records a session for offline replay.
+
+    Everything is buffered in memory; ``save()`` is meant to run in a thread
+    once the session is over.
+    """
+
+    def __init__(
+        self,
+        *,
+        pc_id: Optional[str],
+        language: str,
+        input: FrameProcessor,
+        stt: FrameProcessor,
+        llm: FrameProcessor,
+        tts: FrameProcessor,
+    ):
+        self._input = input
+        self._stt = stt
+        self._llm = llm
+        self._tts = tts
+        self._meta = {
+            "version": RECORDING_VERSION,
+            "pc_id": pc_id,
+            "language": language,
+            "started_at": time.time(),
+        }
+        self._start: Optional[float] = None
+        self._events: List[dict] = []
+        self._input_pcm = bytearray()
+        self._tts_pcm = bytearray()
+
+        self._vad_index = -1
+        self._vad_time = 0.0
+        self._llm_index = -1
+        self._llm_time = 0.0
+        self._tts_index = -1
+        self._tts_text_time = 0.0
+        self._utterance: Optional[dict] = None
+
+    def _now(self) -> float:
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+        return now - self._start
+
+    async def on_push_frame(
+        self,
+        src: FrameProcessor,
+        dst: FrameProcessor,
+        frame: Frame,
+        direction: FrameDirection,
+        timestamp: int,
+    ):
+        if direction != FrameDirection.DOWNSTREAM:
+            return
+
+        if src is self._input:
+            self._on_input(frame)
+        elif src is self._stt:
+            self._on_stt(frame)
+        elif src is self._llm:
+            self._on_llm(frame)
+        elif src is self._tts:
+            self._on_tts(frame)
+
+        if dst is self._llm and isinstance(frame, OpenAILLMContextFrame):
+            self._llm_index += 1
+            self._llm_time = self._now()
+            self._events.append({"type": "llm_request", "t": self._llm_time, "index": self._llm_index})
+        elif dst is self._tts and isinstance(frame, TextFrame) and not isinstance(frame, TranscriptionFrame):
+            self._tts_text_time = self._now()
+
+    def _on_input(self, frame: Frame):
+        t = self._now()
+        if isinstance(frame, InputAudioRawFrame):
+            self._meta.setdefault("input_sample_rate", frame.sample_rate)
+            self._meta.setdefault("input_channels", frame.num_channels)
+            self._events.append(
+                {"type": "audio_in", "t": t, "offset": len(self._input_pcm), "size": len(frame.audio)}
+            )
+            self._input_pcm += frame.audio
+        elif isinstance(frame, (UserStartedSpeakingFrame, UserStoppedSpeakingFrame)):
+            self._vad_index += 1
+            self._vad_time = t
+            self._events.append(
+                {
+                    "type": "vad",
+                    "t": t,
+                    "index": self._vad_index,
+                    "speaking": isinstance(frame, UserStartedSpeakingFrame),
+                }
+            )
+
+    def _on_stt(self, frame: Frame):
+        if isinstance(frame, (TranscriptionFrame, InterimTranscriptionFrame)):
+            t = self._now()
+            self._events.append(
+                {
+                    "type": "stt",
+                    "t": t,
+                    "anchor": self._vad_index,
+                    "delay": t - self._vad_time if self._vad_index >= 0 else t,
+                    "text": frame.text,
+                    "user_id": frame.user_id,
+                    "final": isinstance(frame, TranscriptionFrame),
+                }
+            )
+
+    def _on_llm(self, frame: Frame):
+        if isinstance(frame, TextFrame) and self._llm_index >= 0:
+            t = self._now()
+            self._events.append(
+                {
+                    "type": "llm",
+                    "t": t,
+                    "anchor": self._llm_index,
+                    "delay": t - self._llm_time,
+                    "text": frame.text,
+                }
+            )
+
+    def _on_tts(self, frame: Frame):
+        t = self._now()
+        if isinstance(frame, TTSStartedFrame):
+            self._start_utterance(t)
+        elif isinstance(frame, TTSAudioRawFrame):
+            if self._utterance is None:
+                self._start_utterance(t)
+            if self._utterance["size"] == 0:
+                self._utterance["delay"] = max(0.0, t - self._tts_text_time)
+                self._meta.setdefault("tts_sample_rate", frame.sample_rate)
+            self._tts_pcm += frame.audio
+            self._utterance["size"] += len(frame.audio)
+        elif isinstance(frame, TTSStoppedFrame):
+            self._utterance = None
+
+    def _start_utterance(self, t: float):
+        self._tts_index += 1
+        self._utterance = {
+            "type": "tts",
+            "t": t,
+            "index": self._tts_index,
+            "delay": 0.0,
+            "offset": len(self._tts_pcm),
+            "size": 0,
+        }
+        self._events.append(self._utterance)
+
+    def to_recording(self) -> Recording:
+        meta = dict(self._meta, duration=self._now())
+        return Recording(meta, list(self._events), bytes(self._input_pcm), bytes(self._tts_pcm))
+
+    def save(self, path: str):
+        self.to_recording().save(path)
+        logger.info(f"Saved session recording to: {path}")
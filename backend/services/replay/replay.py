@@ -0,0 +1,360 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import AsyncGenerator, Dict, List, Optional
+
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    InterimTranscriptionFrame,
+    LLMTextFrame,
+    StartFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.observers.base_observer import BaseObserver
+from pipecat.pipeline.task import PipelineParams
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.openai.llm import OpenAILLMService
+from pipecat.services.stt_service import STTService
+from pipecat.services.tts_service import TTSService
+from pipecat.transports.base_input import BaseInputTransport
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import BaseTransport, TransportParams
+from pipecat.utils.time import time_now_iso8601
+
+from services.bot_service import BotService
+from services.output_pacer import PacedTTSMixin
+from services.replay.recording import Recording
+from services.webrtc_service import create_transport_params
+from utils.logging import setup_logging
+from utils.metrics import percentile
+
+logger = setup_logging()
+
+
+class ReplayClock:
+    """Reproduces recorded delays at ``speed`` in real-time mode, or skips them."""
+
+    def __init__(self, realtime: bool, speed: float = 1.0):
+        self.realtime = realtime
+        self.speed = speed
+
+    async def wait_until(self, start: float, delay: float):
+        if self.realtime:
+            remaining = start + delay / self.speed - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                return
+        await asyncio.sleep(0)
+
+
+class ReplayStats(BaseObserver):
+    """Measures pipeline behaviour during a replay.
+
+    A turn's latency runs from the user-stopped-speaking VAD event to the
+    first bot audio frame leaving the output transport. In fast mode no
+    provider delay is injected, so it is pure pipeline overhead.
+    """
+
+    def __init__(self):
+        self.input: Optional[FrameProcessor] = None
+        self.output: Optional[FrameProcessor] = None
+        self.frames = 0
+        self.audio_in = 0
+        self.audio_out = 0
+        self.turn_latencies: List[float] = []
+        self.last_activity = time.monotonic()
+        self._user_stopped: Optional[float] = None
+
+    async def on_push_frame(
+        self,
+        src: FrameProcessor,
+        dst: FrameProcessor,
+        frame: Frame,
+        direction: FrameDirection,
+        timestamp: int,
+    ):
+        now = time.monotonic()
+        self.frames += 1
+        self.last_activity = now
+        if src is self.input:
+            if isinstance(frame, InputAudioRawFrame):
+                self.audio_in += 1
+            elif isinstance(frame, UserStoppedSpeakingFrame):
+                self._user_stopped = now
+            elif isinstance(frame, UserStartedSpeakingFrame):
+                self._user_stopped = None
+        elif src is self.output and isinstance(frame, TTSAudioRawFrame):
+            self.audio_out += 1
+            if self._user_stopped is not None:
+                self.turn_latencies.append(now - self._user_stopped)
+                self._user_stopped = None
+
+    def report(self, recording: Recording, wall: float, cpu: float) -> dict:
+        latencies = self.turn_latencies
+        return {
+            "pc_id": recording.meta.get("pc_id"),
+            "recorded_seconds": round(recording.meta.get("duration", 0.0), 3),
+            "wall_seconds": round(wall, 3),
+            "cpu_seconds": round(cpu, 3),
+            "frames_routed": self.frames,
+            "audio_frames_in": self.audio_in,
+            "audio_frames_out": self.audio_out,
+            "turns": len(latencies),
+            "turn_latency_p50": round(percentile(latencies, 0.50), 4),
+            "turn_latency_p95": round(percentile(latencies, 0.95), 4),
+            "turn_latency_max": round(max(latencies), 4) if latencies else 0.0,
+        }
+
+
+class ReplayInputTransport(BaseInputTransport):
+    def __init__(self, transport: "ReplayTransport", params: TransportParams, **kwargs):
+        super().__init__(params, **kwargs)
+        self._transport = transport
+        self._feed_task: Optional[asyncio.Task] = None
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        if not self._feed_task:
+            self._feed_task = self.create_task(self._feed())
+
+    async def stop(self, frame: EndFrame):
+        await super().stop(frame)
+        await self._cancel_feed()
+
+    async def cancel(self, frame: CancelFrame):
+        await super().cancel(frame)
+        await self._cancel_feed()
+
+    async def _cancel_feed(self):
+        if self._feed_task:
+            await self.cancel_task(self._feed_task)
+            self._feed_task = None
+
+    async def _feed(self):
+        recording = self._transport.recording
+        sample_rate = recording.meta.get("input_sample_rate", self.sample_rate)
+        num_channels = recording.meta.get("input_channels", 1)
+        await self._transport.client_connected()
+        start = time.monotonic()
+        for event in recording.of_type("audio_in"):
+            await self._transport.clock.wait_until(start, event["t"])
+            await self.push_audio_frame(
+                InputAudioRawFrame(
+                    audio=recording.input_audio(event),
+                    sample_rate=sample_rate,
+                    num_channels=num_channels,
+                )
+            )
+        # Let VAD catch up with everything we queued before declaring the
+        # input finished.
+        await self._audio_in_queue.join()
+        self._transport.input_finished.set()
+
+
+class ReplayOutputTransport(BaseOutputTransport):
+    def __init__(self, transport: "ReplayTransport", params: TransportParams, **kwargs):
+        super().__init__(params, **kwargs)
+        self._transport = transport
+
+    async def write_raw_audio_frames(self, frames: bytes):
+        # A real transport blocks for the chunk's playout time.
+        if self._transport.clock.realtime:
+            seconds = len(frames) / (self.sample_rate * self._params.audio_out_channels * 2)
+            await asyncio.sleep(seconds / self._transport.clock.speed)
+
+
+class ReplayTransport(BaseTransport):
+    """Transport that feeds recorded inbound PCM and discards bot audio.
+
+    It uses the same transport parameters as the WebRTC transport, so VAD
+    and output chunking run exactly as in production.
+    """
+
+    def __init__(self, recording: Recording, clock: ReplayClock):
+        super().__init__()
+        self.recording = recording
+        self.clock = clock
+        self.input_finished = asyncio.Event()
+        params = create_transport_params(recording.meta.get("language", "en"))
+        self._input = ReplayInputTransport(self, params, name="ReplayInputTransport")
+        self._output = ReplayOutputTransport(self, params, name="ReplayOutputTransport")
+        self._register_event_handler("on_client_connected")
+        self._register_event_handler("on_client_disconnected")
+        self._register_event_handler("on_client_closed")
+
+    def input(self) -> ReplayInputTransport:
+        return self._input
+
+    def output(self) -> ReplayOutputTransport:
+        return self._output
+
+    async def client_connected(self):
+        await self._call_event_handler("on_client_connected", None)
+
+
+class ReplaySTTService(STTService):
+    """Emits the recorded transcripts, anchored to the replayed VAD events."""
+
+    def __init__(self, recording: Recording, clock: ReplayClock, **kwargs):
+        super().__init__(**kwargs)
+        self._replay_clock = clock
+        self._transcripts: Dict[int, List[dict]] = defaultdict(list)
+        for event in recording.of_type("stt"):
+            self._transcripts[event["anchor"]].append(event)
+        self._vad_index = -1
+        self._emit_tasks: List[asyncio.Task] = []
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        self._emit(-1)
+
+    async def stop(self, frame: EndFrame):
+        await super().stop(frame)
+        for task in self._emit_tasks:
+            await self.cancel_task(task)
+
+    async def run_stt(self, audio: bytes) -> AsyncGenerator[Frame, None]:
+        yield None
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, (UserStartedSpeakingFrame, UserStoppedSpeakingFrame)) and not frame.emulated:
+            self._vad_index += 1
+            self._emit(self._vad_index)
+
+    def _emit(self, anchor: int):
+        events = self._transcripts.pop(anchor, [])
+        if events:
+            self._emit_tasks.append(self.create_task(self._emit_transcripts(events)))
+
+    async def _emit_transcripts(self, events: List[dict]):
+        start = time.monotonic()
+        for event in events:
+            await self._replay_clock.wait_until(start, event["delay"])
+            frame_class = TranscriptionFrame if event["final"] else InterimTranscriptionFrame
+            await self.push_frame(frame_class(event["text"], event["user_id"], time_now_iso8601()))
+
+
+class ReplayLLMService(OpenAILLMService):
+    """Answers each context request with the recorded completion tokens."""
+
+    def __init__(self, recording: Recording, clock: ReplayClock, **kwargs):
+        super().__init__(api_key="replay", model="replay", **kwargs)
+        self._replay_clock = clock
+        self._responses: Dict[int, List[dict]] = defaultdict(list)
+        for event in recording.of_type("llm"):
+            self._responses[event["anchor"]].append(event)
+        self._index = -1
+
+    async def _process_context(self, context: OpenAILLMContext):
+        self._index += 1
+        if self._index not in self._responses:
+            logger.warning(f"{self}: no recorded response for request {self._index}")
+            return
+        start = time.monotonic()
+        for event in self._responses[self._index]:
+            await self._replay_clock.wait_until(start, event["delay"])
+            await self.push_frame(LLMTextFrame(event["text"]))
+
+
+class ReplayTTSService(PacedTTSMixin, TTSService):
+    """Plays back recorded utterances in the order they were synthesized."""
+
+    def __init__(self, recording: Recording, clock: ReplayClock, *, sample_rate: int, **kwargs):
+        super().__init__(sample_rate=sample_rate, **kwargs)
+        self._recording = recording
+        self._replay_clock = clock
+        self._utterances = recording.of_type("tts")
+        self._index = -1
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        self._index += 1
+        if self._index >= len(self._utterances):
+            logger.warning(f"{self}: no recorded audio for [{text}]")
+            return
+        event = self._utterances[self._index]
+        await self._replay_clock.wait_until(time.monotonic(), event["delay"])
+        audio = self._recording.tts_audio(event)
+        yield TTSStartedFrame()
+        chunk_size = int(self.sample_rate * 0.02) * 2
+        for i in range(0, len(audio), chunk_size):
+            frame = TTSAudioRawFrame(audio=audio[i:i + chunk_size], sample_rate=self.sample_rate, num_channels=1)
+            await self.wait_for_output_capacity(frame)
+            yield frame
+        yield TTSStoppedFrame()
+
+
+class ReplayBotService(BotService):
+    """BotService with recorded responses substituted for live providers.
+
+    The pipeline topology, context aggregation, transcript processing, VAD
+    and output chunking are the production ones.
+    """
+
+    def __init__(self, recording: Recording, realtime: bool = False, speed: float = 1.0):
+        self.recording = recording
+        self.clock = ReplayClock(realtime, speed)
+        self.stats = ReplayStats()
+        transport = ReplayTransport(recording, self.clock)
+        super().__init__(transport, recording.meta.get("language", "en"), pc_id=recording.meta.get("pc_id"))
+        self.stats.input = transport.input()
+        self.stats.output = transport.output()
+
+    def _create_stt(self, language: str):
+        return ReplaySTTService(self.recording, self.clock)
+
+    def _create_llm(self, language: str):
+        return ReplayLLMService(self.recording, self.clock)
+
+    def _create_translation(self, language: str):
+        # The recorded TTS utterances are already in the spoken language
+        return None
+
+    def _create_tts(self, language: str):
+        return ReplayTTSService(self.recording, self.clock, sample_rate=self._tts_sample_rate())
+
+    def _create_recorder(self, pc_id: Optional[str], language: str):
+        return None
+
+    def _create_output_pacer(self, language: str):
+        # The pacer runs on the wall clock; only real-time replays at 1x
+        # play out at the speed it paces for.
+        if self.clock.realtime and self.clock.speed == 1.0:
+            return super()._create_output_pacer(language)
+        return None
+
+    def _create_pipeline_params(self) -> PipelineParams:
+        params = super()._create_pipeline_params()
+        params.audio_in_sample_rate = self.recording.meta.get("input_sample_rate", params.audio_in_sample_rate)
+        params.audio_out_sample_rate = self._tts_sample_rate()
+        return params
+
+    def _tts_sample_rate(self) -> int:
+        # A recording without any bot audio has no rate of its own
+        return self.recording.meta.get("tts_sample_rate") or super()._create_pipeline_params().audio_out_sample_rate
+
+    def _create_observers(self) -> list:
+        return [self.stats]
+
+    async def _wait_until_idle(self, idle: float):
+        while time.monotonic() - self.stats.last_activity < idle:
+            await asyncio.sleep(idle / 4)
+
+    async def run(self) -> dict:
+        wall, cpu = time.monotonic(), time.process_time()
+        with self._log_context():
+            runner = asyncio.create_task(self.runner.run(self.task))
+            await self.transport.input_finished.wait()
+            await self._wait_until_idle(1.5 if self.clock.realtime else 0.5)
+            await self.task.queue_frame(EndFrame())
+            await runner
+        return self.stats.report(self.recording, time.monotonic() - wall, time.process_time() - cpu)
@@ -0,0 +1,27 @@
+import argparse
+import asyncio
+import json
+
+from services.replay.recording import Recording
+from services.replay.replay import ReplayBotService
+
+
+async def replay(path: str, realtime: bool, speed: float, repeat: int):
+    recording = Recording.load(path)
+    for _ in range(repeat):
+        bot_service = ReplayBotService(recording, realtime=realtime, speed=speed)
+        report = await bot_service.run()
+        print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded session through the bot pipeline")
+    parser.add_argument("recording", help="Recording directory (see RECORDINGS_DIR)")
+    parser.add_argument(
+        "--realtime", action="store_true", help="Reproduce recorded timings instead of running as fast as possible"
+    )
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed in real-time mode (default: 1.0)")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of replays, one JSON report each")
+    args = parser.parse_args()
+
+    asyncio.run(replay(args.recording, args.realtime, args.speed, args.repeat))
@@ -0,0 +1,320 @@
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Coroutine, Deque, Dict, List, Optional, Tuple
+
+from utils.logging import log_sampled, setup_logging
+from utils.metrics import metrics, percentile
+
+logger = setup_logging()
+
+_EXHAUSTED = object()
+_FAILED = object()
+
+
+class ProviderUnavailableError(Exception):
+    pass
+
+
+async def _cancel_task(task: asyncio.Task):
+    task.cancel()
+    await asyncio.wait([task])
+
+
+class ProviderHealth:
+    """Rolling first-byte latency, error rate and circuit breaker for one provider.
+
+    Health is shared by every session in the process that routes with the same
+    options (see ``get_provider_health``) so a provider that starts timing out
+    for one call is avoided by the others.
+    """
+
+    def __init__(self, window: int = 100, failure_threshold: int = 3, cooldown: float = 30.0):
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._failure_threshold = failure_threshold
+        self._cooldown = cooldown
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def p50(self) -> float:
+        return percentile(self._latencies, 0.50)
+
+    @property
+    def p95(self) -> float:
+        return percentile(self._latencies, 0.95)
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self._cooldown:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            # Let a single request through to probe the provider.
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self, latency: float):
+        self._latencies.append(latency)
+        self._outcomes.append(True)
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self._outcomes.append(False)
+        self._count_failure()
+
+    def record_lost(self, elapsed: float):
+        """Records a hedge race this provider lost after ``elapsed`` seconds.
+
+        Its real first-byte latency is longer than that, but leaving the
+        sample out would make p95 describe only the races it wins. A loss
+        also counts towards the breaker, so a provider that is always beaten
+        gets skipped rather than paid for on every request.
+        """
+        self._latencies.append(elapsed)
+        self._count_failure()
+
+    def _count_failure(self):
+        self._consecutive_failures += 1
+        if self._trial_in_flight or self._consecutive_failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def release(self):
+        # A half-open trial that was cancelled (lost a hedge, interrupted)
+        # tells us nothing, so let the next request probe again.
+        self._trial_in_flight = False
+
+
+_health: Dict[Tuple, ProviderHealth] = {}
+
+
+def get_provider_health(kind: str, name: str, **kwargs) -> ProviderHealth:
+    # Profiles routing the same provider with a different window, threshold
+    # or cooldown get their own breaker rather than silently sharing the
+    # first one created.
+    key = (kind, name, tuple(sorted(kwargs.items())))
+    if key not in _health:
+        _health[key] = ProviderHealth(**kwargs)
+    return _health[key]
+
+
+class ProviderRouter:
+    """Routes a request across an ordered list of providers.
+
+    The first available provider is the primary. If it has not produced its
+    first item within a deadline derived from its rolling p95 (clamped to
+    ``[min_hedge_delay, max_hedge_delay]``), the next provider is started as a
+    hedge; whichever answers first wins and the other one is cancelled. A
+    provider that fails (raises, or whose first item satisfies ``is_error``)
+    fails over to the next one immediately. Providers whose breaker is open
+    are skipped unless every provider is open.
+
+    Providers are plain callables returning async iterators, so the router can
+    be exercised with local stubs without any pipeline around it. A pipeline
+    service passes its own ``create_task``/``cancel_task`` so the provider
+    calls are tracked by its task manager.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        names: List[str],
+        *,
+        hedge: bool = True,
+        min_hedge_delay: float = 0.3,
+        max_hedge_delay: float = 2.0,
+        min_samples: int = 10,
+        window: int = 100,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        is_error: Optional[Callable[[object], bool]] = None,
+        create_task: Optional[Callable[[Coroutine, str], asyncio.Task]] = None,
+        cancel_task: Optional[Callable[[asyncio.Task], Awaitable]] = None,
+    ):
+        self._kind = kind
+        self._names = names
+        self._hedge = hedge
+        self._min_hedge_delay = min_hedge_delay
+        self._max_hedge_delay = max_hedge_delay
+        self._min_samples = min_samples
+        self._is_error = is_error or (lambda item: False)
+        self._create_task = create_task or (lambda coroutine, name: asyncio.create_task(coroutine, name=name))
+        self._cancel_task = cancel_task or _cancel_task
+        self._health = {
+            name: get_provider_health(
+                kind, name, window=window, failure_threshold=failure_threshold, cooldown=cooldown
+            )
+            for name in names
+        }
+
+    def health(self, name: str) -> ProviderHealth:
+        return self._health[name]
+
+    def hedge_delay(self, name: str) -> float:
+        health = self._health[name]
+        if health.samples < self._min_samples:
+            return self._max_hedge_delay
+        return min(self._max_hedge_delay, max(self._min_hedge_delay, health.p95))
+
+    def _publish(self, name: str):
+        health = self._health[name]
+        labels = {"kind": self._kind, "provider": name}
+        metrics.set_gauge("provider_first_byte_p50_seconds", health.p50, **labels)
+        metrics.set_gauge("provider_first_byte_p95_seconds", health.p95, **labels)
+        metrics.set_gauge("provider_error_rate", health.error_rate, **labels)
+        metrics.set_gauge("provider_circuit_open", int(health.state != "closed"), **labels)
+
+    async def stream(self, providers: Dict[str, Callable[[], AsyncIterator]]) -> AsyncIterator:
+        candidates = [name for name in self._names if name in providers]
+        # Each provider call's first item (or exception) arrives in a future,
+        # since a task manager task does not keep its coroutine's result.
+        pending: Dict[asyncio.Future, Tuple[str, AsyncIterator, float, asyncio.Task]] = {}
+        winner: Optional[AsyncIterator] = None
+        last_error = None
+        # When to hedge the most recently launched provider
+        hedge_at = 0.0
+
+        async def first_item(iterator: AsyncIterator, result: asyncio.Future):
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                item = _EXHAUSTED
+            except Exception as e:
+                result.set_exception(e)
+                return
+            result.set_result(item)
+
+        def next_candidate() -> Optional[str]:
+            # Breakers are consulted lazily so a half-open provider only
+            # takes its trial slot when it is actually called.
+            while candidates:
+                name = candidates.pop(0)
+                if self._health[name].allow():
+                    return name
+            return None
+
+        def launch(name: str):
+            nonlocal hedge_at
+            iterator = providers[name]().__aiter__()
+            result = asyncio.get_running_loop().create_future()
+            task = self._create_task(first_item(iterator, result), f"{self._kind}_{name}")
+            started = time.monotonic()
+            pending[result] = (name, iterator, started, task)
+            hedge_at = started + self.hedge_delay(name)
+
+        async def close(iterator: AsyncIterator):
+            aclose = getattr(iterator, "aclose", None)
+            if aclose:
+                await aclose()
+
+        async def discard(result: asyncio.Future, task: asyncio.Task, iterator: AsyncIterator):
+            await self._cancel_task(task)
+            result.cancel()
+            await close(iterator)
+
+        try:
+            # With every breaker open we still try the primary rather than
+            # failing the turn outright.
+            primary = next_candidate() or next(name for name in self._names if name in providers)
+            launch(primary)
+            while pending:
+                timeout = None
+                if self._hedge and candidates:
+                    # Counted from the launch, not from this pass of the loop
+                    timeout = max(0.0, hedge_at - time.monotonic())
+                done, _ = await asyncio.wait(
+                    pending.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedge = next_candidate()
+                    if hedge:
+                        launch(hedge)
+                        metrics.inc("provider_hedges_total", kind=self._kind, provider=hedge)
+                        log_sampled("DEBUG", "{}: {} slow, hedging with {}", self._kind, primary, hedge)
+                        primary = hedge
+                    continue
+
+                for result in done:
+                    name, iterator, started, task = pending.pop(result)
+                    # Already finished; this just removes it from the task manager
+                    await self._cancel_task(task)
+                    health = self._health[name]
+                    try:
+                        item = result.result()
+                    except Exception as e:
+                        logger.warning(f"{self._kind} provider {name} failed: {e}")
+                        item, last_error = _FAILED, e
+                    if item is _FAILED or (item is not _EXHAUSTED and self._is_error(item)):
+                        if item is not _FAILED:
+                            last_error = item
+                        health.record_failure()
+                        metrics.inc("provider_requests_total", kind=self._kind, provider=name, outcome="error")
+                        self._publish(name)
+                        await close(iterator)
+                        continue
+
+                    health.record_success(time.monotonic() - started)
+                    metrics.inc("provider_requests_total", kind=self._kind, provider=name, outcome="win")
+                    self._publish(name)
+                    winner, winner_started = iterator, started
+                    break
+
+                if winner is not None:
+                    break
+                if not pending:
+                    primary = next_candidate()
+                    if primary:
+                        launch(primary)
+
+            if winner is not None:
+                now = time.monotonic()
+                for result, (name, iterator, started, task) in list(pending.items()):
+                    pending.pop(result)
+                    if started <= winner_started:
+                        # Started first and still beaten: slower than the winner
+                        self._health[name].record_lost(now - started)
+                        metrics.inc("provider_requests_total", kind=self._kind, provider=name, outcome="lost")
+                        self._publish(name)
+                    else:
+                        self._health[name].release()
+                        metrics.inc("provider_requests_total", kind=self._kind, provider=name, outcome="cancelled")
+                    await discard(result, task, iterator)
+                if item is not _EXHAUSTED:
+                    yield item
+                    async for item in winner:
+                        yield item
+                return
+        finally:
+            for result, (name, iterator, _, task) in pending.items():
+                self._health[name].release()
+                await discard(result, task, iterator)
+            if winner is not None:
+                await close(winner)
+
+        if last_error is not None and not isinstance(last_error, Exception):
+            yield last_error
+            return
+        raise ProviderUnavailableError(f"All {self._kind} providers failed: {last_error}")
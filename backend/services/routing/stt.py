@@ -0,0 +1,73 @@
+from typing import AsyncGenerator, Dict, List
+
+from pipecat.frames.frames import CancelFrame, EndFrame, ErrorFrame, Frame, StartFrame
+from pipecat.services.stt_service import SegmentedSTTService
+
+from services.routing.router import ProviderRouter, ProviderUnavailableError
+from utils.logging import log_sampled
+
+
+class RoutedSTTService(SegmentedSTTService):
+    """Segmented STT service that routes each utterance across several providers.
+
+    Providers must be segmented (Whisper-style) services. Streaming services
+    such as Gladia transcribe continuously over a websocket and cannot be
+    hedged per utterance.
+    """
+
+    def __init__(self, *, providers: Dict[str, SegmentedSTTService], routing: dict, **kwargs):
+        super().__init__(**kwargs)
+        for name, provider in providers.items():
+            if not isinstance(provider, SegmentedSTTService):
+                raise ValueError(f"STT provider '{name}' is not segmented and cannot be routed")
+        self._providers = providers
+        self._router = ProviderRouter(
+            "stt",
+            list(providers.keys()),
+            is_error=lambda frame: isinstance(frame, ErrorFrame),
+            create_task=self.create_task,
+            cancel_task=self.cancel_task,
+            **routing,
+        )
+
+    @property
+    def provider_names(self) -> List[str]:
+        return list(self._providers.keys())
+
+    def can_generate_metrics(self) -> bool:
+        return True
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        for provider in self._providers.values():
+            await provider.start(frame)
+
+    async def stop(self, frame: EndFrame):
+        await super().stop(frame)
+        for provider in self._providers.values():
+            await provider.stop(frame)
+
+    async def cancel(self, frame: CancelFrame):
+        await super().cancel(frame)
+        for provider in self._providers.values():
+            await provider.cancel(frame)
+
+    async def cleanup(self):
+        await super().cleanup()
+        for provider in self._providers.values():
+            await provider.cleanup()
+
+    async def run_stt(self, audio: bytes) -> AsyncGenerator[Frame, None]:
+        await self.start_processing_metrics()
+        await self.start_ttfb_metrics()
+        try:
+            async for frame in self._router.stream(
+                {name: (lambda p=provider: p.run_stt(audio)) for name, provider in self._providers.items()}
+            ):
+                await self.stop_ttfb_metrics()
+                log_sampled("DEBUG", "{}: {} from {:.2f}s of audio", self, frame, len(audio) / (self.sample_rate * 2))
+                yield frame
+        except ProviderUnavailableError as e:
+            yield ErrorFrame(str(e))
+        finally:
+            await self.stop_processing_metrics()
@@ -0,0 +1,89 @@
+import asyncio
+import random
+from typing import AsyncGenerator, Optional
+
+from pipecat.frames.frames import (
+    ErrorFrame,
+    Frame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+)
+from pipecat.services.stt_service import SegmentedSTTService
+from pipecat.services.tts_service import TTSService
+from pipecat.utils.time import time_now_iso8601
+
+from services.output_pacer import PacedTTSMixin
+
+
+class _StubBehaviour:
+    def __init__(self, latency: float, jitter: float, failure_rate: float, seed: Optional[int]):
+        self._latency = latency
+        self._jitter = jitter
+        self._failure_rate = failure_rate
+        self._random = random.Random(seed)
+
+    async def wait(self) -> bool:
+        """Sleeps for the simulated first-byte latency, returns False on a simulated failure."""
+        await asyncio.sleep(self._latency + self._random.uniform(0, self._jitter))
+        return self._random.random() >= self._failure_rate
+
+
+class StubTTSService(PacedTTSMixin, TTSService):
+    """Local TTS provider producing silence after a simulated latency.
+
+    Used to exercise provider routing and failover without network access.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.2,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seconds_per_char: float = 0.06,
+        seed: Optional[int] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._behaviour = _StubBehaviour(latency, jitter, failure_rate, seed)
+        self._seconds_per_char = seconds_per_char
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        if not await self._behaviour.wait():
+            yield ErrorFrame(f"{self} simulated failure")
+            return
+
+        yield TTSStartedFrame()
+        chunk_size = int(self.sample_rate * 0.02) * 2
+        num_chunks = max(1, int(len(text) * self._seconds_per_char / 0.02))
+        for _ in range(num_chunks):
+            frame = TTSAudioRawFrame(audio=b"\x00" * chunk_size, sample_rate=self.sample_rate, num_channels=1)
+            await self.wait_for_output_capacity(frame)
+            yield frame
+        yield TTSStoppedFrame()
+
+
+class StubSTTService(SegmentedSTTService):
+    """Local segmented STT provider returning a fixed transcript after a simulated latency."""
+
+    def __init__(
+        self,
+        *,
+        transcript: str = "stub transcription",
+        latency: float = 0.3,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._behaviour = _StubBehaviour(latency, jitter, failure_rate, seed)
+        self._transcript = transcript
+
+    async def run_stt(self, audio: bytes) -> AsyncGenerator[Frame, None]:
+        if not await self._behaviour.wait():
+            yield ErrorFrame(f"{self} simulated failure")
+            return
+        yield TranscriptionFrame(self._transcript, "", time_now_iso8601())
@@ -0,0 +1,101 @@
+from typing import AsyncGenerator, Dict, List
+
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    ErrorFrame,
+    Frame,
+    OutputAudioRawFrame,
+    StartFrame,
+    StartInterruptionFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.services.tts_service import TTSService
+from pipecat.services.websocket_service import WebsocketService
+
+from services.output_pacer import PacedTTSMixin
+from services.routing.router import ProviderRouter, ProviderUnavailableError
+
+
+class RoutedTTSService(PacedTTSMixin, TTSService):
+    """TTS service that routes each utterance across several providers.
+
+    Only providers that return their audio from ``run_tts`` can be routed.
+    Websocket providers (e.g. Cartesia) push audio from a receive task, so
+    they can only be used on their own.
+    """
+
+    def __init__(self, *, providers: Dict[str, TTSService], routing: dict, **kwargs):
+        super().__init__(**kwargs)
+        for name, provider in providers.items():
+            if isinstance(provider, WebsocketService):
+                raise ValueError(f"TTS provider '{name}' streams over a websocket and cannot be routed")
+        self._providers = providers
+        self._router = ProviderRouter(
+            "tts",
+            list(providers.keys()),
+            is_error=lambda frame: isinstance(frame, ErrorFrame),
+            create_task=self.create_task,
+            cancel_task=self.cancel_task,
+            **routing,
+        )
+
+    @property
+    def provider_names(self) -> List[str]:
+        return list(self._providers.keys())
+
+    def can_generate_metrics(self) -> bool:
+        return True
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        for provider in self._providers.values():
+            # Sets the provider up (clock, task manager, metrics) as if it
+            # were a pipeline processor, then starts it
+            await provider.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+    async def stop(self, frame: EndFrame):
+        await super().stop(frame)
+        for provider in self._providers.values():
+            await provider.stop(frame)
+
+    async def cancel(self, frame: CancelFrame):
+        await super().cancel(frame)
+        for provider in self._providers.values():
+            await provider.cancel(frame)
+
+    async def cleanup(self):
+        await super().cleanup()
+        for provider in self._providers.values():
+            await provider.cleanup()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, StartInterruptionFrame):
+            for provider in self._providers.values():
+                if hasattr(provider, "record_interruption"):
+                    provider.record_interruption()
+
+    async def _start_interruption(self):
+        # Providers never see the interruption frame themselves, so let the
+        # ones that can abort a synthesis in flight do so before the base
+        # class cancels the routed stream.
+        for provider in self._providers.values():
+            if hasattr(provider, "abort_synthesis"):
+                provider.abort_synthesis()
+        await super()._start_interruption()
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        await self.start_ttfb_metrics()
+        try:
+            async for frame in self._router.stream(
+                {name: (lambda p=provider: p.run_tts(text)) for name, provider in self._providers.items()}
+            ):
+                await self.stop_ttfb_metrics()
+                # Providers run without a pacer of their own; waiting here
+                # stops this loop pulling frames from the winning provider.
+                if isinstance(frame, OutputAudioRawFrame):
+                    await self.wait_for_output_capacity(frame)
+                yield frame
+        except ProviderUnavailableError as e:
+            yield ErrorFrame(str(e))
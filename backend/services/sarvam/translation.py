@@ -1,18 +1,151 @@
-from typing import AsyncGenerator
+import asyncio
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
+
 import aiohttp
+from loguru import logger
 
-from pipecat.frames.frames import Frame, ErrorFrame, TextFrame
-from pipecat.processors.frame_processor import FrameDirection
+from pipecat.frames.frames import (
+    CancelFrame,
+    DataFrame,
+    EndFrame,
+    ErrorFrame,
+    Frame,
+    InterimTranscriptionFrame,
+    LLMFullResponseEndFrame,
+    StartFrame,
+    StartInterruptionFrame,
+    SystemFrame,
+    TextFrame,
+    TranscriptionFrame,
+    TTSTextFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 from pipecat.services.ai_service import AIService
 
+from utils.logging import log_sampled
+from utils.metrics import metrics
+from utils.rate_limiter import Priority, get_rate_limiter
+
+# Clause boundaries, only once the next character has arrived so "3.5" or a
+# half-streamed "..." doesn't split
+_BOUNDARY = re.compile(r"[.?!।,;:](?=\s)")
+_SENTENCE_END = ".?!।"
+
+
+@dataclass
+class SourceTextFrame(DataFrame):
+    """The untranslated text of a clause, pushed right behind its translation.
+
+    Not a TextFrame, so the TTS service passes it on untouched, after the
+    clause's audio.
+    """
+
+    text: str
+
+
+@dataclass
+class SourceResponseEndFrame(DataFrame):
+    """Carries an LLMFullResponseEndFrame past a TTS service created with
+    ``push_text_frames=False``, which would otherwise keep it."""
+
+    pass
+
+
+class SourceTextProcessor(FrameProcessor):
+    """Restores the untranslated reply for the assistant aggregators.
+
+    Placed right after TTS: ``SourceTextFrame`` becomes a ``TTSTextFrame``
+    and ``SourceResponseEndFrame`` an ``LLMFullResponseEndFrame``, in the
+    same position relative to the audio, so the context and transcript get
+    the text the LLM wrote, and only as much of it as was spoken.
+    """
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, SourceTextFrame):
+            await self.push_frame(TTSTextFrame(frame.text), direction)
+        elif isinstance(frame, SourceResponseEndFrame):
+            await self.push_frame(LLMFullResponseEndFrame(), direction)
+        else:
+            await self.push_frame(frame, direction)
+
+
+def split_clauses(text: str, min_chars: int) -> Tuple[List[str], str]:
+    """Splits complete clauses off the front of ``text``.
+
+    Sentence ends always close a clause; commas, semicolons and colons only
+    once the clause is ``min_chars`` long, since very short fragments
+    translate poorly. Returns the clauses and the unfinished remainder.
+    """
+    clauses = []
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        clause = text[start:match.end()].strip()
+        if match.group() not in _SENTENCE_END and len(clause) < min_chars:
+            continue
+        if clause:
+            clauses.append(clause)
+        start = match.end()
+    return clauses, text[start:]
+
+
 class SarvamTranslationService(AIService):
-    def __init__(self, api_key: str, source_language_code: str = "en-IN", target_language_code: str = "ta-IN"):
-        super().__init__()
+    """Translates LLM output clause by clause on its way to TTS.
+
+    Streamed LLM text is aggregated into clauses, and each clause is sent to
+    Sarvam's translate API as soon as it is complete, with up to
+    ``max_concurrency`` requests in flight. Translated clauses are pushed
+    downstream strictly in order, each one as soon as it and every clause
+    before it are done; other frames keep their place in that order. Put it
+    in front of a TTS service created with ``aggregate_sentences=False`` so
+    that synthesis of one clause overlaps translation of the next.
+
+    Each translation is followed by a ``SourceTextFrame`` with the original
+    clause. With the TTS also created with ``push_text_frames=False``, put
+    ``source_text()`` right after it so the assistant context and transcript
+    record the untranslated reply.
+
+    An interruption cancels every pending translation. A clause whose
+    translation fails is passed on untranslated rather than dropped.
+    """
+
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        source_language_code: str = "en-IN",
+        target_language_code: str = "ta-IN",
+        max_concurrency: int = 3,
+        min_clause_chars: int = 40,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
         self._api_key = api_key
         self._source_language_code = source_language_code
         self._target_language_code = target_language_code
+        self._min_clause_chars = min_clause_chars
         self._endpoint = "https://api.sarvam.ai/translate"
-        self._session = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._rate_limiter = get_rate_limiter("sarvam", api_key)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self._text = ""
+        # (clause, task, result) per translation and pass-through frames, in
+        # output order
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._translations: Deque[asyncio.Task] = deque()
+        self._output_task: Optional[asyncio.Task] = None
+        self._source_text: Optional[SourceTextProcessor] = None
+
+    def source_text(self) -> SourceTextProcessor:
+        if self._source_text is None:
+            self._source_text = SourceTextProcessor()
+        return self._source_text
 
     async def __aenter__(self):
         self._session = aiohttp.ClientSession()
@@ -23,36 +156,118 @@ class SarvamTranslationService(AIService):
             await self._session.close()
             self._session = None
 
-    async def process_frame(self, frame: Frame, direction: FrameDirection) -> AsyncGenerator[Frame, None]:
-        print(f"DEBUG: SarvamTranslationService.process_frame called with frame={frame}, direction={direction}")
-        if isinstance(frame, TextFrame):
-            text = frame.text
-            payload = {
-                "input": text,
-                "source_language_code": self._source_language_code,
-                "target_language_code": self._target_language_code,
-                "speaker_gender": "female",
-                "mode": "modern-colloquial"
-            }
-            headers = {"api-subscription-key": self._api_key}
-
-            try:
-                if self._session is None:
-                    self._session = aiohttp.ClientSession()
-                async with self._session.post(self._endpoint, json=payload, headers=headers) as response:
-                    if response.status != 200:
-                        yield ErrorFrame(f"Translation error (status: {response.status})")
-                        return
-                    data = await response.json()
-                    translated_text = data["translated_text"]
-                    yield TextFrame(text=translated_text)
-            except Exception as e:
-                yield ErrorFrame(f"Error during translation: {str(e)}")
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        self._output_task = self.create_task(self._output_loop())
+
+    async def cancel(self, frame: CancelFrame):
+        await super().cancel(frame)
+        await self._reset()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, StartInterruptionFrame):
+            await self._reset()
+            self._output_task = self.create_task(self._output_loop())
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, SystemFrame) or direction == FrameDirection.UPSTREAM:
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, TextFrame) and not isinstance(
+            frame, (TranscriptionFrame, InterimTranscriptionFrame)
+        ):
+            self._text += frame.text
+            clauses, self._text = split_clauses(self._text, self._min_clause_chars)
+            for clause in clauses:
+                self._translate_next(clause)
         else:
-            print(f"DEBUG: Yielding frame={frame}")
-            yield frame
+            if isinstance(frame, (LLMFullResponseEndFrame, EndFrame)):
+                # Whatever is left is the end of the response
+                clause, self._text = self._text.strip(), ""
+                if clause:
+                    self._translate_next(clause)
+            if isinstance(frame, LLMFullResponseEndFrame):
+                frame = SourceResponseEndFrame()
+            self._queue.put_nowait(frame)
+
+    def _translate_next(self, clause: str):
+        # Task manager tasks drop their return value, so each translation
+        # hands its text over in a future.
+        result = asyncio.get_running_loop().create_future()
+        task = self.create_task(self._translate_clause(clause, result), "translate_clause")
+        self._translations.append(task)
+        self._queue.put_nowait((clause, task, result))
+
+    async def _output_loop(self):
+        while True:
+            item = await self._queue.get()
+            if isinstance(item, tuple):
+                clause, task, result = item
+                text = await result
+                await self.wait_for_task(task)
+                self._translations.popleft()
+                if text:
+                    await self.push_frame(TextFrame(text))
+                await self.push_frame(SourceTextFrame(clause))
+            else:
+                await self.push_frame(item)
+
+    async def _reset(self):
+        if self._output_task:
+            await self.cancel_task(self._output_task)
+            self._output_task = None
+        cancelled = 0
+        while self._translations:
+            task = self._translations.popleft()
+            if not task.done():
+                cancelled += 1
+            await self.cancel_task(task)
+        if cancelled:
+            metrics.inc("translation_cancelled_total", cancelled, service="sarvam")
+        self._queue = asyncio.Queue()
+        self._text = ""
+
+    async def _translate_clause(self, text: str, result: asyncio.Future):
+        try:
+            async with self._semaphore:
+                start = time.monotonic()
+                try:
+                    translated = await self._translate(text)
+                except Exception as e:
+                    logger.warning(f"{self}: translation failed, passing the clause on as is ({e})")
+                    metrics.inc("translation_errors_total", service="sarvam")
+                    await self.push_error(ErrorFrame(f"Error during translation: {e}"))
+                    translated = text
+                else:
+                    metrics.observe("translation_seconds", time.monotonic() - start, service="sarvam")
+                    log_sampled("DEBUG", "{}: [{}] -> [{}]", self, text, translated)
+            result.set_result(translated)
+        finally:
+            if not result.done():
+                result.cancel()
+
+    async def _translate(self, text: str) -> str:
+        payload = {
+            "input": text,
+            "source_language_code": self._source_language_code,
+            "target_language_code": self._target_language_code,
+            "speaker_gender": "female",
+            "mode": "modern-colloquial"
+        }
+        headers = {"api-subscription-key": self._api_key}
+
+        await self._rate_limiter.acquire(Priority.REALTIME)
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        async with self._session.post(self._endpoint, json=payload, headers=headers) as response:
+            if response.status != 200:
+                raise ValueError(f"status: {response.status}, error: {await response.text()}")
+            data = await response.json()
+            return data["translated_text"]
 
     async def cleanup(self):
+        await super().cleanup()
+        await self._reset()
         if self._session:
             await self._session.close()
-            self._session = None
\ No newline at end of file
+            self._session = None
@@ -1,5 +1,6 @@
 from typing import AsyncGenerator, Optional
 import aiohttp
+import asyncio
 import base64
 import io
 import os
@@ -13,13 +14,25 @@ from pipecat.frames.frames import (
     ErrorFrame,
     Frame,
     StartFrame,
+    StartInterruptionFrame,
     TTSAudioRawFrame,
     TTSStartedFrame,
     TTSStoppedFrame,
 )
+from pipecat.processors.frame_processor import FrameDirection
 from pipecat.services.tts_service import TTSService
 
-class SarvamTTSService(TTSService):
+from config.settings import SARVAM_DEBUG_AUDIO
+from services.output_pacer import PacedTTSMixin
+from utils.logging import log_sampled
+from utils.metrics import metrics
+from utils.rate_limiter import Priority, get_rate_limiter
+
+class SarvamTTSError(Exception):
+    pass
+
+
+class SarvamTTSService(PacedTTSMixin, TTSService):
     DEFAULT_SAMPLE_RATE = 24000  # Match WebRTC transport
     SARVAM_API_SAMPLE_RATE = 24000  # Closest Sarvam-supported rate
 
@@ -43,6 +56,13 @@ class SarvamTTSService(TTSService):
         self._tts_endpoint = "https://api.sarvam.ai/text-to-speech"
         # self._translate_endpoint = "https://api.sarvam.ai/translate"
         self._session = None
+        self._rate_limiter = get_rate_limiter("sarvam", api_key)
+        # Bumped on every interruption. A synthesis started under an older
+        # generation is stale and stops emitting audio at its next checkpoint.
+        self._generation = 0
+        self._request_task: Optional[asyncio.Task] = None
+        self._synthesizing = False
+        self._interrupted_at: Optional[float] = None
         self._validate_voice(voice)
         self._validate_model(model)
 
@@ -79,15 +99,52 @@ class SarvamTTSService(TTSService):
         if self.SARVAM_API_SAMPLE_RATE not in [8000, 16000, 22050, 24000]:
             logger.error(f"Invalid Sarvam API sample rate: {self.SARVAM_API_SAMPLE_RATE}")
 
-    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
-        if len(text) > 500:
-            yield ErrorFrame("Input text exceeds 500 characters.")
-            return
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, StartInterruptionFrame):
+            # The request is aborted and the interruption pushed on; the
+            # pacer and output transport drop their queued audio from here.
+            self.record_interruption()
 
-        logger.debug(f"{self}: Processing text [{text}]")
-        await self.start_ttfb_metrics()
+    async def _start_interruption(self):
+        # Abort before the base class cancels the input task, so nothing
+        # decoded after this point is turned into audio frames.
+        self.abort_synthesis()
+        await super()._start_interruption()
+
+    def abort_synthesis(self):
+        """Invalidates the current synthesis and aborts its HTTP request.
 
-        # TTS step
+        Called on interruption, by this service or by a ``RoutedTTSService``
+        it is a provider of.
+        """
+        self._generation += 1
+        if self._synthesizing:
+            self._interrupted_at = time.monotonic()
+        if self._request_task and not self._request_task.done():
+            self._request_task.cancel()
+            metrics.inc("tts_aborted_requests_total", service="sarvam")
+
+    def record_interruption(self):
+        """Records how long the interruption took to get through this
+        service: from aborting the synthesis in flight to pushing the
+        interruption on. Audio already downstream is not included."""
+        if self._interrupted_at is not None:
+            metrics.observe(
+                "tts_interruption_abort_seconds",
+                time.monotonic() - self._interrupted_at,
+                service="sarvam",
+            )
+            self._interrupted_at = None
+
+    async def _fetch_audio_into(self, text: str, result: asyncio.Future):
+        # Task manager tasks drop their return value and exceptions
+        try:
+            result.set_result(await self._fetch_audio(text))
+        except Exception as e:
+            result.set_exception(e)
+
+    async def _fetch_audio(self, text: str) -> bytes:
         tts_payload = {
             "text": text,  # Use 'text' instead of 'inputs'
             "target_language_code": self._target_language_code,
@@ -99,56 +156,115 @@ class SarvamTTSService(TTSService):
 
         headers = {"api-subscription-key": self._api_key}
 
+        await self._rate_limiter.acquire(Priority.REALTIME)
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        async with self._session.post(self._tts_endpoint, json=tts_payload, headers=headers) as response:
+            if response.status != 200:
+                error = await response.text()
+                raise SarvamTTSError(f"status: {response.status}, error: {error}")
+            tts_data = await response.json()
+            return base64.b64decode(tts_data["audios"][0])
+
+    def _save_debug_audio(self, text: str, audio_bytes: bytes):
+        timestamp = int(time.time() * 1000)
+        safe_text = re.sub(r'[^\w\s-]', '', text[:30].replace(" ", "_").replace("\n", "").replace("\t", ""))
+        debug_wav_filename = f"debug_audio/sarvam_raw_{timestamp}_{safe_text}.wav"
+        os.makedirs("debug_audio", exist_ok=True)
+        with open(debug_wav_filename, "wb") as f:
+            f.write(audio_bytes)
+        logger.info(f"Saved raw Sarvam AI audio to: {debug_wav_filename}")
+
+    def _decode_audio(self, audio_bytes: bytes) -> bytes:
+        # Convert WAV to PCM and upsample
+        audio_segment = AudioSegment.from_wav(io.BytesIO(audio_bytes))
+        audio_segment = audio_segment.set_channels(1)
+        audio_segment = audio_segment.set_sample_width(2)
+        if audio_segment.frame_rate != self.sample_rate:
+            audio_segment = audio_segment.set_frame_rate(self.sample_rate)
+        return audio_segment.raw_data
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        if len(text) > 500:
+            yield ErrorFrame("Input text exceeds 500 characters.")
+            return
+
+        log_sampled("DEBUG", "{}: Processing text [{}]", self, text)
+        await self.start_ttfb_metrics()
+
+        generation = self._generation
+
+        def interrupted() -> bool:
+            return generation != self._generation
+
+        self._synthesizing = True
         try:
-            if self._session is None:
-                self._session = aiohttp.ClientSession()
-            async with self._session.post(self._tts_endpoint, json=tts_payload, headers=headers) as response:
-                if response.status != 200:
-                    error = await response.text()
-                    logger.error(f"{self} TTS error (status: {response.status}, error: {error})")
-                    yield ErrorFrame(f"Error getting audio (status: {response.status}, error: {error})")
-                    return
-                tts_data = await response.json()
-                audio_data = tts_data["audios"][0]
-                audio_bytes = base64.b64decode(audio_data)
-
-            # Save raw WAV for debugging
-            timestamp = int(time.time() * 1000)
-            safe_text = re.sub(r'[^\w\s-]', '', text[:30].replace(" ", "_").replace("\n", "").replace("\t", ""))
-            debug_wav_filename = f"debug_audio/sarvam_raw_{timestamp}_{safe_text}.wav"
-            os.makedirs("debug_audio", exist_ok=True)
-            with open(debug_wav_filename, "wb") as f:
-                f.write(audio_bytes)
-            logger.info(f"Saved raw Sarvam AI audio to: {debug_wav_filename}")
-
-            # Convert WAV to PCM and upsample
-            audio_segment = AudioSegment.from_wav(io.BytesIO(audio_bytes))
-            audio_segment = audio_segment.set_channels(1)
-            audio_segment = audio_segment.set_sample_width(2)
-            if audio_segment.frame_rate != self.sample_rate:
-                audio_segment = audio_segment.set_frame_rate(self.sample_rate)
-            raw_audio = audio_segment.raw_data
+            # The request runs in its own task so an interruption can abort it
+            # without tearing down the frame processing task.
+            result = asyncio.get_running_loop().create_future()
+            self._request_task = self.create_task(self._fetch_audio_into(text, result), "fetch_audio")
+            try:
+                await self.wait_for_task(self._request_task)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if not interrupted() or (current and current.cancelling()):
+                    raise
+                # Aborted by abort_synthesis()
+                return
+            finally:
+                self._request_task = None
+            audio_bytes = result.result()
+
+            if SARVAM_DEBUG_AUDIO:
+                await asyncio.to_thread(self._save_debug_audio, text, audio_bytes)
+
+            raw_audio = await asyncio.to_thread(self._decode_audio, audio_bytes)
+            if interrupted():
+                return
 
             await self.start_tts_usage_metrics(text)
             yield TTSStartedFrame()
 
             CHUNK_SIZE = int(self.sample_rate * 0.02 * 2)  # 20 ms at 24000 Hz = 960 bytes
             for i in range(0, len(raw_audio), CHUNK_SIZE):
-                chunk = raw_audio[i:i + CHUNK_SIZE]
-                await self.stop_ttfb_metrics()
-                yield TTSAudioRawFrame(
-                    audio=chunk,
+                frame = TTSAudioRawFrame(
+                    audio=raw_audio[i:i + CHUNK_SIZE],
                     sample_rate=self.sample_rate,
                     num_channels=1
                 )
+                # Blocks while the output pacer is full, so the rest of the
+                # utterance stays as bytes until playout catches up.
+                await self.wait_for_output_capacity(frame)
+                if interrupted():
+                    # Discard whatever is left of the utterance.
+                    metrics.inc(
+                        "tts_discarded_audio_seconds",
+                        (len(raw_audio) - i) / (self.sample_rate * 2),
+                        service="sarvam",
+                    )
+                    return
+                await self.stop_ttfb_metrics()
+                yield frame
+                # Queueing a frame never suspends, so give a pending
+                # interruption a chance to run between chunks.
+                await asyncio.sleep(0)
 
             yield TTSStoppedFrame()
 
+        except SarvamTTSError as e:
+            logger.error(f"{self} TTS error ({e})")
+            yield ErrorFrame(f"Error getting audio ({e})")
         except Exception as e:
             logger.exception(f"{self} error generating TTS: {e}")
             yield ErrorFrame(f"Error generating TTS: {str(e)}")
+        finally:
+            self._synthesizing = False
 
     async def cleanup(self):
+        await super().cleanup()
+        if self._request_task:
+            await self.cancel_task(self._request_task)
+            self._request_task = None
         if self._session:
             await self._session.close()
             self._session = None
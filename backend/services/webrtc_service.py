@@ -1,15 +1,32 @@
-from typing import Dict
+from typing import Dict, Optional
 import asyncio
 from pipecat.transports.network.webrtc_connection import SmallWebRTCConnection
 from pipecat.transports.network.small_webrtc import SmallWebRTCTransport
 from pipecat.transports.base_transport import TransportParams
 from pipecat.audio.vad.silero import SileroVADAnalyzer
+from pipecat.audio.vad.vad_analyzer import VADParams
 
+from config.profiles import get_language_profile, get_vad_options
 from config.settings import WEBRTC_AUDIO_CHUNK_SIZE
 from utils.logging import setup_logging
 
 logger = setup_logging()
 
+
+def create_transport_params(language: str, vad_analyzer: Optional[SileroVADAnalyzer] = None) -> TransportParams:
+    if vad_analyzer is None:
+        vad_params = VADParams(**get_vad_options(get_language_profile(language)))
+        vad_analyzer = SileroVADAnalyzer(params=vad_params)
+    return TransportParams(
+        audio_in_enabled=True,
+        audio_out_enabled=True,
+        vad_enabled=True,
+        vad_analyzer=vad_analyzer,
+        vad_audio_passthrough=True,
+        audio_out_10ms_chunks=WEBRTC_AUDIO_CHUNK_SIZE
+    )
+
+
 class WebRTCService:
     def __init__(self):
         self.connections: Dict[str, SmallWebRTCConnection] = {}
@@ -32,17 +49,10 @@ class WebRTCService:
         self.connections[answer["pc_id"]] = connection
         return answer
     
-    def create_transport(self, connection: SmallWebRTCConnection) -> SmallWebRTCTransport:
+    def create_transport(self, connection: SmallWebRTCConnection, language: str) -> SmallWebRTCTransport:
         return SmallWebRTCTransport(
             webrtc_connection=connection,
-            params=TransportParams(
-                audio_in_enabled=True,
-                audio_out_enabled=True,
-                vad_enabled=True,
-                vad_analyzer=SileroVADAnalyzer(),
-                vad_audio_passthrough=True,
-                audio_out_10ms_chunks=WEBRTC_AUDIO_CHUNK_SIZE
-            ),
+            params=create_transport_params(language),
         )
     
     async def cleanup(self):
@@ -0,0 +1,285 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import openai
+
+from config.settings import BULK_EXTRACT_CONCURRENCY, TRANSCRIPTS_DIR, ZOHO_BULK_BATCH_SIZE
+from services.zoho.zoho import build_zoho_lead_record, get_new_access_token, normalize_phone, send_leads_to_zoho
+from services.zoho.zoho_llm import extract_lead_data
+from utils.logging import setup_logging
+from utils.rate_limiter import Priority
+
+logger = setup_logging()
+
+
+class Checkpoint:
+    """Append-only JSONL log of extracted and submitted transcripts.
+
+    A line is written as soon as a transcript is extracted or a batch is
+    accepted by Zoho, so an interrupted run resumes where it stopped.
+    Transcripts whose extraction failed are not recorded and are retried.
+    A last line cut short by a crash is truncated away on load.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.extracted: Dict[str, Optional[dict]] = {}
+        self.submitted = set()
+        if os.path.exists(path):
+            self._load()
+        self._file = open(path, "a")
+
+    def _load(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        kept = 0
+        for number, line in enumerate(data.splitlines(keepends=True), 1):
+            try:
+                entry = json.loads(line) if line.strip() else None
+            except ValueError:
+                if not line.endswith(b"\n"):
+                    logger.warning(f"{self.path}: dropping partial last line {number}")
+                    break
+                logger.warning(f"{self.path}: skipping unreadable line {number}")
+                entry = None
+            kept += len(line)
+            if entry is None:
+                continue
+            if entry["type"] == "extracted":
+                self.extracted[entry["file"]] = entry["lead"]
+            elif entry["type"] == "submitted":
+                self.submitted.update(entry["files"])
+
+        if kept < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(kept)
+        elif data and not data.endswith(b"\n"):
+            # A complete entry that lost only its newline
+            with open(self.path, "ab") as f:
+                f.write(b"\n")
+
+    def _write(self, entry: dict):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def record_extracted(self, name: str, lead: Optional[dict]):
+        self.extracted[name] = lead
+        self._write({"type": "extracted", "file": name, "lead": lead})
+
+    def record_submitted(self, names: List[str]):
+        self.submitted.update(names)
+        self._write({"type": "submitted", "files": names})
+
+    def close(self):
+        self._file.close()
+
+
+def iter_transcript_files(directory: str) -> Iterator[str]:
+    """Yields transcript file names oldest first.
+
+    Only names are listed up front; each transcript is read when a worker
+    picks it up. Names start with the call's epoch seconds, so sorting them
+    orders calls chronologically.
+    """
+    names = sorted(
+        entry.name for entry in os.scandir(directory) if entry.is_file() and entry.name.endswith(".json")
+    )
+    yield from names
+
+
+def dedupe_leads(leads: Iterable[Tuple[str, dict]]) -> Dict[str, Tuple[List[str], dict]]:
+    """Merges leads sharing a phone number.
+
+    ``leads`` must be in call order: fields from later calls win, earlier
+    calls fill in whatever a later call did not capture.
+    """
+    merged: Dict[str, Tuple[List[str], dict]] = {}
+    for name, lead in leads:
+        phone = normalize_phone(lead.get("whatsapp"))
+        if not phone:
+            continue
+        files, current = merged.get(phone, ([], {}))
+        update = {key: value for key, value in lead.items() if value not in (None, "")}
+        merged[phone] = (files + [name], {**current, **update})
+    return merged
+
+
+def _load_transcript(path: str) -> list:
+    with open(path) as f:
+        return json.load(f)
+
+
+async def _extract_lead(name: str, transcript: list, client: openai.AsyncOpenAI) -> Optional[dict]:
+    lead_data = await extract_lead_data(transcript, Priority.BACKGROUND, client)
+    if not isinstance(lead_data, dict):
+        logger.warning(f"Extraction failed for {name}: LLM returned {type(lead_data).__name__}, not an object")
+        return None
+    if "error" in lead_data:
+        logger.warning(f"Extraction failed for {name}: {lead_data['error']}")
+        return None
+    lead = lead_data.get("data", lead_data)
+    if not isinstance(lead, dict):
+        logger.warning(f"Extraction failed for {name}: lead data is {type(lead).__name__}, not an object")
+        return None
+    return lead
+
+
+async def extract_all(directory: str, checkpoint: Checkpoint, concurrency: int) -> dict:
+    """Extracts leads from every transcript not yet in the checkpoint.
+
+    A bounded queue feeds ``concurrency`` workers, so memory stays flat
+    however many transcripts there are. The OpenAI rate limiter paces the
+    requests at background priority.
+    """
+    stats = {"skipped": 0, "extracted": 0, "failed": 0}
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    start = time.monotonic()
+
+    async def produce():
+        for name in iter_transcript_files(directory):
+            if name in checkpoint.extracted:
+                stats["skipped"] += 1
+                continue
+            await queue.put(name)
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def work():
+        while True:
+            name = await queue.get()
+            if name is None:
+                return
+            try:
+                transcript = await asyncio.to_thread(_load_transcript, os.path.join(directory, name))
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Skipping unreadable transcript {name}: {e}")
+                stats["failed"] += 1
+                continue
+
+            # One bad transcript or LLM answer must not abort the whole run
+            try:
+                if not any(isinstance(entry, dict) and entry.get("content") for entry in transcript):
+                    checkpoint.record_extracted(name, None)
+                else:
+                    lead = await _extract_lead(name, transcript, client)
+                    if lead is None:
+                        stats["failed"] += 1
+                        continue
+                    checkpoint.record_extracted(name, lead)
+            except Exception as e:
+                logger.exception(f"Extraction failed for {name}: {e}")
+                stats["failed"] += 1
+                continue
+
+            stats["extracted"] += 1
+            if stats["extracted"] % 100 == 0:
+                rate = stats["extracted"] / (time.monotonic() - start)
+                logger.info(f"Extracted {stats['extracted']} transcripts ({rate:.1f}/s)")
+
+    try:
+        await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+    finally:
+        await client.close()
+    return stats
+
+
+async def submit_leads(checkpoint: Checkpoint, dry_run_path: Optional[str]) -> dict:
+    """Dedupes extracted leads by phone number and upserts them in bulk.
+
+    Leads are matched on phone in Zoho too, so callers already pushed live
+    at the end of their call are updated, not duplicated. Transcripts
+    already submitted by an earlier run are left out. With
+    ``dry_run_path`` the Zoho records are written there as JSONL instead.
+    """
+    pending = [
+        (name, lead)
+        for name, lead in sorted(checkpoint.extracted.items())
+        if isinstance(lead, dict) and lead and name not in checkpoint.submitted
+    ]
+    merged = dedupe_leads(pending)
+    stats = {
+        "leads": len(pending),
+        "unique_phones": len(merged),
+        "invalid": 0,
+        "submitted": 0,
+        "rejected": 0,
+        "failed_batches": 0,
+    }
+
+    records: List[Tuple[List[str], str, dict]] = []
+    for phone, (files, lead) in merged.items():
+        try:
+            records.append((files, phone, build_zoho_lead_record(lead)))
+        except (KeyError, AttributeError) as e:
+            logger.warning(f"Lead for {phone} from {files[-1]} is missing field {e}")
+            stats["invalid"] += 1
+
+    if dry_run_path:
+        with open(dry_run_path, "w") as f:
+            for files, phone, record in records:
+                f.write(json.dumps({"phone": phone, "files": files, "record": record}, ensure_ascii=False) + "\n")
+        logger.info(f"Dry run: wrote {len(records)} leads to {dry_run_path}")
+        return stats
+
+    if not records:
+        return stats
+
+    access_token = await get_new_access_token()
+    for i in range(0, len(records), ZOHO_BULK_BATCH_SIZE):
+        batch = records[i:i + ZOHO_BULK_BATCH_SIZE]
+        try:
+            results = await send_leads_to_zoho([record for _, _, record in batch], access_token)
+        except Exception as e:
+            # Left unsubmitted in the checkpoint, so a rerun retries the batch
+            logger.error(f"Zoho batch of {len(batch)} leads failed: {getattr(e, 'detail', e)}")
+            stats["failed_batches"] += 1
+            continue
+        accepted = []
+        for (files, phone, _), result in zip(batch, results):
+            if result.get("status") == "success":
+                accepted.extend(files)
+                stats["submitted"] += 1
+            else:
+                logger.warning(f"Zoho rejected lead for {phone}: {result.get('message')}")
+                stats["rejected"] += 1
+        checkpoint.record_submitted(accepted)
+    return stats
+
+
+async def bulk_extract(directory: str, checkpoint_path: str, concurrency: int, dry_run_path: Optional[str]) -> dict:
+    start = time.monotonic()
+    checkpoint = Checkpoint(checkpoint_path)
+    try:
+        extraction = await extract_all(directory, checkpoint, concurrency)
+        submission = await submit_leads(checkpoint, dry_run_path)
+    finally:
+        checkpoint.close()
+    return {**extraction, **submission, "seconds": round(time.monotonic() - start, 1)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-run lead extraction over stored call transcripts")
+    parser.add_argument(
+        "--transcripts", default=TRANSCRIPTS_DIR, help=f"Transcript directory (default: {TRANSCRIPTS_DIR})"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default="bulk_extract.checkpoint.jsonl",
+        help="Progress file; rerun with the same file to resume, use a new one after changing the prompt",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=BULK_EXTRACT_CONCURRENCY,
+        help=f"Concurrent extractions (default: {BULK_EXTRACT_CONCURRENCY})",
+    )
+    parser.add_argument("--dry-run", metavar="OUTPUT", help="Write deduped Zoho records to this JSONL file instead of submitting")
+    args = parser.parse_args()
+
+    stats = asyncio.run(bulk_extract(args.transcripts, args.checkpoint, args.concurrency, args.dry_run))
+    print(json.dumps(stats))
@@ -1,19 +1,18 @@
-import logging
-import requests
+import re
+from typing import Optional
+
 import httpx
 from fastapi import HTTPException
 from dotenv import load_dotenv
 from config.env import ZOHO_CRM_CLIENT_ID, ZOHO_CRM_CLIENT_SECRET, ZOHO_CRM_REFRESH_TOKEN, ZOHO_API_URL, ZOHO_AUTH_URL
+from utils.logging import setup_logging
 
 load_dotenv()
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+logger = setup_logging()
 
 
-def get_new_access_token():
-    print("enter the get_new_access_token function")
+async def get_new_access_token():
     url = ZOHO_AUTH_URL
     data_1 = {
         "refresh_token": ZOHO_CRM_REFRESH_TOKEN,
@@ -22,8 +21,9 @@ def get_new_access_token():
         "grant_type": "refresh_token"
     }
 
-    logger.info(f"🔍 Token request payload: {data_1}")
-    response = requests.post(url, data=data_1)
+    logger.debug("🔍 Requesting Zoho access token")
+    async with httpx.AsyncClient(timeout=httpx.Timeout(15.0, connect=5.0)) as client:
+        response = await client.post(url, data=data_1)
 
     if response.status_code != 200:
         logger.error(f"❌ Token refresh failed: {response.text}")
@@ -44,51 +44,78 @@ def get_new_access_token():
     return access_token
 
 
+def normalize_phone(phone) -> Optional[str]:
+    digits = re.sub(r"\D", "", str(phone or ""))
+    # Compare on the last ten digits so "+91 98..." and "098..." match
+    return digits[-10:] if len(digits) > 10 else digits or None
+
+
+def build_zoho_lead_record(lead: dict) -> dict:
+    """Maps an extracted lead onto Zoho CRM Leads fields.
+
+    Phone is normalized the way ``dedupe_leads`` keys leads, since upserts
+    match existing leads on it.
+    """
+    return {
+        "First_Name": lead["name"].split(" ", 1)[0],
+        "Last_Name": lead["name"].split(" ", 1)[1] if len(lead["name"].split(" ", 1)) > 1 else ".",
+        "Company": "Aladdin Holidays",
+        "Email": lead["email"],
+        "Phone": normalize_phone(lead["whatsapp"]),
+        "Lead_Source": lead.get("source", "Website Form"),
+        "Tour_Type": lead["tour_type"],
+        "Location": lead["travel_location"],
+        "Travels_Date": lead["travel_date"],
+        "Days": str(lead["no_of_days"]),
+        "Persons": str(lead["no_of_persons"])
+    }
+
+
 async def send_lead_to_zoho(lead):
     logger.info(f"📥 Lead received for submission: {lead}")
-    print(f"lead\n", lead)
 
-    access_token = get_new_access_token()
+    access_token = await get_new_access_token()
     if not access_token:
         raise HTTPException(status_code=500, detail="Could not retrieve Zoho access token")
 
-    payload = {
-        "data": [
-            {
-                "First_Name": lead["name"].split(" ", 1)[0],
-                "Last_Name": lead["name"].split(" ", 1)[1] if len(lead["name"].split(" ", 1)) > 1 else ".",
-                "Company": "Aladdin Holidays",
-                "Email": lead["email"],
-                "Phone": lead["whatsapp"],
-                "Lead_Source": lead.get("source", "Website Form"),
-                "Tour_Type": lead["tour_type"],
-                "Location": lead["travel_location"],
-                "Travels_Date": lead["travel_date"],
-                "Days": str(lead["no_of_days"]),
-                "Persons": str(lead["no_of_persons"])
-            }
-        ]
-    }
+    payload = {"data": [build_zoho_lead_record(lead)]}
+
+    logger.info(f"📤 Sending lead to Zoho CRM: {payload}")
+    return await _post_to_zoho(access_token, payload)
 
-    zoho_api_url = ZOHO_API_URL
-    if not zoho_api_url:
+
+async def send_leads_to_zoho(records: list, access_token: str = None) -> list:
+    """Upserts up to 100 already-built lead records in one call.
+
+    Records are matched on Phone, so a lead that send_lead_to_zoho already
+    created during the call is updated rather than duplicated. Zoho reports
+    a status per record; the per-record results are returned in input order.
+    """
+    if len(records) > 100:
+        raise ValueError("Zoho accepts at most 100 records per upsert")
+    access_token = access_token or await get_new_access_token()
+    logger.info(f"📤 Upserting {len(records)} leads to Zoho CRM")
+    payload = {"data": records, "duplicate_check_fields": ["Phone"]}
+    response_data = await _post_to_zoho(access_token, payload, path="/upsert")
+    return response_data.get("data", [])
+
+
+async def _post_to_zoho(access_token: str, payload: dict, path: str = "") -> dict:
+    if not ZOHO_API_URL:
         raise HTTPException(status_code=500, detail="ZOHO_API_URL not configured")
+    zoho_api_url = ZOHO_API_URL.rstrip("/") + path if path else ZOHO_API_URL
 
     headers = {
         "Authorization": f"Zoho-oauthtoken {access_token}",
         "Content-Type": "application/json"
     }
 
-    logger.info(f"📤 Sending lead to Zoho CRM: {payload}")
-    print(f"📤 Sending lead to Zoho CRM: {payload}")
-
     try:
         async with httpx.AsyncClient(timeout=httpx.Timeout(15.0, connect=5.0)) as client:
             response = await client.post(zoho_api_url, headers=headers, json=payload)
             response.raise_for_status()
             response_data = response.json()
             logger.info(f"✅ Zoho CRM Response: {response_data}")
-            print(f"✅ Zoho CRM Response: {response_data}")
             return response_data
     except httpx.HTTPStatusError as e:
         logger.error(f"❌ Zoho API error: {e.response.text} (Status {e.response.status_code})")
@@ -98,4 +125,4 @@ async def send_lead_to_zoho(lead):
         )
     except Exception as e:
         logger.error(f"❌ Failed to send lead to Zoho CRM: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,17 +1,39 @@
 import os
+from typing import Optional
 from utils.constants import zoho_prompt
 import openai
 import json
-import asyncio
 from services.zoho.zoho import send_lead_to_zoho
+from utils.logging import setup_logging
+from utils.rate_limiter import Priority, get_rate_limiter
 
+logger = setup_logging()
 
-def get_lead_data_with_llm(full_transcript: list) -> dict:
+_client: Optional[openai.AsyncOpenAI] = None
+
+
+def _get_client(api_key: str) -> openai.AsyncOpenAI:
+    # One client, and so one connection pool, for every extraction in the process
+    global _client
+    if _client is None or _client.api_key != api_key:
+        _client = openai.AsyncOpenAI(api_key=api_key)
+    return _client
+
+
+async def extract_lead_data(
+    full_transcript: list,
+    priority: Priority = Priority.BACKGROUND,
+    client: Optional[openai.AsyncOpenAI] = None,
+) -> dict:
+    """Runs the lead extraction prompt over a transcript without submitting it.
+
+    Returns the parsed LLM output, or a dict with an "error" key.
+    """
     try:
         # Set OpenAI API key from environment variables
-        openai.api_key = os.getenv("OPENAI_API_KEY")
-        if not openai.api_key:
-            print("❌ OpenAI API key is missing")
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            logger.error("❌ OpenAI API key is missing")
             return {"error": "OpenAI API key not found"}
 
         # Convert transcript to a string format
@@ -22,12 +44,15 @@ def get_lead_data_with_llm(full_transcript: list) -> dict:
         )
 
         if not transcript_text or not isinstance(transcript_text, str):
-            print("❌ Transcript text is empty or not a string")
+            logger.warning("❌ Transcript text is empty or not a string")
             return {"error": "Invalid transcript input"}
 
-        # Call OpenAI API
+        # Call OpenAI API. Lead extraction runs after the call, so it queues
+        # behind in-call requests sharing the same key.
         try:
-            response = openai.chat.completions.create(
+            await get_rate_limiter("openai", api_key).acquire(priority)
+            client = client or _get_client(api_key)
+            response = await client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": zoho_prompt},
@@ -35,39 +60,43 @@ def get_lead_data_with_llm(full_transcript: list) -> dict:
                 ]
             )
         except Exception as e:
-            print("❌ OpenAI API call failed:", e)
+            logger.error(f"❌ OpenAI API call failed: {e}")
             return {"error": f"OpenAI API error: {str(e)}"}
 
         if not response or not response.choices:
-            print("❌ Empty response from OpenAI")
+            logger.error("❌ Empty response from OpenAI")
             return {"error": "Empty response from LLM"}
 
         lead_result = response.choices[0].message.content
 
         if not lead_result:
-            print("❌ LLM response content is None")
+            logger.error("❌ LLM response content is None")
             return {"error": "No content returned from LLM"}
 
         # Parse JSON response
         try:
-            lead_data = json.loads(lead_result)
+            return json.loads(lead_result)
         except json.JSONDecodeError as e:
-            print("❌ JSON parsing error:", e)
-            print("Raw LLM output:")
-            print(lead_result)
+            logger.error(f"❌ JSON parsing error: {e}\nRaw LLM output:\n{lead_result}")
             return {"error": "Invalid JSON returned from LLM"}
 
-        # Extract payload (supports both {"data": {...}} and direct object)
-        lead_payload = lead_data.get("data", lead_data)
+    except Exception as e:
+        logger.exception(f"❌ Unexpected exception during processing: {e}")
+        return {"error": str(e)}
 
-        # Send to Zoho asynchronously
-        try:
-            asyncio.run(send_lead_to_zoho(lead_payload))
-        except Exception as e:
-            print("❌ Failed to send lead to Zoho:", e)
 
+async def get_lead_data_with_llm(full_transcript: list, priority: Priority = Priority.BACKGROUND) -> dict:
+    lead_data = await extract_lead_data(full_transcript, priority)
+    if "error" in lead_data:
         return lead_data
 
+    # Extract payload (supports both {"data": {...}} and direct object)
+    lead_payload = lead_data.get("data", lead_data)
+
+    # Send to Zoho asynchronously
+    try:
+        await send_lead_to_zoho(lead_payload)
     except Exception as e:
-        print("❌ Unexpected exception during processing:", e)
-        return {"error": str(e)}
\ No newline at end of file
+        logger.error(f"❌ Failed to send lead to Zoho: {e}")
+
+    return lead_data
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+from pipecat.transports.network.small_webrtc import SmallWebRTCTransport
+from pipecat.transports.network.webrtc_connection import SmallWebRTCConnection
+
+import services.bot_service as bot_service
+from services.bot_service import BotService
+from services.sarvam.translation import SourceTextProcessor
+from services.webrtc_service import create_transport_params
+
+
+@pytest.fixture(autouse=True)
+def api_keys(monkeypatch):
+    for name in ("OPENAI_API_KEY", "SARVAM_API_KEY", "CARTESIA_API_KEY", "GLADIA_API_KEY",
+                 "TOGETHER_API_KEY", "GROQ_API_KEY"):
+        monkeypatch.setattr(bot_service, name, "test-key")
+    monkeypatch.setattr(bot_service, "RECORD_SESSIONS", False)
+
+
+def create_bot(language: str) -> BotService:
+    # The pipeline runner binds to the running loop, as it does under /api/offer
+    async def create():
+        transport = SmallWebRTCTransport(
+            webrtc_connection=SmallWebRTCConnection(),
+            params=create_transport_params(language),
+        )
+        return BotService(transport, language)
+
+    return asyncio.run(create())
+
+
+def test_default_profile_builds():
+    bot = create_bot("en")
+    assert bot.translation is None
+    assert bot.tts._aggregate_sentences
+    assert bot.tts._push_text_frames is False  # Cartesia pushes its own word timestamps
+    assert not any(isinstance(p, SourceTextProcessor) for p in bot.pipeline._processors)
+
+
+def test_translated_profile_feeds_source_text_to_aggregators():
+    bot = create_bot("ta-en")
+    assert bot.translation is not None
+    assert not bot.tts._aggregate_sentences
+    assert not bot.tts._push_text_frames
+    processors = bot.pipeline._processors
+    assert processors[processors.index(bot.tts) + 1] is bot.translation.source_text()
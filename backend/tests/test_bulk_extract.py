@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+from services.zoho.bulk_extract import Checkpoint, dedupe_leads, submit_leads
+from services.zoho.zoho import build_zoho_lead_record
+
+LEAD = {
+    "name": "Asha Kumar",
+    "email": "asha@example.com",
+    "whatsapp": "+91 98765 43210",
+    "tour_type": "Domestic",
+    "travel_location": "Goa",
+    "travel_date": "2026-12-20",
+    "no_of_days": 4,
+    "no_of_persons": 2,
+}
+
+
+def test_checkpoint_resumes_what_was_recorded(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    checkpoint = Checkpoint(path)
+    checkpoint.record_extracted("1_a.json", LEAD)
+    checkpoint.record_extracted("2_b.json", None)
+    checkpoint.record_submitted(["1_a.json"])
+    checkpoint.close()
+
+    resumed = Checkpoint(path)
+    resumed.close()
+    assert resumed.extracted == {"1_a.json": LEAD, "2_b.json": None}
+    assert resumed.submitted == {"1_a.json"}
+
+
+def test_checkpoint_drops_a_partial_last_line(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    checkpoint = Checkpoint(str(path))
+    checkpoint.record_extracted("1_a.json", LEAD)
+    checkpoint.close()
+    # A crash in the middle of the next write
+    with open(path, "a") as f:
+        f.write('{"type": "extracted", "file": "2_b.json", "le')
+
+    resumed = Checkpoint(str(path))
+    resumed.record_extracted("3_c.json", None)
+    resumed.close()
+    assert set(resumed.extracted) == {"1_a.json", "3_c.json"}
+
+    again = Checkpoint(str(path))
+    again.close()
+    assert set(again.extracted) == {"1_a.json", "3_c.json"}
+    assert all(json.loads(line) for line in path.read_text().splitlines())
+
+
+def test_checkpoint_skips_an_unreadable_line_in_the_middle(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    path.write_text(
+        json.dumps({"type": "extracted", "file": "1_a.json", "lead": None}) + "\n"
+        + "garbage\n"
+        + json.dumps({"type": "submitted", "files": ["1_a.json"]}) + "\n"
+    )
+    checkpoint = Checkpoint(str(path))
+    checkpoint.close()
+    assert checkpoint.extracted == {"1_a.json": None}
+    assert checkpoint.submitted == {"1_a.json"}
+
+
+def test_dedupe_merges_leads_by_phone_later_calls_winning():
+    merged = dedupe_leads([
+        ("1_a.json", {**LEAD, "travel_location": "Goa"}),
+        ("2_b.json", {"whatsapp": "098765 43210", "travel_location": "Kerala", "email": ""}),
+        ("3_c.json", {**LEAD, "whatsapp": "91234 56789"}),
+        ("4_d.json", {**LEAD, "whatsapp": None}),
+    ])
+    assert set(merged) == {"9876543210", "9123456789"}
+    files, lead = merged["9876543210"]
+    assert files == ["1_a.json", "2_b.json"]
+    assert lead["travel_location"] == "Kerala"
+    assert lead["email"] == "asha@example.com"
+
+
+def test_zoho_records_carry_the_phone_leads_are_deduped_on():
+    assert build_zoho_lead_record(LEAD)["Phone"] == "9876543210"
+
+
+def test_dry_run_submits_one_record_per_phone(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.jsonl"))
+    checkpoint.record_extracted("1_a.json", LEAD)
+    checkpoint.record_extracted("2_b.json", {**LEAD, "whatsapp": "09876543210", "no_of_days": 6})
+    checkpoint.record_extracted("3_c.json", None)
+    output = tmp_path / "records.jsonl"
+    stats = asyncio.run(submit_leads(checkpoint, str(output)))
+    checkpoint.close()
+
+    assert stats["leads"] == 2
+    assert stats["unique_phones"] == 1
+    [line] = output.read_text().splitlines()
+    entry = json.loads(line)
+    assert entry["files"] == ["1_a.json", "2_b.json"]
+    assert entry["record"]["Phone"] == entry["phone"] == "9876543210"
+    assert entry["record"]["Days"] == "6"
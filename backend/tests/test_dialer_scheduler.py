@@ -0,0 +1,76 @@
+import asyncio
+
+from services.dialer.call_list import CallTarget
+from services.dialer.pool import SessionPool
+from services.dialer.scheduler import CallingHours, CampaignDialer, DialerClock
+from services.dialer.telephony import SimulatedTelephonyClient
+from utils.rate_limiter import TokenBucket
+
+
+class RecordingPool(SessionPool):
+    def __init__(self, capacity: int):
+        super().__init__(capacity, {}, load_vad=False)
+        self.peak = 0
+        self.released = []
+
+    def acquire(self, language):
+        session = super().acquire(language)
+        self.peak = max(self.peak, self.in_use)
+        return session
+
+    def release(self, session, reusable=True):
+        self.released.append(session)
+        super().release(session, reusable)
+
+
+def create_dialer(leads, pool, clock, client, limiter=None, **kwargs) -> CampaignDialer:
+    return CampaignDialer(
+        [CallTarget(phone=f"+91900000{i:04d}") for i in range(leads)],
+        client,
+        pool,
+        clock=clock,
+        calling_hours=CallingHours(hours=(0, 24), days=range(7)),
+        dial_limiter=limiter,
+        max_attempts=1,
+        tick=0.5,
+        **kwargs,
+    )
+
+
+def test_campaigns_sharing_a_pool_never_overbook_it():
+    async def run():
+        clock = DialerClock(speed=60)
+        # Every call is answered and holds its slot for a while
+        client = SimulatedTelephonyClient(
+            clock, answer_rate=1.0, busy_rate=0.0, fail_rate=0.0, ring_time=(2.0, 4.0), talk_median=10.0, seed=1
+        )
+        pool = RecordingPool(3)
+        # A slow limiter makes each campaign wait between choosing a lead
+        # and dialing it, while the other one takes the free slots.
+        limiter = TokenBucket("test", 20, 1)
+        dialers = [create_dialer(6, pool, clock, client, limiter) for _ in range(2)]
+        return pool, await asyncio.gather(*(dialer.run() for dialer in dialers))
+
+    pool, reports = asyncio.run(run())
+    assert [report["dials"] for report in reports] == [6, 6]
+    assert pool.peak <= 3
+    assert pool.in_use == 0
+    assert None not in pool.released
+
+
+def test_pacing_counts_slots_held_by_other_campaigns():
+    async def run():
+        clock = DialerClock()
+        client = SimulatedTelephonyClient(clock, seed=1)
+        pool = RecordingPool(10)
+        dialer = create_dialer(10, pool, clock, client, target_utilization=0.8)
+        dialer._outcomes["en"]["answered"] = 98  # connect rate 0.99
+        alone = dialer._dials_wanted()
+        # Another campaign is talking on six of the ten slots
+        for _ in range(6):
+            pool.acquire("en")
+        return alone, dialer._dials_wanted()
+
+    alone, shared = asyncio.run(run())
+    assert alone == 9
+    assert shared == 3
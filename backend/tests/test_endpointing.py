@@ -0,0 +1,109 @@
+import asyncio
+
+from pipecat.frames.frames import TranscriptionFrame, UserStartedSpeakingFrame, UserStoppedSpeakingFrame
+from pipecat.tests.utils import SleepFrame, run_test
+
+from services.endpointing import EndOfTurnController, is_complete_clause
+
+Started, Stopped = UserStartedSpeakingFrame, UserStoppedSpeakingFrame
+
+
+def controller(**kwargs) -> EndOfTurnController:
+    options = dict(language="en", vad_stop_secs=0.2, initial_hold=0.3, use_interim_text=False)
+    options.update(kwargs)
+    return EndOfTurnController(**options)
+
+
+def transcription(text: str) -> TranscriptionFrame:
+    return TranscriptionFrame(text, "caller", "")
+
+
+def test_is_complete_clause():
+    assert is_complete_clause("I want to go to", "en") is False
+    assert is_complete_clause("Goa, Kerala,", "en") is False
+    assert is_complete_clause("Goa please.", "en") is True
+    assert is_complete_clause("hmm", "en") is None
+    assert is_complete_clause("சரி, ஆனா", "ta") is False
+
+
+def test_pause_within_the_hold_stays_in_the_turn():
+    async def run():
+        eot = controller()
+        await run_test(
+            eot,
+            frames_to_send=[Started(), Stopped(), SleepFrame(0.1), Started(), Stopped(), SleepFrame(0.5)],
+            expected_down_frames=[Started, Stopped],
+        )
+        return eot
+
+    eot = asyncio.run(run())
+    assert len(eot._pauses) == 1
+    assert 0.05 < eot._pauses[0] < 0.3
+
+
+def test_pause_past_the_hold_ends_the_turn():
+    async def run():
+        await run_test(
+            controller(false_cutoff_window=0.1),
+            frames_to_send=[Started(), Stopped(), SleepFrame(0.5), Started(), Stopped(), SleepFrame(0.5)],
+            expected_down_frames=[Started, Stopped, Started, Stopped],
+        )
+
+    asyncio.run(run())
+
+
+def test_false_cutoff_is_recorded_with_its_full_pause():
+    async def run():
+        eot = controller(false_cutoff_window=1.0)
+        await run_test(
+            eot,
+            frames_to_send=[Started(), Stopped(), SleepFrame(0.45), Started(), Stopped(), SleepFrame(0.5)],
+            expected_down_frames=[Started, Stopped, Started, Stopped],
+        )
+        return eot
+
+    eot = asyncio.run(run())
+    # Hold plus the time after release: the caller's whole pause
+    assert len(eot._pauses) == 1
+    assert 0.4 < eot._pauses[0] < 0.6
+
+
+def test_hold_adapts_to_the_caller_pauses_within_bounds():
+    eot = controller(min_samples=3, adapt_percentile=0.9, margin=0.1, min_hold=0.2, max_hold=1.0)
+    assert eot.hold == 0.3
+    eot._pauses.extend([0.4, 0.5, 0.6])
+    assert 0.6 < eot.hold <= 0.7
+    eot._pauses.extend([2.0] * 10)
+    assert eot.hold == 1.0
+    eot._pauses.clear()
+    eot._pauses.extend([0.01] * 5)
+    assert eot.hold == 0.2
+
+
+def test_complete_sentence_shortens_the_hold():
+    async def run():
+        # Released after half the 0.4s hold, so resuming at 0.3s is a new turn
+        await run_test(
+            controller(initial_hold=0.4, use_interim_text=True, false_cutoff_window=0.0),
+            frames_to_send=[
+                Started(), transcription("Goa please."), Stopped(), SleepFrame(0.3), Started(), Stopped(), SleepFrame(0.6)
+            ],
+            expected_down_frames=[Started, TranscriptionFrame, Stopped, Started, Stopped],
+        )
+
+    asyncio.run(run())
+
+
+def test_trailing_connective_extends_the_hold():
+    async def run():
+        # Held for 0.4s + 0.4s, so resuming at 0.6s is still the same turn
+        await run_test(
+            controller(initial_hold=0.4, use_interim_text=True),
+            frames_to_send=[
+                Started(), transcription("I want to go to"), Stopped(), SleepFrame(0.6), Started(), Stopped(),
+                SleepFrame(1.0)
+            ],
+            expected_down_frames=[Started, TranscriptionFrame, Stopped],
+        )
+
+    asyncio.run(run())
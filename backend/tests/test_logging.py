@@ -0,0 +1,63 @@
+import io
+import time
+
+from loguru import logger
+
+from utils.logging import QueueSink, log_sampled
+
+
+def capture():
+    records = []
+    handler_id = logger.add(lambda message: records.append(message.record), level="INFO", format="{message}")
+    return records, handler_id
+
+
+def test_log_sampled_limits_each_call_site_and_reports_suppressed_records():
+    records, handler_id = capture()
+    try:
+        for i in range(10):
+            log_sampled("INFO", "frame {}", i, rate=0.001, burst=3)
+        for i in range(2):
+            log_sampled("INFO", "other site {}", i, rate=0.001, burst=3)
+    finally:
+        logger.remove(handler_id)
+
+    assert [record["message"] for record in records] == [
+        "frame 0", "frame 1", "frame 2", "other site 0", "other site 1"
+    ]
+
+
+def test_log_sampled_reports_suppressed_count_on_next_record():
+    records, handler_id = capture()
+    try:
+        for i in range(4):
+            if i == 3:
+                time.sleep(0.1)
+            log_sampled("INFO", "tick {}", i, rate=20.0, burst=1)
+    finally:
+        logger.remove(handler_id)
+
+    assert [record["message"] for record in records] == ["tick 0", "tick 3"]
+    assert records[1]["extra"]["suppressed"] == 2
+
+
+def test_log_sampled_skips_levels_below_the_module_level():
+    records, handler_id = capture()
+    try:
+        log_sampled("DEBUG", "not wanted")
+    finally:
+        logger.remove(handler_id)
+    assert records == []
+
+
+class BrokenStream(io.StringIO):
+    def write(self, text):
+        raise OSError("disk full")
+
+
+def test_sink_write_failure_is_reported_once(capfd):
+    sink = QueueSink(stream=BrokenStream())
+    sink._flush(["a"])
+    sink._flush(["b"])
+    sink.close()
+    assert capfd.readouterr().err.count("Log sink write failed") == 1
@@ -0,0 +1,131 @@
+import asyncio
+import time
+
+from pipecat.frames.frames import (
+    StartInterruptionFrame,
+    TTSAudioRawFrame,
+    TTSSpeakFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.processors.frame_processor import FrameProcessor
+from pipecat.tests.utils import SleepFrame, run_test
+
+from services.output_pacer import OutputPacer, audio_duration
+from services.routing.stubs import StubTTSService
+
+SAMPLE_RATE = 16000
+
+
+def audio(seconds: float) -> TTSAudioRawFrame:
+    return TTSAudioRawFrame(audio=b"\x00" * int(SAMPLE_RATE * seconds) * 2, sample_rate=SAMPLE_RATE, num_channels=1)
+
+
+class Timestamps(FrameProcessor):
+    """Records when each audio frame leaves the pacer."""
+
+    def __init__(self):
+        super().__init__()
+        self.times = []
+
+    async def process_frame(self, frame, direction):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, TTSAudioRawFrame):
+            self.times.append(time.monotonic())
+        await self.push_frame(frame, direction)
+
+
+def test_audio_duration():
+    assert audio_duration(audio(0.02)) == 0.02
+
+
+def test_audio_is_released_at_playout_speed_after_the_lookahead():
+    async def run():
+        pacer = OutputPacer(language="en", lookahead=0.1, max_buffer=5.0)
+        timestamps = Timestamps()
+        start = time.monotonic()
+        await run_test(
+            Pipeline([pacer, timestamps]),
+            frames_to_send=[TTSStartedFrame()] + [audio(0.05) for _ in range(10)] + [TTSStoppedFrame(), SleepFrame(0.6)],
+            expected_down_frames=[TTSStartedFrame] + [TTSAudioRawFrame] * 10 + [TTSStoppedFrame],
+        )
+        return pacer, [t - start for t in timestamps.times]
+
+    pacer, times = asyncio.run(run())
+    # 0.5s of audio: the first 0.1s goes out at once, the rest in real time
+    assert times[2] - times[0] < 0.05
+    assert 0.3 < times[-1] - times[0] < 0.5
+    assert pacer._underruns == 0
+
+
+def test_gap_in_the_middle_of_an_utterance_is_an_underrun():
+    async def run():
+        pacer = OutputPacer(language="en", lookahead=0.05, max_buffer=5.0)
+        await run_test(
+            pacer,
+            frames_to_send=[TTSStartedFrame(), audio(0.05), audio(0.05), SleepFrame(0.3), audio(0.05), TTSStoppedFrame()],
+            expected_down_frames=[TTSStartedFrame] + [TTSAudioRawFrame] * 3 + [TTSStoppedFrame],
+        )
+        return pacer
+
+    pacer = asyncio.run(run())
+    assert pacer._underruns == 1
+    assert 0.1 < pacer._underrun_seconds < 0.3
+
+
+def test_gap_between_utterances_is_not_an_underrun():
+    async def run():
+        pacer = OutputPacer(language="en", lookahead=0.05, max_buffer=5.0)
+        await run_test(
+            pacer,
+            frames_to_send=[
+                TTSStartedFrame(), audio(0.05), TTSStoppedFrame(), SleepFrame(0.3),
+                TTSStartedFrame(), audio(0.05), TTSStoppedFrame(),
+            ],
+            expected_down_frames=[TTSStartedFrame, TTSAudioRawFrame, TTSStoppedFrame] * 2,
+        )
+        return pacer
+
+    assert asyncio.run(run())._underruns == 0
+
+
+def test_producer_waits_for_buffer_space():
+    async def run():
+        pacer = OutputPacer(language="en", lookahead=0.1, max_buffer=0.2)
+        # 0.6s of audio from a producer that honours backpressure
+        tts = StubTTSService(latency=0.0, seconds_per_char=0.03, sample_rate=SAMPLE_RATE)
+        tts.set_output_pacer(pacer)
+        timestamps = Timestamps()
+        await run_test(
+            Pipeline([tts, pacer, timestamps]),
+            frames_to_send=[TTSSpeakFrame("x" * 20), SleepFrame(0.8)],
+        )
+        return pacer, timestamps.times
+
+    pacer, times = asyncio.run(run())
+    assert len(times) == 30
+    # The producer could only get max_buffer ahead, so it waited for most of the audio
+    assert pacer._backpressure_seconds > 0.2
+    assert pacer._max_depth <= 0.1 + 0.2 + 0.02 + 0.01
+    assert pacer._queued == 0
+
+
+def test_interruption_drops_buffered_audio_and_wakes_the_producer():
+    async def run():
+        pacer = OutputPacer(language="en", lookahead=0.1, max_buffer=0.2)
+        # 2s of audio, interrupted after about 0.2s
+        tts = StubTTSService(latency=0.0, seconds_per_char=0.1, sample_rate=SAMPLE_RATE)
+        tts.set_output_pacer(pacer)
+        timestamps = Timestamps()
+        await run_test(
+            Pipeline([tts, pacer, timestamps]),
+            frames_to_send=[TTSSpeakFrame("x" * 20), SleepFrame(0.2), StartInterruptionFrame(), SleepFrame(0.3)],
+        )
+        return pacer, timestamps.times
+
+    pacer, times = asyncio.run(run())
+    assert len(times) < 30
+    assert pacer._discarded_seconds > 0
+    assert pacer._queued == 0
+    assert pacer._credit == 0
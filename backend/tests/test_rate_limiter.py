@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from utils.rate_limiter import Priority, TokenBucket
+
+
+async def acquired_now(bucket: TokenBucket, priority: Priority) -> bool:
+    try:
+        await asyncio.wait_for(bucket.acquire(priority), 0.02)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def test_background_requests_leave_the_reserve_to_realtime():
+    async def run():
+        bucket = TokenBucket("test", rate=0.1, burst=4, realtime_reserve=0.5)
+        background = [await acquired_now(bucket, Priority.BACKGROUND) for _ in range(3)]
+        realtime = [await acquired_now(bucket, Priority.REALTIME) for _ in range(3)]
+        return background, realtime
+
+    background, realtime = asyncio.run(run())
+    # Two of four tokens are held back from background requests
+    assert background == [True, True, False]
+    assert realtime == [True, True, False]
+
+
+def test_realtime_waiters_are_served_before_earlier_background_ones():
+    async def run():
+        bucket = TokenBucket("test", rate=50.0, burst=1, realtime_reserve=0)
+        await bucket.acquire()
+        order = []
+
+        async def request(name, priority):
+            await bucket.acquire(priority)
+            order.append(name)
+
+        background = [asyncio.create_task(request(f"bg{i}", Priority.BACKGROUND)) for i in range(3)]
+        await asyncio.sleep(0)
+        realtime = asyncio.create_task(request("rt", Priority.REALTIME))
+        await asyncio.gather(*background, realtime)
+        return order
+
+    assert asyncio.run(run()) == ["rt", "bg0", "bg1", "bg2"]
+
+
+def test_realtime_arriving_while_background_waits_on_the_reserve_is_not_delayed():
+    async def run():
+        bucket = TokenBucket("test", rate=2.0, burst=4, realtime_reserve=0.5)
+        for _ in range(2):
+            await bucket.acquire(Priority.BACKGROUND)
+        # Waits until three tokens are back, about half a second
+        background = asyncio.create_task(bucket.acquire(Priority.BACKGROUND))
+        await asyncio.sleep(0.01)
+        realtime = await acquired_now(bucket, Priority.REALTIME)
+        background.cancel()
+        return realtime
+
+    assert asyncio.run(run())
+
+
+def test_cancelled_waiters_do_not_take_tokens():
+    async def run():
+        bucket = TokenBucket("test", rate=20.0, burst=1, realtime_reserve=0)
+        await bucket.acquire()
+        cancelled = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await bucket.acquire()
+        return bucket._tokens
+
+    assert asyncio.run(run()) < 1
+
+
+def test_bucket_keeps_working_on_a_new_event_loop():
+    bucket = TokenBucket("test", rate=20.0, burst=1, realtime_reserve=0)
+    first = asyncio.new_event_loop()
+    first.run_until_complete(bucket.acquire())
+    # Leaves a waiter and its drain task behind on the first loop
+    with pytest.raises(asyncio.TimeoutError):
+        first.run_until_complete(asyncio.wait_for(bucket.acquire(), 0.01))
+    first.close()
+
+    async def run():
+        await asyncio.wait_for(bucket.acquire(), 1.0)
+
+    asyncio.run(run())
@@ -0,0 +1,208 @@
+import asyncio
+import itertools
+import time
+
+import pytest
+from pipecat.frames.frames import ErrorFrame, TranscriptionFrame
+
+from services.routing.router import ProviderRouter, ProviderUnavailableError
+from services.routing.stubs import StubSTTService
+
+# Provider health is shared process-wide per kind; give each router its own
+_kinds = itertools.count()
+
+
+def create_router(names, **kwargs) -> ProviderRouter:
+    options = dict(min_hedge_delay=0.05, max_hedge_delay=0.05, failure_threshold=2, cooldown=0.2)
+    options.update(kwargs)
+    return ProviderRouter(
+        f"test_{next(_kinds)}",
+        names,
+        is_error=lambda frame: isinstance(frame, ErrorFrame),
+        **options,
+    )
+
+
+class Providers(dict):
+    """Stub STT providers by name, counting the calls each one gets."""
+
+    def __init__(self, **stubs):
+        super().__init__()
+        self.calls = {name: 0 for name in stubs}
+        for name, stub in stubs.items():
+            self[name] = self._call(name, stub)
+
+    def _call(self, name, stub):
+        def call():
+            self.calls[name] += 1
+            return stub.run_stt(b"")
+
+        return call
+
+
+def stub(transcript: str, latency: float = 0.01, failure_rate: float = 0.0) -> StubSTTService:
+    return StubSTTService(transcript=transcript, latency=latency, failure_rate=failure_rate)
+
+
+async def transcribe(router: ProviderRouter, providers: Providers) -> str:
+    frames = [frame async for frame in router.stream(providers)]
+    assert len(frames) == 1
+    return frames[0].text if isinstance(frames[0], TranscriptionFrame) else frames[0]
+
+
+def test_fails_over_to_the_next_provider():
+    async def run():
+        router = create_router(["a", "b"], hedge=False)
+        providers = Providers(a=stub("from a", failure_rate=1.0), b=stub("from b"))
+        return router, providers, await transcribe(router, providers)
+
+    router, providers, text = asyncio.run(run())
+    assert text == "from b"
+    assert providers.calls == {"a": 1, "b": 1}
+    assert router.health("a").error_rate == 1.0
+    assert router.health("b").error_rate == 0.0
+
+
+def test_error_frame_is_returned_when_every_provider_fails():
+    async def run():
+        router = create_router(["a", "b"], hedge=False)
+        providers = Providers(a=stub("a", failure_rate=1.0), b=stub("b", failure_rate=1.0))
+        return await transcribe(router, providers)
+
+    assert isinstance(asyncio.run(run()), ErrorFrame)
+
+
+def test_raises_when_every_provider_raises():
+    async def broken():
+        raise ConnectionError("down")
+        yield
+
+    async def run():
+        router = create_router(["a"], hedge=False)
+        async for _ in router.stream({"a": broken}):
+            pass
+
+    with pytest.raises(ProviderUnavailableError):
+        asyncio.run(run())
+
+
+def test_slow_primary_is_hedged_and_the_loss_is_recorded():
+    async def run():
+        router = create_router(["a", "b"], failure_threshold=5)
+        providers = Providers(a=stub("from a", latency=0.5), b=stub("from b"))
+        start = time.monotonic()
+        text = await transcribe(router, providers)
+        return router, providers, text, time.monotonic() - start
+
+    router, providers, text, elapsed = asyncio.run(run())
+    assert text == "from b"
+    assert providers.calls == {"a": 1, "b": 1}
+    # Hedged at 0.05s instead of waiting out the primary's 0.5s
+    assert elapsed < 0.3
+    primary = router.health("a")
+    assert primary.samples == 1
+    assert 0.05 <= primary.p95 < 0.3
+    assert primary.error_rate == 0.0
+    assert primary.state == "closed"
+
+
+def test_primary_that_keeps_losing_hedges_trips_its_breaker():
+    async def run():
+        router = create_router(["a", "b"])
+        providers = Providers(a=stub("from a", latency=0.5), b=stub("from b"))
+        texts = [await transcribe(router, providers) for _ in range(3)]
+        return router, providers, texts
+
+    router, providers, texts = asyncio.run(run())
+    assert texts == ["from b"] * 3
+    # Two losses open the breaker, so the third request skips the primary
+    assert providers.calls == {"a": 2, "b": 3}
+    assert router.health("a").state == "open"
+
+
+def test_breaker_opens_half_opens_and_closes():
+    async def run():
+        router = create_router(["a", "b"], hedge=False)
+        primary = stub("from a", failure_rate=1.0)
+        providers = Providers(a=primary, b=stub("from b"))
+        health = router.health("a")
+
+        for _ in range(2):
+            assert await transcribe(router, providers) == "from b"
+        assert health.state == "open"
+        assert await transcribe(router, providers) == "from b"
+        assert providers.calls["a"] == 2
+
+        # After the cooldown a failed trial opens the breaker again
+        await asyncio.sleep(0.25)
+        assert health.state == "half_open"
+        assert await transcribe(router, providers) == "from b"
+        assert providers.calls["a"] == 3
+        assert health.state == "open"
+
+        # And a successful one closes it
+        await asyncio.sleep(0.25)
+        primary._behaviour._failure_rate = 0.0
+        assert await transcribe(router, providers) == "from a"
+        assert health.state == "closed"
+        assert providers.calls["a"] == 4
+
+    asyncio.run(run())
+
+
+def test_every_breaker_open_still_tries_the_primary():
+    async def run():
+        router = create_router(["a", "b"], hedge=False)
+        providers = Providers(a=stub("a", failure_rate=1.0), b=stub("b", failure_rate=1.0))
+        for _ in range(2):
+            await transcribe(router, providers)
+        assert router.health("a").state == "open"
+        assert router.health("b").state == "open"
+        await transcribe(router, providers)
+        return providers.calls
+
+    assert asyncio.run(run())["a"] == 3
+
+
+def test_routed_tts_hedges_through_the_task_manager():
+    from pipecat.frames.frames import EndFrame, TTSAudioRawFrame, TTSSpeakFrame
+    from pipecat.pipeline.pipeline import Pipeline
+    from pipecat.pipeline.runner import PipelineRunner
+    from pipecat.pipeline.task import PipelineTask
+    from pipecat.processors.frame_processor import FrameProcessor
+
+    from services.routing.stubs import StubTTSService
+    from services.routing.tts import RoutedTTSService
+
+    class Sink(FrameProcessor):
+        def __init__(self):
+            super().__init__()
+            self.audio = 0
+
+        async def process_frame(self, frame, direction):
+            await super().process_frame(frame, direction)
+            if isinstance(frame, TTSAudioRawFrame):
+                self.audio += 1
+            await self.push_frame(frame, direction)
+
+    async def run():
+        tts = RoutedTTSService(
+            providers={
+                "a": StubTTSService(latency=5.0, sample_rate=16000),
+                "b": StubTTSService(latency=0.01, seconds_per_char=0.02, sample_rate=16000),
+            },
+            routing=dict(min_hedge_delay=0.05, max_hedge_delay=0.05),
+            sample_rate=16000,
+        )
+        sink = Sink()
+        task = PipelineTask(Pipeline([tts, sink]))
+        runner = asyncio.create_task(PipelineRunner(handle_sigint=False).run(task))
+        await task.queue_frames([TTSSpeakFrame("hello"), EndFrame()])
+        await asyncio.wait_for(runner, 3.0)
+        names = [t.get_name() for t in task._task_manager.current_tasks()]
+        return sink.audio, names
+
+    audio, names = asyncio.run(run())
+    # The primary would take 5s; the hedge answered and the loser was cancelled
+    assert audio > 0
+    assert not [name for name in names if "::tts_" in name]
@@ -0,0 +1,165 @@
+import asyncio
+
+from pipecat.frames.frames import (
+    ErrorFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    StartInterruptionFrame,
+    TextFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    TTSTextFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.tests.utils import SleepFrame, run_test
+
+from services.routing.stubs import StubTTSService
+from services.sarvam.translation import (
+    SarvamTranslationService,
+    SourceResponseEndFrame,
+    SourceTextFrame,
+    split_clauses,
+)
+
+REPLY = (
+    "We have three packages to Goa. "
+    "Each one includes flights, hotels and airport transfers, "
+    "and breakfast every day. "
+    "Which one suits you?"
+)
+CLAUSES = [
+    "We have three packages to Goa.",
+    "Each one includes flights, hotels and airport transfers,",
+    "and breakfast every day.",
+    "Which one suits you?",
+]
+
+
+class FakeTranslation(SarvamTranslationService):
+    """Upper-cases each clause after a per-clause delay instead of calling Sarvam."""
+
+    def __init__(self, delays=None, fail=(), **kwargs):
+        super().__init__(api_key="test", **kwargs)
+        self.delays = delays or {}
+        self.fail = fail
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started = []
+
+    async def _translate(self, text: str) -> str:
+        self.started.append(text)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(text, 0.01))
+        finally:
+            self.in_flight -= 1
+        if text in self.fail:
+            raise ValueError("translation unavailable")
+        return text.upper()
+
+
+def llm_reply(text: str) -> list:
+    return [LLMFullResponseStartFrame()] + [LLMTextFrame(word + " ") for word in text.split(" ")] + [
+        LLMFullResponseEndFrame()
+    ]
+
+
+def test_split_clauses_keeps_short_fragments_together():
+    clauses, rest = split_clauses("Yes, of course. We fly from Chennai, Bengaluru, or Kochi, and", 25)
+    assert clauses == ["Yes, of course.", "We fly from Chennai, Bengaluru,"]
+    assert rest == " or Kochi, and"
+
+
+def test_translations_come_out_in_clause_order():
+    async def run():
+        # Later clauses finish first
+        delays = {clause: 0.2 - 0.05 * i for i, clause in enumerate(CLAUSES)}
+        translation = FakeTranslation(delays, max_concurrency=4)
+        down, _ = await run_test(
+            translation,
+            frames_to_send=llm_reply(REPLY) + [SleepFrame(0.4)],
+            expected_down_frames=[LLMFullResponseStartFrame]
+            + [TextFrame, SourceTextFrame] * len(CLAUSES)
+            + [SourceResponseEndFrame],
+        )
+        return translation, down
+
+    translation, down = asyncio.run(run())
+    assert [frame.text for frame in down if type(frame) is TextFrame] == [c.upper() for c in CLAUSES]
+    assert [frame.text for frame in down if isinstance(frame, SourceTextFrame)] == CLAUSES
+    # All four were in flight together rather than one after another
+    assert translation.max_in_flight == 4
+
+
+def test_concurrency_is_bounded():
+    async def run():
+        translation = FakeTranslation({clause: 0.05 for clause in CLAUSES}, max_concurrency=2)
+        await run_test(
+            translation,
+            frames_to_send=llm_reply(REPLY) + [SleepFrame(0.3)],
+            expected_down_frames=[LLMFullResponseStartFrame]
+            + [TextFrame, SourceTextFrame] * len(CLAUSES)
+            + [SourceResponseEndFrame],
+        )
+        return translation
+
+    translation = asyncio.run(run())
+    assert translation.max_in_flight == 2
+    assert translation.started == CLAUSES
+
+
+def test_failed_clause_is_passed_on_untranslated():
+    async def run():
+        translation = FakeTranslation(fail={CLAUSES[1]}, max_concurrency=4)
+        down, up = await run_test(
+            translation,
+            frames_to_send=llm_reply(REPLY) + [SleepFrame(0.2)],
+            expected_down_frames=[LLMFullResponseStartFrame]
+            + [TextFrame, SourceTextFrame] * len(CLAUSES)
+            + [SourceResponseEndFrame],
+            expected_up_frames=[ErrorFrame],
+        )
+        return down
+
+    down = asyncio.run(run())
+    texts = [frame.text for frame in down if type(frame) is TextFrame]
+    assert texts == [CLAUSES[0].upper(), CLAUSES[1], CLAUSES[2].upper(), CLAUSES[3].upper()]
+
+
+def test_interruption_cancels_pending_translations():
+    async def run():
+        translation = FakeTranslation({clause: 0.5 for clause in CLAUSES}, max_concurrency=4)
+        await run_test(
+            translation,
+            frames_to_send=llm_reply(REPLY) + [SleepFrame(0.1), StartInterruptionFrame(), SleepFrame(0.6)],
+            expected_down_frames=[LLMFullResponseStartFrame, StartInterruptionFrame],
+        )
+        return translation
+
+    translation = asyncio.run(run())
+    assert translation.in_flight == 0
+
+
+def test_assistant_aggregators_get_the_source_text_after_the_audio():
+    async def run():
+        translation = FakeTranslation({clause: 0.2 - 0.05 * i for i, clause in enumerate(CLAUSES)})
+        tts = StubTTSService(
+            latency=0.01, seconds_per_char=0.001, sample_rate=16000, aggregate_sentences=False, push_text_frames=False
+        )
+        expected = [LLMFullResponseStartFrame]
+        for clause in CLAUSES:
+            chunks = max(1, int(len(clause.upper()) * 0.001 / 0.02))
+            expected += [TTSStartedFrame] + [TTSAudioRawFrame] * chunks + [TTSStoppedFrame, TTSTextFrame]
+        expected += [LLMFullResponseEndFrame]
+        down, _ = await run_test(
+            Pipeline([translation, tts, translation.source_text()]),
+            frames_to_send=llm_reply(REPLY) + [SleepFrame(0.5)],
+            expected_down_frames=expected,
+        )
+        return down
+
+    down = asyncio.run(run())
+    assert [frame.text for frame in down if isinstance(frame, TTSTextFrame)] == CLAUSES
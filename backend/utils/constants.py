@@ -106,6 +106,9 @@ SYSTEM_INSTRUCTION_TA ="""
 
 """
 
+STT_PROMPT_TA = """Listen carefully to Tamil speech. Transcribe it accurately into clear and correct English. 
+                Do not miss any words or important context. The user is speaking in Tamil clearly. Listen carefully."""
+
 
 zoho_prompt = """
 You are an intelligent and precise data extraction agent. Your task is to read the entire user conversation transcript, understand the full context, and accurately extract relevant travel-related details.
@@ -1,8 +1,269 @@
+import atexit
+import json
 import logging
+import queue
+import random
 import sys
+import threading
+import time
+import traceback
+from datetime import timezone
+from typing import Dict, Optional, Tuple
+
 from loguru import logger
 
+from config.settings import (
+    LOG_FORMAT,
+    LOG_LEVEL,
+    LOG_QUEUE_SIZE,
+    LOG_SAMPLED_BURST,
+    LOG_SAMPLED_RATE,
+)
+from utils.metrics import metrics
+
+_LEVEL_NAMES = ("TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL")
+
+_configured = False
+_sink: Optional["QueueSink"] = None
+_handler_id: Optional[int] = None
+
+# Minimum level per module prefix ("" is the root); changed at runtime
+# through set_log_level() / /api/debug/logging.
+_levels: Dict[str, int] = {"": logger.level(LOG_LEVEL.upper()).no}
+
+
+class QueueSink:
+    """Loguru sink that hands records to a writer thread.
+
+    The logging call only appends the record to a bounded queue; formatting
+    and the stderr write happen on the writer thread. When the queue is full
+    the record is dropped and counted in ``log_records_dropped_total`` rather
+    than stalling the event loop.
+    """
+
+    def __init__(self, stream=sys.stderr, json_format: bool = True, maxsize: int = 10000):
+        self._stream = stream
+        self._json = json_format
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._write_failed = False
+        self._thread = threading.Thread(target=self._write_loop, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message):
+        try:
+            self._queue.put_nowait(message.record)
+        except queue.Full:
+            metrics.inc("log_records_dropped_total")
+
+    def _write_loop(self):
+        while True:
+            record = self._queue.get()
+            if record is None:
+                return
+            lines = [self._format(record)]
+            # Batch whatever else is already queued into a single write
+            while len(lines) < 256:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    self._flush(lines)
+                    return
+                lines.append(self._format(record))
+            self._flush(lines)
+
+    def _flush(self, lines):
+        try:
+            self._stream.write("\n".join(lines) + "\n")
+            self._stream.flush()
+        except Exception as e:
+            # Logging through loguru would only come back here
+            metrics.inc("log_records_dropped_total", len(lines))
+            if not self._write_failed:
+                self._write_failed = True
+                try:
+                    sys.__stderr__.write(f"Log sink write failed, dropping records: {e!r}\n")
+                except Exception:
+                    pass
+
+    def _format(self, record) -> str:
+        extra = {key: value for key, value in record["extra"].items() if value is not None}
+        exception = record["exception"]
+        if self._json:
+            entry = {
+                "time": record["time"].astimezone(timezone.utc).isoformat(timespec="milliseconds"),
+                "level": record["level"].name,
+                "logger": record["name"],
+                "function": record["function"],
+                "line": record["line"],
+                "message": record["message"],
+                **extra,
+            }
+            if exception:
+                entry["exception"] = "".join(
+                    traceback.format_exception(exception.type, exception.value, exception.traceback)
+                )
+            return json.dumps(entry, ensure_ascii=False, default=str)
+
+        context = " ".join(f"{key}={value}" for key, value in extra.items())
+        line = (
+            f"{record['time']:%Y-%m-%d %H:%M:%S.%f} | {record['level'].name:<8} | "
+            f"{record['name']}:{record['function']}:{record['line']} - "
+            f"{f'[{context}] ' if context else ''}{record['message']}"
+        )
+        if exception:
+            line += "\n" + "".join(
+                traceback.format_exception(exception.type, exception.value, exception.traceback)
+            ).rstrip()
+        return line
+
+    def close(self, timeout: float = 2.0):
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+
+class InterceptHandler(logging.Handler):
+    """Routes stdlib logging (uvicorn, httpx, aiortc) into loguru."""
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+        # Report the stdlib caller, not the logging module internals
+        frame, depth = sys._getframe(), 0
+        while frame and (depth == 0 or frame.f_code.co_filename == logging.__file__):
+            frame = frame.f_back
+            depth += 1
+        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
+
+def _level_no(level) -> int:
+    return level if isinstance(level, int) else logger.level(level.upper()).no
+
+
+def _min_level(name: Optional[str]) -> int:
+    if len(_levels) > 1 and name:
+        # Longest matching module prefix wins
+        best = ""
+        for prefix in _levels:
+            if len(prefix) > len(best) and (name == prefix or name.startswith(prefix + ".")):
+                best = prefix
+        return _levels[best]
+    return _levels[""]
+
+
+def _filter(record) -> bool:
+    return record["level"].no >= _min_level(record["name"])
+
+
+def _install_handler():
+    global _handler_id
+    # The handler level is the lowest configured level, so loguru skips
+    # building records nobody wants (pipecat's per-frame TRACE logs) before
+    # our filter even runs. Same for stdlib loggers, which would otherwise
+    # send every aiortc/aioice DEBUG record through InterceptHandler.
+    min_level = min(_levels.values())
+    handler_id = logger.add(_sink.write, level=min_level, filter=_filter, format="{message}", catch=False)
+    if _handler_id is not None:
+        logger.remove(_handler_id)
+    _handler_id = handler_id
+    logging.getLogger().setLevel(min_level)
+
+
+def set_log_level(level, module: str = ""):
+    """Sets the minimum level for a module prefix ("" for everything).
+
+    Raises ValueError for an unknown level name.
+    """
+    _levels[module] = _level_no(level)
+    if _configured:
+        _install_handler()
+
+
+def reset_log_level(module: str):
+    if module and _levels.pop(module, None) is not None and _configured:
+        _install_handler()
+
+
+def get_log_levels() -> Dict[str, str]:
+    names = {logger.level(name).no: name for name in _LEVEL_NAMES}
+    return {module or "root": names.get(no, str(no)) for module, no in sorted(_levels.items())}
+
+
+class _SiteState:
+    __slots__ = ("tokens", "updated", "suppressed")
+
+    def __init__(self, burst: float):
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.suppressed = 0
+
+
+_sites: Dict[Tuple[str, int], _SiteState] = {}
+
+
+def log_sampled(
+    level: str,
+    message: str,
+    *args,
+    rate: float = LOG_SAMPLED_RATE,
+    burst: int = LOG_SAMPLED_BURST,
+    sample: float = 1.0,
+    **kwargs,
+):
+    """Logs from per-frame code paths without flooding the sink.
+
+    Each call site gets its own token bucket (``rate`` records per second,
+    ``burst`` at most); ``sample`` additionally keeps only that fraction of
+    calls. Suppressed records are counted and reported on the next one that
+    gets through. Arguments are formatted by loguru only for records that are
+    emitted, so pass them as ``{}`` placeholders rather than f-strings.
+    """
+    frame = sys._getframe(1)
+    if _level_no(level) < _min_level(frame.f_globals.get("__name__")):
+        return
+    if sample < 1.0 and random.random() >= sample:
+        return
+
+    key = (frame.f_code.co_filename, frame.f_lineno)
+    state = _sites.get(key)
+    if state is None:
+        state = _sites[key] = _SiteState(burst)
+    now = time.monotonic()
+    state.tokens = min(burst, state.tokens + (now - state.updated) * rate)
+    state.updated = now
+    if state.tokens < 1:
+        state.suppressed += 1
+        return
+    state.tokens -= 1
+
+    if state.suppressed:
+        kwargs["suppressed"] = state.suppressed
+        state.suppressed = 0
+    logger.opt(depth=1).log(level.upper(), message, *args, **kwargs)
+
+
 def setup_logging():
-    # Just return the logger without configuring it
-    # This allows Pipecat to handle its own logging setup
-    return logger
\ No newline at end of file
+    """Configures the process-wide loguru logger once and returns it.
+
+    Records go through ``QueueSink`` as JSON (or text with LOG_FORMAT =
+    "text"), tagged with whatever ``pc_id``/``language`` the current session
+    bound via ``logger.contextualize``.
+    """
+    global _configured, _sink
+    if _configured:
+        return logger
+    _configured = True
+
+    _sink = QueueSink(json_format=LOG_FORMAT == "json", maxsize=LOG_QUEUE_SIZE)
+    logger.remove()
+    logger.configure(extra={"pc_id": None, "language": None})
+    logging.basicConfig(handlers=[InterceptHandler()], force=True)
+    _install_handler()
+    atexit.register(_sink.close)
+    return logger
@@ -0,0 +1,147 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+
+from config.settings import LOOP_MONITOR_BLOCK_THRESHOLD, LOOP_MONITOR_INTERVAL
+from utils.logging import setup_logging
+from utils.metrics import metrics
+
+logger = setup_logging()
+
+# Frames under this directory are preferred when naming an offender
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LoopMonitor:
+    """Samples event loop lag and captures the stack of whatever blocks the loop.
+
+    A sampler task sleeps for ``interval`` and records how late it woke up
+    (``event_loop_lag_seconds``). A watchdog thread checks the sampler's
+    heartbeat; when it is older than ``block_threshold`` the loop is stuck in
+    synchronous code, so the watchdog grabs the loop thread's current stack
+    and files it under the innermost project frame. The cost is one timer
+    wakeup per interval on the loop plus a mostly sleeping thread, so it can
+    be switched on in production through ``/api/debug/loop``.
+    """
+
+    def __init__(self, interval: float = 0.1, block_threshold: float = 0.1, max_offenders: int = 50):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self._max_offenders = max_offenders
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._running = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._beat = 0
+        self._captured_beat = -1
+        self._captured_site: Optional[str] = None
+        self._offenders: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._running.is_set()
+
+    def start(self):
+        if self.enabled:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        # Each watchdog gets its own flag, so one left over from a stop() that
+        # has not finished yet can never be revived by this start().
+        self._running = threading.Event()
+        self._running.set()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, args=(self._running,), name="loop-monitor", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started (interval={self.interval}s, threshold={self.block_threshold}s)")
+
+    async def stop(self):
+        if not self.enabled:
+            return
+        self._running.clear()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog:
+            watchdog, self._watchdog = self._watchdog, None
+            await asyncio.to_thread(watchdog.join)
+        logger.info("Event loop monitor stopped")
+
+    def reset(self):
+        with self._lock:
+            self._offenders.clear()
+
+    async def _sample(self):
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - start - self.interval)
+            metrics.observe("event_loop_lag_seconds", lag)
+            if self._captured_beat == self._beat and self._captured_site:
+                self._record_duration(self._captured_site, lag)
+            self._beat += 1
+            self._heartbeat = now
+
+    def _watch(self, running: threading.Event):
+        while running.is_set():
+            time.sleep(min(self.interval, self.block_threshold) / 2)
+            beat = self._beat
+            stalled = time.monotonic() - self._heartbeat - self.interval
+            if stalled > self.block_threshold and self._captured_beat != beat:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                self._captured_beat = beat
+                self._captured_site = self._capture(frame)
+
+    def _capture(self, frame) -> str:
+        stack = traceback.extract_stack(frame)
+        site = stack[-1]
+        for entry in reversed(stack):
+            if entry.filename.startswith(PROJECT_ROOT):
+                site = entry
+                break
+        key = f"{os.path.relpath(site.filename, PROJECT_ROOT)}:{site.lineno} in {site.name}"
+        with self._lock:
+            offender = self._offenders.get(key)
+            if offender is None:
+                if len(self._offenders) >= self._max_offenders:
+                    return key
+                offender = self._offenders[key] = {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            offender["count"] += 1
+            offender["stack"] = traceback.format_list(stack[-15:])
+        metrics.inc("event_loop_blocked_total")
+        return key
+
+    def _record_duration(self, key: str, lag: float):
+        with self._lock:
+            offender = self._offenders.get(key)
+            if offender:
+                offender["total_seconds"] += lag
+                offender["max_seconds"] = max(offender["max_seconds"], lag)
+
+    def snapshot(self, top: int = 10) -> dict:
+        lag = metrics.histogram("event_loop_lag_seconds")
+        with self._lock:
+            offenders = sorted(self._offenders.items(), key=lambda item: item[1]["total_seconds"], reverse=True)
+            return {
+                "enabled": self.enabled,
+                "interval": self.interval,
+                "block_threshold": self.block_threshold,
+                "lag": lag.snapshot() if lag else None,
+                "top_offenders": [
+                    {"site": key, **{k: (round(v, 6) if isinstance(v, float) else v) for k, v in data.items()}}
+                    for key, data in offenders[:top]
+                ],
+            }
+
+
+loop_monitor = LoopMonitor(interval=LOOP_MONITOR_INTERVAL, block_threshold=LOOP_MONITOR_BLOCK_THRESHOLD)
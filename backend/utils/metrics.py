@@ -0,0 +1,95 @@
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+# Number of most recent observations each histogram keeps for percentiles
+HISTOGRAM_WINDOW = 1024
+
+
+def _key(name: str, labels: Dict[str, str]) -> Tuple:
+    return (name,) + tuple(sorted(labels.items()))
+
+
+def percentile(samples, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class Histogram:
+    """Rolling window of observations with count/sum over the process lifetime."""
+
+    def __init__(self, window: int = HISTOGRAM_WINDOW):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def snapshot(self) -> dict:
+        samples = list(self._samples)
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "p50": round(percentile(samples, 0.50), 6),
+            "p95": round(percentile(samples, 0.95), 6),
+            "p99": round(percentile(samples, 0.99), 6),
+            "max": round(max(samples), 6) if samples else 0.0,
+        }
+
+
+class MetricsRegistry:
+    """Process-wide counters, gauges and histograms, keyed by name and labels.
+
+    Everything is kept in memory and exposed through ``snapshot()`` (served by
+    the ``/api/metrics`` route). Updates are guarded by a lock because some of
+    them come from executor threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple, float] = {}
+        self._gauges: Dict[Tuple, float] = {}
+        self._histograms: Dict[Tuple, Histogram] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        return self._histograms.get(_key(name, labels))
+
+    def snapshot(self) -> dict:
+        def render(key: Tuple) -> str:
+            name, labels = key[0], key[1:]
+            if not labels:
+                return name
+            return name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
+
+        with self._lock:
+            return {
+                "counters": {render(k): v for k, v in self._counters.items()},
+                "gauges": {render(k): v for k, v in self._gauges.items()},
+                "histograms": {render(k): h.snapshot() for k, h in self._histograms.items()},
+            }
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,131 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import RATE_LIMIT_REALTIME_RESERVE, RATE_LIMITS
+from utils.metrics import metrics
+
+
+class Priority(IntEnum):
+    # Lower value is served first
+    REALTIME = 0
+    BACKGROUND = 1
+
+
+class TokenBucket:
+    """Token bucket shared by every caller of one provider API key.
+
+    Callers that find the bucket empty wait in a priority queue, so a
+    real-time request that arrives behind a backlog of background requests is
+    served as soon as the next token is available. Background requests only
+    take a token while more than ``realtime_reserve`` of the burst is left,
+    so a bulk job never drains the bucket down to where the next real-time
+    request has to wait.
+    """
+
+    def __init__(
+        self, provider: str, rate: float, burst: int, realtime_reserve: float = RATE_LIMIT_REALTIME_RESERVE
+    ):
+        self._provider = provider
+        self._rate = rate
+        self._burst = burst
+        # Whole tokens, and always at least one left for background requests
+        self._reserve = min(burst - 1, int(burst * realtime_reserve))
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._drain_task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def _needed(self, priority: int) -> float:
+        return 1 + (self._reserve if priority != Priority.REALTIME else 0)
+
+    def _bind(self, loop: asyncio.AbstractEventLoop):
+        # The process-wide buckets outlive an event loop when reused by tests
+        # or the CLI; waiters and the drain task of a previous loop are dead.
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._waiters = []
+        self._drain_task = None
+        self._wake = asyncio.Event()
+
+    async def acquire(self, priority: Priority = Priority.REALTIME):
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        self._bind(loop)
+        self._refill()
+        if not self._waiters and self._tokens >= self._needed(priority):
+            self._tokens -= 1
+        else:
+            future = loop.create_future()
+            heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+            self._publish_depth()
+            # A drain waiting on the reserve for a background request must
+            # serve a real-time one as soon as a single token is there.
+            self._wake.set()
+            if self._drain_task is None or self._drain_task.done():
+                self._drain_task = loop.create_task(self._drain())
+            try:
+                await future
+            finally:
+                self._publish_depth()
+
+        metrics.observe(
+            "rate_limit_wait_seconds",
+            time.monotonic() - start,
+            provider=self._provider,
+            priority=priority.name.lower(),
+        )
+
+    async def _drain(self):
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            # Waiters cancelled while queued (interrupted turns, lost hedges)
+            # don't consume a token.
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            self._refill()
+            needed = self._needed(priority)
+            if self._tokens < needed:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), (needed - self._tokens) / self._rate)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            future.set_result(None)
+
+    def _publish_depth(self):
+        metrics.set_gauge("rate_limit_queue_depth", self.queue_depth, provider=self._provider)
+
+
+_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+
+
+def get_rate_limiter(provider: str, api_key: Optional[str]) -> TokenBucket:
+    """Returns the process-wide bucket for a provider and API key."""
+    key_id = hashlib.sha256((api_key or "").encode()).hexdigest()[:12]
+    key = (provider, key_id)
+    if key not in _buckets:
+        limits = RATE_LIMITS.get(provider, RATE_LIMITS["default"])
+        _buckets[key] = TokenBucket(provider, limits["rate"], limits["burst"])
+    return _buckets[key]